@@ -0,0 +1,85 @@
+"""
+Shared helpers for the benchmarks: run demo_fastapi under uvicorn and time calls
+"""
+
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+DEMO_APP = ROOT / "demo_fastapi"
+
+# Import mcp_wrap from this checkout
+sys.path.insert(0, str(ROOT))
+
+from mcp_wrap.runtime.config import DEFAULT_CONFIG, merge_config  # noqa: E402
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@contextmanager
+def uvicorn_app(uds: Optional[str] = None, timeout: float = 15.0) -> Iterator[str]:
+    """Run demo_fastapi under uvicorn; yields the upstream URL (http:// or unix://)"""
+    if uds:
+        bind, url = ["--uds", uds], f"unix://{uds}"
+    else:
+        port = free_port()
+        bind, url = ["--port", str(port)], f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--log-level", "warning", *bind],
+        cwd=DEMO_APP,
+    )
+    try:
+        transport = httpx.HTTPTransport(uds=uds) if uds else None
+        base = "http://localhost" if uds else url
+        deadline = time.monotonic() + timeout
+        with httpx.Client(transport=transport) as client:
+            while True:
+                try:
+                    client.get(f"{base}/health")
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline or process.poll() is not None:
+                        raise RuntimeError("demo_fastapi did not start")
+                    time.sleep(0.05)
+        yield url
+    finally:
+        process.terminate()
+        process.wait()
+
+def runtime_config(**sections: Dict[str, Any]) -> Dict[str, Any]:
+    """runtime.json defaults with the given sections merged in"""
+    return merge_config(DEFAULT_CONFIG, sections)
+
+async def timed(call: Callable[[], Awaitable[Any]], calls: int, warmup: int = 20) -> List[float]:
+    """Latency of calls sequential awaits of call(), in microseconds"""
+    for _ in range(warmup):
+        await call()
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return samples
+
+def summary(samples: List[float]) -> str:
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return f"mean {statistics.fmean(samples):8.1f} us   p50 {statistics.median(samples):8.1f} us   p99 {p99:8.1f} us"
+
+def report(rows: Dict[str, List[float]], baseline: str):
+    """Print one summary line per variant and its speed-up over baseline"""
+    base = statistics.fmean(rows[baseline])
+    width = max(len(name) for name in rows)
+    for name, samples in rows.items():
+        speedup = base / statistics.fmean(samples)
+        print(f"{name:<{width}}  {summary(samples)}   x{speedup:.2f}")
@@ -0,0 +1,44 @@
+"""
+Per-call latency over loopback HTTP versus the in-process ASGI transport
+
+With --in-process (user-035) the generated server imports the FastAPI app
+and ToolRuntime calls it through httpx.ASGITransport, skipping sockets,
+HTTP parsing and uvicorn. Both variants call GET /users/1 on demo_fastapi
+through ToolRuntime.
+
+    python benchmarks/bench_asgi.py [--calls 2000]
+"""
+
+import argparse
+import asyncio
+
+from _upstream import DEMO_APP, report, runtime_config, timed, uvicorn_app
+
+from mcp_wrap.runtime.executor import ToolRuntime
+
+async def run(runtime: ToolRuntime, url: str, calls: int):
+    async with runtime:
+        async def call():
+            response = await runtime.request("getUsersByUser_id", "GET", f"{url}/users/1", route="/users/{user_id}")
+            response.raise_for_status()
+
+        return await timed(call, calls)
+
+async def main(calls: int):
+    # Coalescing and caching stay off so every call reaches the app
+    sections = {"coalesce": {"enabled": False}, "cache": {"enabled": False}}
+    with uvicorn_app() as url:
+        http = ToolRuntime(runtime_config(upstream={"url": url}, **sections))
+        loopback = await run(http, url, calls)
+
+    upstream = {"url": "http://localhost", "transport": "asgi", "app": "main:app", "app_dir": str(DEMO_APP)}
+    asgi = ToolRuntime(runtime_config(upstream=upstream, **sections))
+    in_process = await run(asgi, "http://localhost", calls)
+    assert asgi.in_process, "demo_fastapi could not be imported in-process"
+
+    report({"loopback HTTP": loopback, "in-process ASGI": in_process}, baseline="loopback HTTP")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    asyncio.run(main(parser.parse_args().calls))
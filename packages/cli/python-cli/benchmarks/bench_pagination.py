@@ -0,0 +1,63 @@
+"""
+Time to collect a paginated list, one page at a time versus prefetching
+
+With pagination enabled (user-044) one tool call follows the offset pages
+of a list endpoint. Offsets are known in advance, so up to `prefetch` pages
+are requested concurrently. Every variant collects --items items in
+--page-size pages from an in-process upstream answering after --latency.
+
+    python benchmarks/bench_pagination.py [--items 1000] [--page-size 50] [--latency 0.03]
+"""
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+from urllib.parse import parse_qs
+
+from _upstream import report, runtime_config, timed
+
+from mcp_wrap.runtime.executor import ToolRuntime
+
+URL = "http://upstream/users"
+
+async def app(scope, receive, send):
+    """ASGI upstream listing ?total= users by ?offset= and ?limit= after ?delay= seconds"""
+    if scope["type"] != "http":
+        return
+    query = {key: values[0] for key, values in parse_qs(scope["query_string"].decode()).items()}
+    await asyncio.sleep(float(query["delay"]))
+    offset, limit, total = int(query["offset"]), int(query["limit"]), int(query["total"])
+    items = [{"id": n, "name": f"user {n}"} for n in range(offset, min(offset + limit, total))]
+    body = json.dumps({"items": items, "total": total}).encode()
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": body})
+
+async def collect(prefetch: int, items: int, page_size: int, latency: float, calls: int):
+    runtime = ToolRuntime(runtime_config(
+        upstream={"transport": "asgi", "app": "bench_pagination:app", "app_dir": str(Path(__file__).parent)},
+        pagination={"enabled": True, "mode": "offset", "prefetch": prefetch, "max_items": items,
+                    "max_pages": items // page_size + 1},
+    ))
+    async with runtime:
+        async def call():
+            response = await runtime.request("getUsers", "GET", URL, params={
+                "offset": 0, "limit": page_size, "total": items, "delay": latency,
+            })
+            assert response.json()["_pagination"]["items"] == items
+        return await timed(call, calls, warmup=1)
+
+async def main(items: int, page_size: int, latency: float, calls: int):
+    report({
+        f"prefetch {prefetch}": await collect(prefetch, items, page_size, latency, calls)
+        for prefetch in (1, 2, 4, 8)
+    }, baseline="prefetch 1")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.03)
+    parser.add_argument("--calls", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.page_size, args.latency, args.calls))
@@ -0,0 +1,41 @@
+"""
+Per-call latency of a client per tool call versus the shared pooled client
+
+Before user-031 every generated tool opened its own httpx.AsyncClient, so
+each call paid a TCP connect. ToolRuntime keeps one pooled client per
+process. Both variants call GET /users/1 on demo_fastapi under uvicorn.
+
+    python benchmarks/bench_pool.py [--calls 500]
+"""
+
+import argparse
+import asyncio
+
+import httpx
+
+from _upstream import report, runtime_config, timed, uvicorn_app
+
+from mcp_wrap.runtime.executor import ToolRuntime
+
+async def main(calls: int):
+    with uvicorn_app() as url:
+        async def client_per_call():
+            async with httpx.AsyncClient() as client:
+                response = await client.get(f"{url}/users/1")
+                response.raise_for_status()
+
+        runtime = ToolRuntime(runtime_config(upstream={"url": url}))
+        async with runtime:
+            async def shared_client():
+                response = await runtime.request("getUsersByUser_id", "GET", f"{url}/users/1", route="/users/{user_id}")
+                response.raise_for_status()
+
+            report({
+                "client per call": await timed(client_per_call, calls),
+                "shared client": await timed(shared_client, calls),
+            }, baseline="client per call")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500)
+    asyncio.run(main(parser.parse_args().calls))
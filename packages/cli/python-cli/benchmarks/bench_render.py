@@ -0,0 +1,71 @@
+"""
+Cost of turning a ~1 MB JSON upstream body into a tool result
+
+Before user-034 every generated tool parsed the upstream body and
+pretty-printed it again inside its {request, response, status_code}
+envelope. ToolRuntime.render passes the JSON text through: the low-level
+backend returns it verbatim and the FastMCP backend splices it into the
+envelope. Each call renders a fresh httpx.Response, as a tool call does.
+
+    python benchmarks/bench_render.py [--calls 50] [--users 6000]
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+import httpx
+
+from _upstream import report
+
+from mcp_wrap.runtime.serialize import render_result
+
+REQUEST = "GET http://127.0.0.1:8000/users"
+
+def users_body(count: int) -> bytes:
+    return json.dumps([
+        {"id": n, "name": f"User {n}", "email": f"user{n}@example.com", "age": 20 + n % 50,
+         "is_active": n % 3 != 0, "tags": ["alpha", "beta"], "address": {"city": "Springfield", "zip": f"{n:05d}"}}
+        for n in range(count)
+    ]).encode()
+
+def old_envelope(response: httpx.Response) -> str:
+    """What the FastMCP template returned before user-034"""
+    data = response.json() if response.headers.get("content-type", "").startswith("application/json") else response.text
+    return json.dumps({"request": REQUEST, "response": data, "status_code": response.status_code}, indent=2)
+
+VARIANTS = {
+    "parse + indent=2 (before)": old_envelope,
+    "passthrough envelope": lambda response: render_result(response, REQUEST),
+    "passthrough body": lambda response: render_result(response),
+    "indent=2 opt-in": lambda response: render_result(response, REQUEST, indent=2),
+}
+
+def timed(render, body: bytes, calls: int):
+    samples, size = [], 0
+    for n in range(calls + 2):
+        response = httpx.Response(200, content=body, headers={"content-type": "application/json"})
+        started = time.perf_counter()
+        size = len(render(response))
+        if n >= 2:
+            samples.append((time.perf_counter() - started) * 1e6)
+    return samples, size
+
+def main(calls: int, users: int):
+    body = users_body(users)
+    print(f"upstream body: {len(body) / 1e6:.2f} MB")
+    rows, sizes = {}, {}
+    for name, render in VARIANTS.items():
+        rows[name], sizes[name] = timed(render, body, calls)
+    report(rows, baseline="parse + indent=2 (before)")
+    for name, samples in rows.items():
+        throughput = len(body) / (statistics.fmean(samples) / 1e6) / 1e6
+        print(f"{name}: {throughput:,.0f} MB/s, {sizes[name] / 1e6:.2f} MB out")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--users", type=int, default=6000)
+    args = parser.parse_args()
+    main(args.calls, args.users)
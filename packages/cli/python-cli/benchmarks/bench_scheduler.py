@@ -0,0 +1,75 @@
+"""
+Latency of a light session while a heavy one floods the upstream slots
+
+Before user-048 calls waiting for an upstream slot were served in FIFO
+order, so one session's burst delayed every other session's calls by the
+whole burst. The scheduler serves sessions in turn. A heavy session sends
+--flood concurrent calls to a --latency upstream capped at --slots slots,
+while a light session makes --calls sequential calls.
+
+    python benchmarks/bench_scheduler.py [--flood 150] [--latency 0.1] [--slots 2] [--calls 10]
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+
+from _upstream import report, runtime_config
+
+from mcp.server.lowlevel.server import request_ctx
+
+from mcp_wrap.runtime.executor import ToolRuntime
+
+URL = "http://upstream/items"
+
+async def app(scope, receive, send):
+    """ASGI upstream that answers after ?delay= seconds"""
+    if scope["type"] != "http":
+        return
+    query = parse_qs(scope["query_string"].decode())
+    await asyncio.sleep(float(query["delay"][0]))
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+async def light_session(scheduler: bool, flood: int, latency: float, slots: int, calls: int):
+    runtime = ToolRuntime(runtime_config(
+        upstream={"transport": "asgi", "app": "bench_scheduler:app", "app_dir": str(Path(__file__).parent)},
+        coalesce={"enabled": False},
+        retry={"enabled": False},
+        limiter={"initial_limit": slots, "min_limit": slots, "max_limit": slots, "queue_timeout": 600.0},
+        scheduler={"enabled": scheduler},
+    ))
+    async with runtime:
+        async def call(session: str, n: int) -> float:
+            request_ctx.set(SimpleNamespace(session=session))
+            started = time.perf_counter()
+            response = await runtime.request("getItems", "GET", URL, params={"n": n, "delay": latency})
+            response.raise_for_status()
+            return (time.perf_counter() - started) * 1e6
+
+        heavy = [asyncio.create_task(call("heavy", n)) for n in range(flood)]
+        await asyncio.sleep(latency / 10)
+        samples = [await call("light", n) for n in range(calls)]
+        await asyncio.gather(*heavy)
+    return samples
+
+async def main(flood: int, latency: float, slots: int, calls: int):
+    rows = {
+        "FIFO": await light_session(False, flood, latency, slots, calls),
+        "scheduler": await light_session(True, flood, latency, slots, calls),
+    }
+    report(rows, baseline="FIFO")
+    for name, samples in rows.items():
+        print(f"{name}: max {max(samples) / 1000:.0f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--flood", type=int, default=150)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--slots", type=int, default=2)
+    parser.add_argument("--calls", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.flood, args.latency, args.slots, args.calls))
@@ -0,0 +1,59 @@
+"""
+Per-call latency and throughput over TCP loopback versus a Unix domain socket
+
+With a unix:// upstream (user-036) the shared client connects through
+httpx.AsyncHTTPTransport(uds=...). Both variants run demo_fastapi under
+uvicorn (--port or --uds) and call GET /users/1 through ToolRuntime.
+
+    python benchmarks/bench_uds.py [--calls 2000] [--concurrency 16]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from _upstream import report, runtime_config, timed, uvicorn_app
+
+from mcp_wrap.runtime.executor import ToolRuntime
+
+async def run(upstream_url: str, calls: int, concurrency: int):
+    # Coalescing and caching stay off so every call reaches the app
+    runtime = ToolRuntime(runtime_config(upstream={"url": upstream_url},
+                                         coalesce={"enabled": False}, cache={"enabled": False}))
+    async with runtime:
+        url = f"{runtime.base_url}/users/1"
+
+        async def call():
+            response = await runtime.request("getUsersByUser_id", "GET", url, route="/users/{user_id}")
+            response.raise_for_status()
+
+        sequential = await timed(call, calls)
+
+        async def worker(count: int):
+            for _ in range(count):
+                await call()
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker(calls // concurrency) for _ in range(concurrency)])
+        throughput = (calls // concurrency) * concurrency / (time.perf_counter() - started)
+    return sequential, throughput
+
+async def main(calls: int, concurrency: int):
+    with uvicorn_app() as url:
+        tcp, tcp_throughput = await run(url, calls, concurrency)
+    with tempfile.TemporaryDirectory() as directory:
+        with uvicorn_app(uds=str(Path(directory) / "app.sock")) as url:
+            uds, uds_throughput = await run(url, calls, concurrency)
+
+    report({"TCP loopback": tcp, "Unix socket": uds}, baseline="TCP loopback")
+    print(f"{concurrency} concurrent: TCP {tcp_throughput:.0f} req/s, Unix socket {uds_throughput:.0f} req/s "
+          f"(x{uds_throughput / tcp_throughput:.2f})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.calls, arguments.concurrency))
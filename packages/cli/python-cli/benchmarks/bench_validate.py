@@ -0,0 +1,75 @@
+"""
+Cost of one argument check: compiled validator versus jsonschema.validate
+
+With validation enabled (user-043) each tool's inputSchema is compiled once
+into checker functions, and the low-level server skips the MCP SDK's own
+jsonschema.validate pass. Both variants check the same arguments against a
+schema with query parameters and a nested request body.
+
+    python benchmarks/bench_validate.py [--calls 20000]
+"""
+
+import argparse
+import time
+
+import jsonschema
+
+from _upstream import report
+
+from mcp_wrap.runtime.validate import compile_validator
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "user_id": {"type": "integer", "minimum": 1},
+        "limit": {"type": "integer", "minimum": 1, "maximum": 100},
+        "status": {"type": "string", "enum": ["active", "inactive", "suspended"]},
+        "search": {"type": "string", "maxLength": 200},
+        "body": {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string", "minLength": 1},
+                "email": {"type": "string"},
+                "age": {"type": "integer", "minimum": 0},
+                "tags": {"type": "array", "items": {"type": "string"}},
+            },
+            "required": ["name", "email"],
+        },
+    },
+    "required": ["user_id", "body"],
+}
+
+ARGUMENTS = {
+    "user_id": 7, "limit": 20, "status": "active", "search": "ann",
+    "body": {"name": "Ann", "email": "ann@example.com", "age": 31, "tags": ["a", "b"]},
+}
+
+def timed(check, calls: int):
+    for _ in range(100):
+        check()
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        check()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return samples
+
+def main(calls: int):
+    started = time.perf_counter()
+    for _ in range(1000):
+        compile_validator(SCHEMA)
+    compile_us = (time.perf_counter() - started) * 1e3
+
+    compiled = compile_validator(SCHEMA)
+    strict = compile_validator(SCHEMA, coerce=False)
+    report({
+        "jsonschema.validate": timed(lambda: jsonschema.validate(ARGUMENTS, SCHEMA), calls // 10),
+        "compiled": timed(lambda: strict(ARGUMENTS), calls),
+        "compiled, coercing": timed(lambda: compiled(ARGUMENTS), calls),
+    }, baseline="jsonschema.validate")
+    print(f"compiling the schema: {compile_us:.1f} us")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    main(parser.parse_args().calls)
@@ -13,6 +13,8 @@ from .cli import main, MCPCLI
 from .fastapi_scanner import FastAPIScanner, FastAPIEndpoint
 from .mcp_generator import MCPGenerator
 from .inspector import MCPInspector
+from .tool_spec import ToolSpec, ToolParameter
+from .backends import render_targets
 
 __all__ = [
     "main",
@@ -21,4 +23,7 @@ __all__ = [
     "FastAPIEndpoint",
     "MCPGenerator",
     "MCPInspector",
+    "ToolSpec",
+    "ToolParameter",
+    "render_targets",
 ] 
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Backends - Render MCP servers for one or more targets from shared tool specs
+
+Each backend turns the normalized ToolSpec list produced by the scanner into a
+server for one target. Several targets are rendered in a single invocation,
+in parallel worker processes, without rescanning the FastAPI app.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .tool_spec import ToolSpec
+
+def render_fastmcp(specs: List[ToolSpec], out_dir: str, port: int = 8000,
+                   runtime_options: Optional[Dict[str, Any]] = None):
+    """Python server built on FastMCP (mcp.server.fastmcp)"""
+    from .mcp_generator import MCPGenerator
+    MCPGenerator().generate_from_specs(specs, out_dir, port, runtime_options)
+
+def render_lowlevel(specs: List[ToolSpec], out_dir: str, port: int = 8000,
+                    runtime_options: Optional[Dict[str, Any]] = None):
+    """Python server built on the low-level mcp.server.Server"""
+    from .generator import MCPGenerator
+    MCPGenerator().generate_server(specs, out_dir, port, runtime_options)
+
+def render_typescript(specs: List[ToolSpec], out_dir: str, port: int = 8000,
+                      runtime_options: Optional[Dict[str, Any]] = None):
+    """TypeScript server built on @modelcontextprotocol/sdk (runtime_options apply to Python servers only)"""
+    from .server_generator import MCPServerGenerator
+    out_path = Path(out_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+    MCPServerGenerator.from_tool_specs(specs).generate_server("typescript", str(out_path / "server.ts"))
+
+BACKENDS: Dict[str, Callable[..., None]] = {
+    "fastmcp": render_fastmcp,
+    "lowlevel": render_lowlevel,
+    "typescript": render_typescript,
+}
+
+# How to run the server each backend writes, relative to its output directory
+RUN_STEPS: Dict[str, List[str]] = {
+    "fastmcp": ["pip install -r requirements.txt", "python server.py"],
+    "lowlevel": ["pip install -r requirements.txt", "python server.py"],
+    "typescript": ["npm install @modelcontextprotocol/sdk zod",
+                   "serve the createStatelessServer() export of server.ts from your MCP host"],
+}
+
+def next_steps(out_dirs: Dict[str, Path]) -> List[str]:
+    """Run instructions for every rendered target, one command per line"""
+    steps = []
+    for target, target_dir in out_dirs.items():
+        if len(out_dirs) > 1:
+            steps.append(f"# {target}")
+        steps.append(f"cd {target_dir}")
+        steps.extend(RUN_STEPS[target])
+    return steps
+
+def render_targets(specs: List[ToolSpec], targets: Sequence[str], out_dir: str, port: int = 8000,
+                   max_workers: Optional[int] = None,
+                   runtime_options: Optional[Dict[str, Any]] = None) -> Dict[str, Path]:
+    """Render every target from the same specs.
+
+    A single target is written straight into out_dir; several targets each get
+    their own out_dir/<target> subdirectory and are rendered concurrently.
+    Returns the output directory of every target.
+    """
+    targets = list(dict.fromkeys(targets))
+    unknown = [t for t in targets if t not in BACKENDS]
+    if unknown:
+        raise ValueError(f"Unsupported target(s): {', '.join(unknown)} (choose from {', '.join(BACKENDS)})")
+
+    if len(targets) == 1:
+        BACKENDS[targets[0]](specs, out_dir, port, runtime_options)
+        return {targets[0]: Path(out_dir)}
+
+    out_dirs = {target: Path(out_dir) / target for target in targets}
+    workers = max_workers or min(len(targets), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(BACKENDS[target], specs, str(target_dir), port, runtime_options)
+            for target, target_dir in out_dirs.items()
+        ]
+        for future in futures:
+            # Re-raise the first backend failure
+            future.result()
+
+    return out_dirs
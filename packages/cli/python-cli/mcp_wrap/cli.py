@@ -26,6 +26,10 @@ from rich.panel import Panel
 from .fastapi_scanner import FastAPIScanner
 from .mcp_generator import MCPGenerator
 from .inspector import MCPInspector
+from .backends import BACKENDS, next_steps, render_targets
+from .manifest import write_manifest, load_manifest, read_manifest
+from .runtime_bundle import add_serve_arguments, port_or_socket, runtime_overrides, serve_options
+from .tool_spec import ToolSpec, filter_specs
 
 console = Console()
 
@@ -35,8 +39,11 @@ class MCPCLI:
         self.generator = MCPGenerator()
         self.inspector = MCPInspector()
     
-    def scan(self, app_path: str, out_dir: str = ".mcp-generated", port: int = 8000):
-        """Scan FastAPI app and generate MCP server"""
+    def scan(self, app_path: str, out_dir: str = ".mcp-generated", port: int = 8000,
+             targets: Optional[List[str]] = None, emit_manifest: Optional[str] = None,
+             in_process: Optional[str] = None, serve: Optional[Dict[str, Any]] = None,
+             reload: bool = False):
+        """Scan FastAPI app and generate MCP server (or only write an endpoint manifest)"""
         console.print(f"[bold blue]🔍 Scanning FastAPI app at: {app_path}[/bold blue]")
         
         with Progress(
@@ -47,19 +54,68 @@ class MCPCLI:
             # Scan FastAPI endpoints
             task = progress.add_task("Scanning FastAPI endpoints...", total=None)
             endpoints = self.scanner.scan_fastapi_app(app_path)
+            specs = self.scanner.build_tool_specs(endpoints)
             progress.update(task, description=f"Found {len(endpoints)} endpoints")
             
-            # Generate MCP server
-            task = progress.add_task("Generating MCP server...", total=None)
-            self.generator.generate_from_endpoints(endpoints, out_dir, port)
-            progress.update(task, description="MCP server generated successfully")
+            if emit_manifest:
+                content_hash = write_manifest(specs, emit_manifest, source=str(app_path))
+                progress.update(task, description=f"Wrote manifest {emit_manifest} ({content_hash[:19]})")
+            else:
+                runtime_options = runtime_overrides(self.scanner, app_path, in_process, serve, reload)
+                out_dirs = self._render(progress, specs, out_dir, port, targets, runtime_options)
         
+        if emit_manifest:
+            console.print(f"\n[bold green]✅ Wrote endpoint manifest: {emit_manifest}[/bold green]")
+            console.print("\n[bold blue]🚀 Next steps:[/bold blue]")
+            console.print(f"  mcp-scan generate --from-manifest {emit_manifest} --out {out_dir}")
+            return
+        
+        self._print_next_steps(out_dir, out_dirs)
+    
+    def generate(self, manifest_path: str, out_dir: str = ".mcp-generated", port: int = 8000,
+                 targets: Optional[List[str]] = None, include: Optional[List[str]] = None,
+                 tags: Optional[List[str]] = None, in_process: Optional[str] = None,
+                 serve: Optional[Dict[str, Any]] = None):
+        """Generate MCP server from a previously written endpoint manifest"""
+        console.print(f"[bold blue]📦 Loading endpoint manifest: {manifest_path}[/bold blue]")
+        
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console
+        ) as progress:
+            task = progress.add_task("Loading manifest...", total=None)
+            specs = filter_specs(load_manifest(manifest_path), include, tags)
+            progress.update(task, description=f"Loaded {len(specs)} tools")
+            
+            app_path = read_manifest(manifest_path, verify=False).get("source") if in_process else None
+            runtime_options = runtime_overrides(self.scanner, app_path, in_process, serve)
+            out_dirs = self._render(progress, specs, out_dir, port, targets, runtime_options)
+        
+        self._print_next_steps(out_dir, out_dirs)
+    
+    def _render(self, progress: Progress, specs: List[ToolSpec], out_dir: str, port: int,
+                targets: Optional[List[str]] = None,
+                runtime_options: Optional[Dict[str, Any]] = None) -> Dict[str, Path]:
+        """Generate MCP server(s) from one set of normalized tool specs; returns each target's directory"""
+        targets = targets or ["fastmcp"]
+        task = progress.add_task("Generating MCP server...", total=None)
+        if targets == ["fastmcp"]:
+            self.generator.generate_from_specs(specs, out_dir, port, runtime_options)
+            out_dirs = {"fastmcp": Path(out_dir)}
+        else:
+            out_dirs = render_targets(specs, targets, out_dir, port, runtime_options=runtime_options)
+        progress.update(task, description=f"Generated {', '.join(targets)} server(s) successfully")
+        return out_dirs
+    
+    def _print_next_steps(self, out_dir: str, out_dirs: Dict[str, Path]):
         console.print(f"\n[bold green]✅ Generated MCP server in: {out_dir}[/bold green]")
         console.print("\n[bold blue]🚀 Next steps:[/bold blue]")
-        console.print(f"  cd {out_dir}")
-        console.print("  pip install -r requirements.txt")
-        console.print("  python server.py")
-        console.print("  mcp-scan inspect")
+        for step in next_steps(out_dirs) + ["mcp-scan inspect"]:
+            if step.startswith("# "):
+                console.print(f"[bold]{step[2:]}[/bold]")
+            else:
+                console.print(f"  {step}")
     
     def init(self, out_dir: str = ".mcp-generated", name: str = "my-mcp-server"):
         """Create a blank MCP server template"""
@@ -89,7 +145,7 @@ class MCPCLI:
         console.print(f"Port: {port}")
         
         # Generate initial MCP server
-        self.scan(app_path, out_dir, port)
+        self.scan(app_path, out_dir, port, reload=True)
         
         # Start FastAPI app in background
         console.print("\n[bold yellow]Starting FastAPI app...[/bold yellow]")
@@ -151,6 +207,8 @@ def main():
         epilog="""
 Examples:
   mcp-scan scan ./my-fastapi-app          # Scan FastAPI app and generate MCP server
+  mcp-scan scan ./app --emit-manifest m.json  # Scan only, persist endpoints to a manifest
+  mcp-scan generate --from-manifest m.json    # Generate MCP server from a manifest
   mcp-scan init --out ./my-mcp-server     # Create blank MCP server template
   mcp-scan dev ./my-fastapi-app           # Development mode with hot reload
   mcp-scan inspect                        # Launch MCP Inspector
@@ -165,7 +223,32 @@ Examples:
     scan_parser = subparsers.add_parser("scan", help="Scan FastAPI app and generate MCP server")
     scan_parser.add_argument("app_path", help="Path to FastAPI application directory")
     scan_parser.add_argument("--out", default=".mcp-generated", help="Output directory for generated MCP server")
-    scan_parser.add_argument("--port", type=int, default=8000, help="Port for FastAPI app (default: 8000)")
+    scan_parser.add_argument("--port", type=port_or_socket, default=8000,
+                             help="Port for FastAPI app, or unix:///path/to.sock for uvicorn --uds (default: 8000)")
+    scan_parser.add_argument("--target", action="append", choices=sorted(BACKENDS),
+                             help="Server backend to generate; repeat for several (default: fastmcp)")
+    scan_parser.add_argument("--emit-manifest", metavar="PATH",
+                             help="Only write the scanned endpoints to a manifest (.json or .json.gz)")
+    scan_parser.add_argument("--in-process", nargs="?", const="auto", metavar="MODULE:ATTRIBUTE",
+                             help="Call the FastAPI app in-process through ASGI instead of over HTTP (HTTP stays the fallback); "
+                                  "the app object is detected unless given")
+    add_serve_arguments(scan_parser)
+    
+    # Generate command
+    generate_parser = subparsers.add_parser("generate", help="Generate MCP server from an endpoint manifest")
+    generate_parser.add_argument("--from-manifest", required=True, metavar="PATH", help="Manifest written by 'scan --emit-manifest'")
+    generate_parser.add_argument("--out", default=".mcp-generated", help="Output directory for generated MCP server")
+    generate_parser.add_argument("--port", type=port_or_socket, default=8000,
+                                 help="Port for FastAPI app, or unix:///path/to.sock for uvicorn --uds (default: 8000)")
+    generate_parser.add_argument("--target", action="append", choices=sorted(BACKENDS),
+                                 help="Server backend to generate; repeat for several (default: fastmcp)")
+    generate_parser.add_argument("--include", action="append", metavar="GLOB",
+                                 help="Only generate tools whose name or path matches; repeatable")
+    generate_parser.add_argument("--tag", action="append", help="Only generate tools carrying this tag; repeatable")
+    generate_parser.add_argument("--in-process", nargs="?", const="auto", metavar="MODULE:ATTRIBUTE",
+                                 help="Call the FastAPI app in-process through ASGI instead of over HTTP (HTTP stays the fallback); "
+                                      "the app object is detected unless given")
+    add_serve_arguments(generate_parser)
     
     # Init command
     init_parser = subparsers.add_parser("init", help="Create a blank MCP server template")
@@ -197,7 +280,11 @@ Examples:
     
     try:
         if args.command == "scan":
-            cli.scan(args.app_path, args.out, args.port)
+            cli.scan(args.app_path, args.out, args.port, args.target, args.emit_manifest, args.in_process,
+                     serve_options(args))
+        elif args.command == "generate":
+            cli.generate(args.from_manifest, args.out, args.port, args.target, args.include, args.tag, args.in_process,
+                         serve_options(args))
         elif args.command == "init":
             cli.init(args.out, args.name)
         elif args.command == "dev":
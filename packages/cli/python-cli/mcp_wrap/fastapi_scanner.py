@@ -13,6 +13,8 @@ from typing import List, Dict, Any, Optional
 import re
 import os
 
+from .tool_spec import ToolSpec, build_tool_specs, generate_tool_name
+
 class FastAPIEndpoint:
     def __init__(self, path: str, method: str, function_name: str, description: str = ""):
         self.path = path
@@ -60,6 +62,44 @@ class FastAPIScanner:
         
         return self.endpoints
     
+    def find_app_object(self, app_path: str) -> Optional[str]:
+        """Locate the module-level FastAPI() instance as an importable "module:attribute" (relative to app_path)"""
+        app_path = Path(app_path)
+        root = app_path if app_path.is_dir() else app_path.parent
+        python_files = sorted(app_path.rglob("*.py")) if app_path.is_dir() else [app_path]
+        # Prefer the conventional entry points
+        python_files.sort(key=lambda p: (p.stem not in ("main", "app"), len(p.parts)))
+
+        for file_path in python_files:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    module = astroid.parse(f.read())
+            except Exception as e:
+                print(f"Warning: Could not parse {file_path}: {e}")
+                continue
+
+            for node in module.body:
+                if not isinstance(node, nodes.Assign) or not isinstance(node.value, nodes.Call):
+                    continue
+                func = node.value.func
+                func_name = func.name if isinstance(func, nodes.Name) else getattr(func, 'attrname', None)
+                if func_name != "FastAPI":
+                    continue
+                for target in node.targets:
+                    if isinstance(target, nodes.AssignName):
+                        module_name = ".".join(file_path.relative_to(root).with_suffix("").parts)
+                        if module_name.endswith(".__init__"):
+                            module_name = module_name[:-len(".__init__")]
+                        return f"{module_name}:{target.name}"
+
+        return None
+
+    def build_tool_specs(self, endpoints: Optional[List[FastAPIEndpoint]] = None) -> List[ToolSpec]:
+        """Normalize scanned endpoints into the tool specs every backend renders from"""
+        if endpoints is None:
+            endpoints = self.endpoints
+        return build_tool_specs(endpoints, self.type_cache)
+    
     def _collect_types_and_imports(self, file_path: Path):
         """Collect type definitions and imports from a file"""
         try:
@@ -315,7 +355,13 @@ class FastAPIScanner:
         try:
             # Handle astroid function arguments properly
             if hasattr(func_node, 'args') and func_node.args:
-                for arg in func_node.args.args:
+                args = func_node.args.args
+                # Annotations are kept on the arguments node, one per argument;
+                # defaults belong to the last len(defaults) positional arguments
+                annotations = list(func_node.args.annotations or [None] * len(args))
+                defaults = list(func_node.args.defaults or [])
+                defaults = [None] * (len(args) - len(defaults)) + defaults
+                for arg, annotation, default in zip(args, annotations, defaults):
                     # Get argument name safely
                     arg_name = getattr(arg, 'name', None)
                     if not arg_name or arg_name in ["self", "cls"]:
@@ -330,11 +376,11 @@ class FastAPIScanner:
                     }
                     
                     # Extract type annotation safely
-                    if hasattr(arg, 'annotation') and arg.annotation:
-                        param_info["type"] = self._extract_type_from_annotation(arg.annotation)
+                    if annotation is not None:
+                        param_info["type"] = self._extract_type_from_annotation(annotation)
                     
-                    # Check if parameter is optional (has default value)
-                    if hasattr(arg, 'default') and arg.default:
+                    # Check if parameter is optional (has a default value or an Optional annotation)
+                    if not self._default_is_required(default) or self._is_optional_annotation(annotation):
                         param_info["required"] = False
                     
                     # Try to infer location from type hints or parameter name
@@ -349,6 +395,53 @@ class FastAPIScanner:
         
         return parameters
     
+    def _default_is_required(self, default: Optional[nodes.NodeNG]) -> bool:
+        """Whether an argument with this default value is still required by FastAPI"""
+        if default is None:
+            return True
+        # Query(...), Path(...), Body(...): the first argument or default= is the real default
+        if isinstance(default, nodes.Call):
+            value = default.args[0] if default.args else None
+            for keyword in default.keywords or []:
+                if keyword.arg == "default":
+                    value = keyword.value
+            if value is None:
+                # Query() without a default is required; Depends() and friends are not arguments
+                func_name = getattr(default.func, 'name', getattr(default.func, 'attrname', ''))
+                return func_name in ("Query", "Path", "Body", "Header", "Cookie", "Form", "File")
+            return isinstance(value, nodes.Const) and value.value is Ellipsis
+        return isinstance(default, nodes.Const) and default.value is Ellipsis
+
+    def _optional_inner(self, annotation: nodes.Subscript) -> Optional[nodes.NodeNG]:
+        """X for Optional[X] and Union[X, None], None for anything else"""
+        base_name = getattr(annotation.value, 'name', getattr(annotation.value, 'attrname', ''))
+        if base_name == "Optional":
+            return annotation.slice
+        if base_name == "Union" and isinstance(annotation.slice, nodes.Tuple):
+            members = [m for m in annotation.slice.elts if not (isinstance(m, nodes.Const) and m.value is None)]
+            if len(members) == 1 and len(annotation.slice.elts) == 2:
+                return members[0]
+        return None
+
+    def _is_optional_annotation(self, annotation: Optional[nodes.NodeNG]) -> bool:
+        """Optional[X], Union[X, None] and X | None annotations"""
+        if annotation is None:
+            return False
+        if isinstance(annotation, nodes.Subscript):
+            base = annotation.value
+            base_name = getattr(base, 'name', getattr(base, 'attrname', ''))
+            if base_name == "Optional":
+                return True
+            if base_name == "Union":
+                members = annotation.slice.elts if isinstance(annotation.slice, nodes.Tuple) else [annotation.slice]
+                return any(isinstance(m, nodes.Const) and m.value is None for m in members)
+        if isinstance(annotation, nodes.BinOp) and annotation.op == "|":
+            return any(
+                (isinstance(side, nodes.Const) and side.value is None) or self._is_optional_annotation(side)
+                for side in (annotation.left, annotation.right)
+            )
+        return False
+
     def _extract_request_body(self, func_node) -> Optional[Dict[str, Any]]:
         """Extract request body information from function parameters"""
         try:
@@ -441,12 +534,22 @@ class FastAPIScanner:
                 # Handle generic types like List[str], Dict[str, int]
                 if hasattr(annotation, 'value') and isinstance(annotation.value, nodes.Name):
                     base_type = annotation.value.name
+                    inner = self._optional_inner(annotation)
+                    if inner is not None:
+                        # Optional[X] and Union[X, None] take X's type
+                        return self._extract_type_from_annotation(inner)
                     if base_type.lower() in ["list", "array"]:
                         return "array"
                     elif base_type.lower() in ["dict", "object"]:
                         return "object"
                     else:
                         return base_type.lower()
+            elif isinstance(annotation, nodes.BinOp) and annotation.op == "|":
+                # X | None takes X's type
+                members = [side for side in (annotation.left, annotation.right)
+                           if not (isinstance(side, nodes.Const) and side.value is None)]
+                if len(members) == 1:
+                    return self._extract_type_from_annotation(members[0])
             elif isinstance(annotation, nodes.Constant):
                 return str(annotation.value)
             elif isinstance(annotation, nodes.Tuple):
@@ -474,24 +577,7 @@ class FastAPIScanner:
     def _generate_tool_name(self, endpoint: FastAPIEndpoint) -> str:
         """Generate a tool name from endpoint path and method"""
         try:
-            method = endpoint.method.lower()
-            path_parts = endpoint.path.split('/')
-            
-            # Filter out empty parts and convert to camelCase
-            name_parts = []
-            for part in path_parts:
-                if part and part != '':
-                    # Remove path parameters (e.g., {id} -> ById)
-                    if part.startswith('{') and part.endswith('}'):
-                        param_name = part[1:-1]
-                        name_parts.append('By' + param_name.capitalize())
-                    else:
-                        # Convert kebab-case or snake_case to camelCase
-                        words = part.replace('-', '_').split('_')
-                        camel_case = ''.join(word.capitalize() for word in words)
-                        name_parts.append(camel_case)
-            
-            return method + ''.join(name_parts)
+            return generate_tool_name(endpoint.method, endpoint.path)
         except Exception as e:
             print(f"Warning: Could not generate tool name for endpoint {getattr(endpoint, 'path', 'unknown')}: {e}")
-            return "unknown_tool" 
\ No newline at end of file
+            return "unknown_tool"
\ No newline at end of file
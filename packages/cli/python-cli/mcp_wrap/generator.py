@@ -4,57 +4,73 @@ MCP Generator - Generate MCP servers from FastAPI endpoints
 This module generates MCP servers that provide tools mapping to FastAPI endpoints.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 import asyncio
 import json
+import pprint
 import httpx
 import yaml
 
+from .precompile import GeneratedCodeError, SourceMap, precompile_outputs
+from .runtime.projection import projectable, with_fields_argument
+from .runtime_bundle import find_health_path, install_runtime, upstream_url, write_startup_manifest
+from .tool_spec import ToolSpec, build_tool_specs
+
 class MCPGenerator:
-    def generate_server(self, endpoints: List[Any], out_dir: str, port: int = 8000):
-        """Generate MCP server from FastAPI endpoints"""
+    def generate_server(self, endpoints: List[Any], out_dir: str, port: int = 8000,
+                        runtime_options: Optional[Dict[str, Any]] = None):
+        """Generate MCP server from FastAPI endpoints or already normalized tool specs (runtime_options override runtime.json)"""
         try:
             out_path = Path(out_dir)
             out_path.mkdir(parents=True, exist_ok=True)
             
-            # Convert FastAPI endpoints to the format we need
-            endpoint_dicts = []
-            for endpoint in endpoints:
-                endpoint_dict = {
-                    'name': self._generate_tool_name(endpoint),
-                    'path': endpoint.path,
-                    'method': endpoint.method,
-                    'description': endpoint.description or f"{endpoint.method} {endpoint.path}",
-                    'parameters': self._convert_parameters(endpoint.parameters),
-                    'request_body': endpoint.request_body,
-                    'response_type': endpoint.response_type
-                }
-                endpoint_dicts.append(endpoint_dict)
+            # Normalize FastAPI endpoints into tool specs
+            specs = [e for e in endpoints if isinstance(e, ToolSpec)]
+            if len(specs) != len(endpoints):
+                specs = build_tool_specs(endpoints)
             
             # Generate MCP configuration (YAML)
-            self._generate_mcp_config(endpoint_dicts, out_path, port)
+            self._generate_mcp_config(specs, out_path, port)
             
             # Generate server code
-            self._generate_python_server(endpoint_dicts, out_path, port)
+            source_map = self._generate_python_server(specs, out_path, port)
             
             # Generate requirements.txt
             self._generate_requirements(out_path)
             
             # Generate README
-            self._generate_readme(endpoint_dicts, out_path, port)
+            self._generate_readme(specs, out_path, port)
+            
+            # Ship the shared runtime (pooled upstream client) and its runtime.json
+            install_runtime(out_path, port, runtime_options, find_health_path(specs))
+            
+            # Compile-check emitted modules and warm the bytecode cache
+            compile_errors = precompile_outputs(out_path, {"server.py": source_map} if source_map else None)
+            for error in compile_errors:
+                print(f"❌ Generated code does not compile: {error}")
+            if compile_errors:
+                raise GeneratedCodeError(compile_errors)
+            
+            # Snapshot initialize and tools/list so the server starts without importing its tools
+            manifest_written = write_startup_manifest(out_path)
             
             print(f"✅ MCP server generated in: {out_path}")
-            print(f"📁 Files created:")
-            print(f"   - mcp.yaml (MCP configuration)")
-            print(f"   - server.py (MCP server implementation)")
-            print(f"   - requirements.txt (dependencies)")
-            print(f"   - README.md (documentation)")
+            print("📁 Files created:")
+            print("   - mcp.yaml (MCP configuration)")
+            print("   - server.py (MCP server implementation)")
+            print("   - mcp_runtime/ (shared runtime package)")
+            print("   - runtime.json (upstream connection settings)")
+            if manifest_written:
+                print("   - manifest.json (initialize result and tool list for fast start)")
+            print("   - __pycache__/ (precompiled bytecode)")
+            print("   - requirements.txt (dependencies)")
+            print("   - README.md (documentation)")
         except Exception as e:
             print(f"Error generating MCP server: {e}")
             raise
     
-    def _generate_mcp_config(self, endpoints: List[Dict], out_path: Path, port: int):
+    def _generate_mcp_config(self, specs: List[ToolSpec], out_path: Path, port: int):
         """Generate MCP configuration YAML file"""
         config = {
             "name": "fastapi-mcp-server",
@@ -64,23 +80,17 @@ class MCPGenerator:
         }
         
         try:
-            for endpoint in endpoints:
+            for spec in specs:
                 tool_config = {
-                    "name": endpoint['name'],
-                    "description": endpoint['description'],
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": self._generate_tool_schema(endpoint),
-                        "required": self._get_required_parameters(endpoint)
-                    }
+                    "name": spec.name,
+                    "description": spec.description,
+                    "inputSchema": spec.input_schema()
                 }
                 
                 # Add output schema if we have response type information
-                if endpoint.get('response_type'):
-                    tool_config["outputSchema"] = {
-                        "type": self._map_type_to_json_schema(endpoint['response_type']),
-                        "description": f"Response from {endpoint['method']} {endpoint['path']}"
-                    }
+                output_schema = spec.output_schema()
+                if output_schema:
+                    tool_config["outputSchema"] = output_schema
                 
                 config["tools"].append(tool_config)
         except Exception as e:
@@ -125,9 +135,14 @@ class MCPGenerator:
         with open(out_path / "mcp.yaml", "w") as f:
             f.write(yaml_content)
     
-    def _generate_python_server(self, endpoints: List[Dict], out_path: Path, port: int):
+    def _generate_python_server(self, specs: List[ToolSpec], out_path: Path, port: int):
         """Generate Python MCP server"""
         try:
+            chunks = []
+            tool_implementations = self._generate_tool_implementations(specs, chunks)
+            tool_definitions = self._generate_tool_definitions(specs, chunks)
+            tool_tags = pprint.pformat({spec.name: spec.tags for spec in specs if spec.tags}, sort_dicts=False)
+            
             server_content = f'''"""
 Auto-generated MCP Server from FastAPI endpoints
 
@@ -135,40 +150,65 @@ This MCP server provides tools that map to your FastAPI application endpoints.
 Generated automatically by MCP Wrap CLI.
 """
 
+# Run as a script, the server answers initialize and tools/list from manifest.json
+# and imports mcp, httpx and the tools below only when a client calls one
+if __name__ == "__main__":
+    from mcp_runtime.coldstart import run
+    run("server", __file__)
+    raise SystemExit
+
 import asyncio
 import json
+import logging
 import httpx
+from pathlib import Path
 from typing import Any, Dict, List, Optional
+from urllib.parse import quote
 from mcp.server import Server
-from mcp.server.models import InitializationOptions
 from mcp.server.stdio import stdio_server
-from mcp.types import (
-    CallToolRequest,
-    CallToolResult,
-    ListToolsRequest,
-    ListToolsResult,
-    Tool,
-    TextContent,
-    ImageContent,
-    EmbeddedResource,
-    LoggingLevel
+from mcp.types import CallToolResult, ListToolsResult, TextContent, Tool
+from mcp_runtime import (
+    BATCH_DESCRIPTION, METRICS_DESCRIPTION, InvalidArguments, ToolError, ToolRuntime, batch_input_schema,
+    build_http_app, serve_http
 )
 
 # ============================================================================
 # SERVER CONFIGURATION
 # ============================================================================
 
+# Upstream URL, connection pool and timeouts live in runtime.json
+# (generated for {upstream_url(port)}; MCP_UPSTREAM_URL overrides the URL)
+runtime = ToolRuntime.from_file(Path(__file__).with_name("runtime.json"))
+
 # FastAPI app URL
-FASTAPI_URL = "http://localhost:{port}"
+FASTAPI_URL = runtime.base_url
 
-# Create MCP server
-server = Server("fastapi-mcp-server")
+# Create MCP server; the lifespan opens and closes the shared HTTP client
+server = Server("fastapi-mcp-server", version="1.0.0", lifespan=runtime.lifespan)
+
+# ============================================================================
+# TOOL DEFINITIONS
+# ============================================================================
+
+# Listed by handle_list_tools; every inputSchema is compiled once, here, into the
+# runtime's argument validator ("validation" in runtime.json)
+TOOL_DEFINITIONS = [
+    {tool_definitions}
+]
+
+runtime.compile_validators({{tool["name"]: tool["inputSchema"] for tool in TOOL_DEFINITIONS}})
+
+# Endpoint tags, which pick the scheduler lane of a tool's upstream requests
+# ("scheduler.lane_by_tag" in runtime.json)
+runtime.set_tool_tags({tool_tags})
 
 # ============================================================================
 # TOOL IMPLEMENTATIONS
 # ============================================================================
 
-{self._generate_tool_implementations(endpoints)}
+{tool_implementations}
+
+{self._generate_batch_tool(specs)}
 
 # ============================================================================
 # SERVER HANDLERS
@@ -177,13 +217,24 @@ server = Server("fastapi-mcp-server")
 @server.list_tools()
 async def handle_list_tools() -> ListToolsResult:
     """List available tools"""
-    tools = [
-        {self._generate_tool_definitions(endpoints)}
-    ]
+    tools = list(TOOL_DEFINITIONS)
+    if runtime.batch_enabled:
+        tools.append({{
+            "name": "batch_call",
+            "description": BATCH_DESCRIPTION,
+            "inputSchema": batch_input_schema(TOOL_NAMES, runtime.config["batch"]["max_items"])
+        }})
+    if runtime.metrics_tool_enabled:
+        tools.append({{
+            "name": "server_metrics",
+            "description": METRICS_DESCRIPTION,
+            "inputSchema": {{"type": "object", "properties": {{}}}}
+        }})
     tools = [Tool(**tool) for tool in tools]
     return ListToolsResult(tools=tools)
 
-@server.call_tool()
+# The runtime validates (and coerces) arguments itself, so the SDK's jsonschema pass is skipped
+@server.call_tool(validate_input=not runtime.validation_enabled)
 async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
     """Handle tool calls"""
     try:
@@ -201,65 +252,66 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResu
             content=[TextContent(type="text", text=result)]
         )
         
+    except ToolError as e:
+        return CallToolResult(
+            content=[TextContent(type="text", text=str(e))],
+            isError=True
+        )
     except Exception as e:
         return CallToolResult(
             content=[TextContent(type="text", text=f"Error: {{str(e)}}")]
         )
 
+# tools/list and tools/call go to the runtime's current registry; with "reload" enabled in
+# runtime.json, a change to this file, mcp.yaml or mcp.json loads it again and swaps its tools in
+REGISTRY = runtime.serve_tools(server, __file__)
+
 # ============================================================================
 # SERVER STARTUP
 # ============================================================================
 
 async def main():
-    """Start the MCP server"""
-    # Create a simple notification options object
-    class SimpleNotificationOptions:
-        def __init__(self):
-            self.tools_changed = False
-    
-    # Run the server using stdio (for now)
-    # Note: This server uses stdio, not HTTP
-    # To use with MCP Inspector, you'll need to use the web inspector
-    # at https://modelcontextprotocol.io/inspector
+    """Serve one client over stdio"""
+    # To test, connect MCP Inspector (https://modelcontextprotocol.io/inspector) over stdio
     async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="fastapi-mcp-server",
-                server_version="1.0.0",
-                capabilities=server.get_capabilities(
-                    notification_options=SimpleNotificationOptions(),
-                    experimental_capabilities=None
-                )
-            )
+        await server.run(read_stream, write_stream, server.create_initialization_options())
+
+def http_app():
+    """Streamable HTTP app serving every session from this process (serve.transport = "http")"""
+    return build_http_app(server, runtime)
+
+def serve():
+    """Start without the manifest: over streamable HTTP or stdio, as runtime.json says"""
+    logging.basicConfig(level=logging.WARNING)
+    if runtime.config["serve"]["transport"] == "http":
+        serve_http(http_app, "server:http_app", Path(__file__).parent, runtime.config["serve"])
+    else:
+        # stdout carries the MCP protocol, so status goes to stderr
+        logging.getLogger("mcp_runtime").warning(
+            "Starting MCP server (stdio mode) for FastAPI app at %s", FASTAPI_URL
         )
-
-if __name__ == "__main__":
-    print("🚀 Starting MCP server (stdio mode)...")
-    print("📋 To test with MCP Inspector:")
-    print("1. Open https://modelcontextprotocol.io/inspector")
-    print("2. Click 'Connect to Server'")
-    print("3. Choose 'stdio' connection type")
-    print("4. Run this server and connect to it")
-    print()
-    asyncio.run(main())
+        asyncio.run(main())
 '''
             
             with open(out_path / "server.py", "w") as f:
                 f.write(server_content)
+            
+            return SourceMap.from_chunks(server_content, chunks)
         except Exception as e:
             print(f"Warning: Could not generate Python server: {e}")
+            return None
     
     def _generate_requirements(self, out_path: Path):
         """Generate requirements.txt file"""
         try:
             requirements = """# MCP Server Requirements
 # Core MCP dependencies
-mcp>=1.0.0
+# (1.8+ for the streamable HTTP transport, 1.10+ to skip the SDK's own input validation)
+mcp>=1.10.0
 fastmcp>=1.0.0
 
 # HTTP client for making requests to FastAPI
+# (use httpx[http2] to enable "http2" in runtime.json)
 httpx>=0.24.0
 
 # JSON handling
@@ -274,7 +326,7 @@ asyncio-compat>=0.1.0
         except Exception as e:
             print(f"Warning: Could not generate requirements.txt: {e}")
     
-    def _generate_readme(self, endpoints: List[Dict], out_path: Path, port: int):
+    def _generate_readme(self, specs: List[ToolSpec], out_path: Path, port: int):
         """Generate README.md file"""
         try:
             readme_content = f"""# Generated MCP Server
@@ -312,12 +364,30 @@ The MCP server will connect to your FastAPI application and provide tools that m
 ## Configuration
 
 - **Port**: The server connects to your FastAPI app on the configured port (default: {port})
+- **runtime.json**: Upstream URL, connection pool limits, keep-alive, timeouts and HTTP/2 for the shared HTTP client. Per-tool timeouts go under `tools.<tool_name>.http.timeout`. Set `MCP_UPSTREAM_URL` to point at another upstream without editing the file
+- **Output**: JSON responses are passed through compactly without re-parsing; set `output.indent` in runtime.json to pretty-print
+- **In-process mode**: Generated with `--in-process`, tools call the imported FastAPI app directly (no sockets or uvicorn); the app's dependencies must be installed next to the MCP server. Set `MCP_UPSTREAM_TRANSPORT=http` to go over the network instead
+- **Concurrency limiter**: Upstream calls are capped by an adaptive limit with a bounded wait queue (`limiter` in runtime.json); when the queue is full, calls fail fast with an "Upstream overloaded" error
+- **Fair scheduling**: Sessions sharing the server take turns at upstream slots, and calls in a higher `scheduler.lanes` lane (set per tool or by endpoint tag) go first; `scheduler.max_in_flight_per_session` caps one session
+- **Rate limits**: Token buckets per upstream (`rate_limit.global`), per tool (`tools.<name>.rate_limit`) and per route pattern (`rate_limit.paths`) queue requests up to `max_wait` seconds or reject them (`"mode": "reject"`)
+- **Retries and circuit breaker**: Idempotent calls are retried with jittered backoff (`retry`, per tool); after repeated upstream failures calls fail fast until a probe succeeds (`breaker`)
+- **Response cache**: Set `cache.enabled` in runtime.json (globally or per tool) to serve repeated reads from memory; writes invalidate the cached reads of the same collection
+- **Batch calls**: The `batch_call` tool runs a list of `{{tool, arguments}}` items concurrently (`batch.max_concurrency`) and returns one result per item, in order
+- **HTTP transport**: Set `serve.transport` to `"http"` (or `MCP_TRANSPORT=http`) to serve many MCP sessions from one process over streamable HTTP at `serve.bind` + `serve.path`
+- **Metrics**: Per-tool counts, errors and latency percentiles (upstream, serialization, total) from the `server_metrics` tool, at `/metrics` over HTTP, or dumped to `metrics.file`
+- **Tracing**: Set `tracing.enabled` to write nested spans per tool call to `traces.jsonl` (or Chrome trace format) and send a `traceparent` header upstream
+- **Pagination**: Enable `pagination` (globally or per tool) and a list tool returns the items of every page within a budget in one call, fetching offset/page requests ahead concurrently and sending progress notifications
+- **Field projection**: Pass `fields` (comma-separated paths such as `items[*].id,items[*].name,total`) to get only those parts of the response
+- **Argument validation**: Set `validation.enabled` in runtime.json to check arguments against each tool's inputSchema before any upstream request, with lossless coercions such as `"5"` to `5`
+- **Hot reload**: Set `reload.enabled` in runtime.json (the dev command does) to swap in regenerated tools without a restart; running calls finish on the old ones and clients get `tools/list_changed`
+- **Warm-up**: Set `warmup.enabled` to probe the app's health route (`upstream.health_path`, found when scanning) with backoff at startup and open pooled connections ahead of the first calls; calls made meanwhile wait instead of failing
+- **Fast start**: Over stdio, `initialize` and `tools/list` are answered from `manifest.json` while the tools load in the background (`serve.fast_start` in runtime.json)
 - **Tools**: Each tool corresponds to an endpoint in your FastAPI application
 - **Parameters**: Tool parameters are automatically mapped from your endpoint definitions
 
 ## Available Tools
 
-{self._generate_tools_documentation(endpoints)}
+{self._generate_tools_documentation(specs)}
 
 ## Adding Custom Tools
 
@@ -325,7 +395,7 @@ To add custom tools manually:
 
 1. Edit `server.py` and add new tool functions using the `@server.tool()` decorator
 2. Update `mcp.yaml` to include the new tool definitions
-3. Restart the server
+3. Restart the server (with `reload.enabled` in runtime.json, a running server picks the changes up itself)
 
 ## Development
 
@@ -339,7 +409,7 @@ This server is generated from your FastAPI application. To regenerate:
 
 1. **Server won't start:** Make sure your FastAPI app is running on port {port}
 2. **Tools not working:** Check that the FastAPI endpoints are accessible
-3. **Connection issues:** Verify the FastAPI URL in server.py
+3. **Connection issues:** Verify the upstream URL in runtime.json
 """
             
             with open(out_path / "README.md", "w") as f:
@@ -347,250 +417,134 @@ This server is generated from your FastAPI application. To regenerate:
         except Exception as e:
             print(f"Warning: Could not generate README.md: {e}")
     
-    def _generate_tool_name(self, endpoint) -> str:
-        """Generate a tool name from an endpoint"""
-        # Convert path to camelCase
-        path_parts = endpoint.path.strip('/').split('/')
-        name_parts = []
-        
-        for part in path_parts:
-            if part.startswith('{') and part.endswith('}'):
-                # Path parameter
-                param_name = part[1:-1]
-                name_parts.append(param_name.capitalize())
-            else:
-                # Regular path segment
-                name_parts.append(part.capitalize())
-        
-        # Add method prefix
-        method_prefix = endpoint.method.lower()
-        if method_prefix == 'get':
-            method_prefix = 'get'
-        elif method_prefix == 'post':
-            method_prefix = 'create'
-        elif method_prefix == 'put':
-            method_prefix = 'update'
-        elif method_prefix == 'delete':
-            method_prefix = 'delete'
-        else:
-            method_prefix = method_prefix.lower()
-        
-        tool_name = method_prefix + ''.join(name_parts)
-        return tool_name
-    
-    def _convert_parameters(self, parameters: List[Dict]) -> Dict[str, Any]:
-        """Convert FastAPI parameters to our format"""
-        if not parameters:
-            return {}
-        
-        converted = {}
-        try:
-            for param in parameters:
-                param_name = param.get('name', '')
-                param_type = param.get('type', 'string')
-                param_location = param.get('location', 'query')
-                param_required = param.get('required', False)
-                param_description = param.get('description', '')
-                
-                converted[param_name] = {
-                    'type': self._map_type_to_json_schema(param_type),
-                    'description': param_description,
-                    'in': param_location,
-                    'required': param_required
-                }
-        except Exception as e:
-            print(f"Warning: Could not convert parameters: {e}")
-        
-        return converted
-    
-    def _generate_tool_schema(self, endpoint: Dict) -> Dict[str, Any]:
-        """Generate JSON schema for a tool"""
-        schema = {}
-        
-        try:
-            # Add path parameters
-            for param_name, param_info in endpoint.get('parameters', {}).items():
-                if param_info.get('in') == 'path':
-                    schema[param_name] = {
-                        'type': param_info.get('type', 'string'),
-                        'description': param_info.get('description', f'Path parameter: {param_name}')
-                    }
-            
-            # Add query parameters
-            for param_name, param_info in endpoint.get('parameters', {}).items():
-                if param_info.get('in') == 'query':
-                    schema[param_name] = {
-                        'type': param_info.get('type', 'string'),
-                        'description': param_info.get('description', f'Query parameter: {param_name}')
-                    }
-            
-            # Add body parameters
-            if endpoint.get('request_body'):
-                body_schema = endpoint['request_body']
-                if isinstance(body_schema, dict) and 'properties' in body_schema:
-                    for prop_name, prop_info in body_schema['properties'].items():
-                        schema[prop_name] = {
-                            'type': prop_info.get('type', 'string'),
-                            'description': prop_info.get('description', f'Body parameter: {prop_name}')
-                        }
-        except Exception as e:
-            print(f"Warning: Could not generate tool schema: {e}")
-        
-        return schema
-    
-    def _get_required_parameters(self, endpoint: Dict) -> List[str]:
-        """Get list of required parameters for a tool"""
-        required = []
-        
-        try:
-            for param_name, param_info in endpoint.get('parameters', {}).items():
-                if param_info.get('required', False):
-                    required.append(param_name)
-            
-            # Add required body parameters
-            if endpoint.get('request_body'):
-                body_schema = endpoint['request_body']
-                if isinstance(body_schema, dict) and 'required' in body_schema:
-                    required.extend(body_schema['required'])
-        except Exception as e:
-            print(f"Warning: Could not get required parameters: {e}")
-        
-        return required
-    
-    def _map_type_to_json_schema(self, type_name: str) -> str:
-        """Map Python/FastAPI types to JSON schema types"""
-        try:
-            if not type_name:
-                return "string"
-            
-            type_mapping = {
-                'str': 'string',
-                'string': 'string',
-                'int': 'integer',
-                'integer': 'integer',
-                'float': 'number',
-                'number': 'number',
-                'bool': 'boolean',
-                'boolean': 'boolean',
-                'list': 'array',
-                'array': 'array',
-                'dict': 'object',
-                'object': 'object',
-                'Any': 'string'
-            }
-            
-            return type_mapping.get(type_name.lower(), 'string')
-        except Exception as e:
-            print(f"Warning: Could not map type {type_name}: {e}")
-            return "string"
-    
-    def _generate_tool_definitions(self, endpoints: List[Dict]) -> str:
+    def _generate_tool_definitions(self, specs: List[ToolSpec], chunks: Optional[List] = None) -> str:
         """Generate tool definitions for the server"""
         definitions = []
         
         try:
-            for endpoint in endpoints:
-                name = endpoint['name']
-                description = endpoint['description']
-                schema = self._generate_tool_schema(endpoint)
-                method = endpoint['method']
-                path = endpoint['path']
-                tool_def = f'''{{
-    "name": "{name}",
-    "description": "{description}",
-    "inputSchema": {json.dumps(schema, indent=4)},
-    "outputSchema": {{"type": "object", "description": "Response from {method.upper()} {path}"}}
-}}'''
+            for spec in specs:
+                tool_def = pprint.pformat({
+                    "name": spec.name,
+                    "description": spec.description,
+                    "inputSchema": with_fields_argument(spec.input_schema()),
+                    "outputSchema": {"type": "object", "description": f"Response from {spec.method} {spec.path}"}
+                }, sort_dicts=False)
                 definitions.append(tool_def)
+                if chunks is not None:
+                    chunks.append((spec.source or f"{spec.method} {spec.path}", tool_def))
         except Exception as e:
             print(f"Warning: Could not generate tool definitions: {e}")
         
         # Join with comma and newline, no trailing comma
         return ',\n'.join(definitions)
     
-    def _generate_tool_implementations(self, endpoints: List[Dict]) -> str:
+    def _generate_tool_implementations(self, specs: List[ToolSpec], chunks: Optional[List] = None) -> str:
         """Generate tool implementations"""
         implementations = []
         
         try:
-            for endpoint in endpoints:
-                name = endpoint['name']
-                path = endpoint['path']  # e.g. '/users/{user_id}'
-                method = endpoint['method']
-                description = endpoint['description']
-                parameters = endpoint.get('parameters', {})
-                
+            for spec in specs:
                 # Create parameter handling code
-                path_param_handling = []
-                query_body_handling = []
+                # IMPORTANT: Do NOT use f-string with undefined variables for the URL!
+                request_lines = [f'        url = FASTAPI_URL + {json.dumps(spec.path)}']
+                for param in spec.path_parameters:
+                    request_lines.append(f'        if "{param.name}" in args:')
+                    request_lines.append(f'            url = url.replace("{{{param.name}}}", quote(str(args["{param.name}"]), safe=""))')
                 
-                for param_name, param_info in parameters.items():
-                    if param_info.get("in") == "path":
-                        # Always replace curly-brace params in the URL (single curly braces)
-                        path_param_handling.append(f'        if "{param_name}" in args:\n            url = url.replace("{{{param_name}}}", str(args["{param_name}"]))')
-                    elif param_info.get("in") in ["body", "query"]:
-                        query_body_handling.append(f'        if "{param_name}" in args:\n            request_data["{param_name}"] = args["{param_name}"]')
+                request_lines.append('        query_params = {}')
+                for param in spec.query_parameters:
+                    request_lines.append(f'        if args.get("{param.name}") is not None:')
+                    request_lines.append(f'            query_params["{param.name}"] = args["{param.name}"]')
                 
-                path_param_code = '\n'.join(path_param_handling)
-                query_body_code = '\n'.join(query_body_handling)
+                request_lines.append('        body = args.get("body")' if spec.has_body else '        body = None')
+                request_code = '\n'.join(request_lines)
+                # The route's {placeholders} are literal text in the generated error message
+                error_path = spec.path.replace('{', '{{').replace('}', '}}')
+                # The optional fields argument, unless the endpoint takes a parameter of that name
+                if projectable(spec.input_schema()):
+                    projection_line = '\n        fields = runtime.projection(args.get("fields"))'
+                    render_fields = ', fields=fields'
+                else:
+                    projection_line = render_fields = ''
                 
-                # IMPORTANT: Do NOT use f-string with undefined variables for the URL!
-                impl = f'''async def tool_{name}(args: Dict[str, Any]) -> str:
-    """{description}"""
+                impl = f'''@runtime.traced("{spec.name}")
+async def tool_{spec.name}(args: Dict[str, Any]) -> str:
+    {json.dumps(spec.description)}
     try:
+        args = runtime.validate("{spec.name}", args){projection_line}
+        
         # Prepare request
-        url = FASTAPI_URL + "{path}"
-{path_param_code if path_param_code else ''}
-        # Prepare request data
-        request_data = {{}}
-{query_body_code if query_body_code else ''}
-        # Make request
-        async with httpx.AsyncClient() as client:
-            if "{method.upper()}" == "GET":
-                response = await client.get(url, params=request_data)
-            elif "{method.upper()}" == "POST":
-                response = await client.post(url, json=request_data)
-            elif "{method.upper()}" == "PUT":
-                response = await client.put(url, json=request_data)
-            elif "{method.upper()}" == "DELETE":
-                response = await client.delete(url)
-            else:
-                return f"Unsupported method: {method}"
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            return json.dumps(result, indent=2)
-            
+{request_code}
+        
+        # Make request over the shared, pooled client
+        response = await runtime.request("{spec.name}", "{spec.method}", url, params=query_params, json=body, route={json.dumps(spec.path)})
+        
+        response.raise_for_status()
+        
+        # The upstream JSON is passed through unparsed unless output.indent is set
+        return runtime.render("{spec.name}", response{render_fields})
+        
+    except InvalidArguments as e:
+        raise ToolError(f"Invalid arguments for {spec.name}: {{str(e)}}") from e
     except httpx.HTTPStatusError as e:
-        return f"HTTP Error {{e.response.status_code}}: {{e.response.text}}"
+        raise ToolError(f"HTTP Error {{e.response.status_code}}: {{e.response.text}}") from e
     except Exception as e:
-        return f"Error calling {path}: {{str(e)}}"
+        raise ToolError(f"Error calling {spec.method} {error_path}: {{str(e)}}") from e
 '''
                 implementations.append(impl)
+                if chunks is not None:
+                    chunks.append((spec.source or f"{spec.method} {spec.path}", impl))
         except Exception as e:
             print(f"Warning: Could not generate tool implementations: {e}")
         
         return '\n\n'.join(implementations)
     
-    def _generate_tools_documentation(self, endpoints: List[Dict]) -> str:
+    def _generate_batch_tool(self, specs: List[ToolSpec]) -> str:
+        """Generate the batch_call meta-tool that fans out to the generated tools, and server_metrics"""
+        tool_names = pprint.pformat([spec.name for spec in specs])
+        return f'''# ============================================================================
+# BATCH META-TOOL
+# ============================================================================
+# Runs many of the tools above in one MCP round-trip. Set "batch": {{"enabled": false}}
+# in runtime.json to hide it.
+
+TOOL_NAMES = {tool_names}
+
+@runtime.traced("batch_call")
+async def tool_batch_call(args: Dict[str, Any]) -> str:
+    """Run several tool calls concurrently"""
+    async def call(name: str, arguments: Dict[str, Any]) -> str:
+        if name not in TOOL_NAMES:
+            raise ValueError(f"Unknown tool: {{name}}")
+        return await globals()[f"tool_{{name}}"](arguments)
+    
+    try:
+        return await runtime.batch(args.get("items"), call, args.get("max_concurrency") or 0)
+    except Exception as e:
+        return f"Error in batch_call: {{str(e)}}"
+
+# ============================================================================
+# METRICS TOOL
+# ============================================================================
+# Per-tool counts, errors and latency percentiles of this process. Set
+# "metrics": {{"tool": false}} in runtime.json to hide it.
+
+async def tool_server_metrics(args: Dict[str, Any]) -> str:
+    """Report this server's per-tool metrics"""
+    return runtime.metrics_report()'''
+    
+    def _generate_tools_documentation(self, specs: List[ToolSpec]) -> str:
         """Generate documentation for available tools"""
         docs = []
         
         try:
-            for endpoint in endpoints:
-                name = endpoint['name']
-                path = endpoint['path']
-                method = endpoint['method']
-                description = endpoint['description']
-                parameters = endpoint.get('parameters', {})
-                
-                doc = f"""### {name}
-- **Path:** {method.upper()} {path}
-- **Description:** {description}
-- **Parameters:** {json.dumps(parameters, indent=2)}"""
+            for spec in specs:
+                doc = f"""### {spec.name}
+- **Path:** {spec.method} {spec.path}
+- **Description:** {spec.description}
+- **Parameters:** {json.dumps(spec.input_schema()['properties'], indent=2)}"""
                 docs.append(doc)
         except Exception as e:
             print(f"Warning: Could not generate tools documentation: {e}")
         
-        return '\n\n'.join(docs) 
\ No newline at end of file
+        return '\n\n'.join(docs)
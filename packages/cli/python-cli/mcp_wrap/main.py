@@ -13,7 +13,7 @@ import subprocess
 import logging
 import traceback
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 import time
 
 from rich.console import Console
@@ -26,6 +26,11 @@ import questionary
 from mcp_wrap.fastapi_scanner import FastAPIScanner
 from mcp_wrap.generator import MCPGenerator
 from mcp_wrap.inspector import MCPInspector
+from mcp_wrap.backends import BACKENDS, next_steps, render_targets
+from mcp_wrap.manifest import write_manifest, load_manifest, read_manifest
+from mcp_wrap.precompile import GeneratedCodeError
+from mcp_wrap.runtime_bundle import add_serve_arguments, port_or_socket, runtime_overrides, serve_options
+from mcp_wrap.tool_spec import ToolSpec, filter_specs
 
 # Configure logging
 logging.basicConfig(
@@ -208,8 +213,11 @@ mcp-wrap dev . --out-dir .mcp-generated
             if logger.isEnabledFor(logging.DEBUG):
                 console.print(f"[red]Traceback: {traceback.format_exc()}[/red]")
     
-    def scan(self, app_path: str, out_dir: str = ".mcp-generated", port: int = 8000, interactive: bool = True):
-        """Scan FastAPI app and generate MCP server"""
+    def scan(self, app_path: str, out_dir: str = ".mcp-generated", port: int = 8000, interactive: bool = True,
+             targets: Optional[List[str]] = None, emit_manifest: Optional[str] = None,
+             in_process: Optional[str] = None, serve: Optional[Dict[str, Any]] = None,
+             reload: bool = False):
+        """Scan FastAPI app and generate MCP server (or only write an endpoint manifest)"""
         try:
             if interactive:
                 # Get app path
@@ -247,17 +255,21 @@ mcp-wrap dev . --out-dir .mcp-generated
                 return
             
             console.print(f"[green]✅ Found {len(endpoints)} endpoints[/green]")
+            specs = self.scanner.build_tool_specs(endpoints)
             
-            # Generate MCP server
-            console.print(f"[bold blue]🚀 Generating MCP server...[/bold blue]")
-            self.generator.generate_server(endpoints, out_dir, port)
+            if emit_manifest:
+                content_hash = write_manifest(specs, emit_manifest, source=str(app_path))
+                console.print(f"[green]✅ Endpoint manifest written: {emit_manifest} ({content_hash})[/green]")
+                console.print("\n[yellow]Next steps:[/yellow]")
+                console.print(f"1. mcp-wrap generate --from-manifest {emit_manifest} --out-dir {out_dir}")
+                return
             
-            console.print(f"[green]✅ MCP server generated: {out_dir}[/green]")
-            console.print("\n[yellow]Next steps:[/yellow]")
-            console.print(f"1. cd {out_dir}")
-            console.print("2. python server.py")
-            console.print("3. mcp-wrap inspect")
+            runtime_options = runtime_overrides(self.scanner, app_path, in_process, serve, reload)
+            self._generate(specs, out_dir, port, targets, runtime_options)
             
+        except GeneratedCodeError:
+            # The server was written but is broken: fail the command so CI notices
+            raise
         except FileNotFoundError as e:
             logger.error(f"File not found: {e}")
             console.print(f"[red]❌ {e}[/red]")
@@ -267,6 +279,58 @@ mcp-wrap dev . --out-dir .mcp-generated
             if logger.isEnabledFor(logging.DEBUG):
                 console.print(f"[red]Traceback: {traceback.format_exc()}[/red]")
     
+    def generate(self, manifest_path: str, out_dir: str = ".mcp-generated", port: int = 8000,
+                 targets: Optional[List[str]] = None, include: Optional[List[str]] = None,
+                 tags: Optional[List[str]] = None, in_process: Optional[str] = None,
+                 serve: Optional[Dict[str, Any]] = None):
+        """Generate MCP server from a previously written endpoint manifest"""
+        try:
+            console.print(f"[bold blue]📦 Loading endpoint manifest: {manifest_path}[/bold blue]")
+            specs = filter_specs(load_manifest(manifest_path), include, tags)
+            
+            if not specs:
+                console.print("[yellow]⚠️  No tools left to generate after filtering[/yellow]")
+                return
+            
+            console.print(f"[green]✅ Loaded {len(specs)} tools[/green]")
+            app_path = read_manifest(manifest_path, verify=False).get("source") if in_process else None
+            runtime_options = runtime_overrides(self.scanner, app_path, in_process, serve)
+            self._generate(specs, out_dir, port, targets, runtime_options)
+            
+        except GeneratedCodeError:
+            # The server was written but is broken: fail the command so CI notices
+            raise
+        except (FileNotFoundError, ValueError) as e:
+            logger.error(f"Invalid manifest: {e}")
+            console.print(f"[red]❌ {e}[/red]")
+        except Exception as e:
+            logger.error(f"Failed to generate from manifest: {e}")
+            console.print(f"[red]❌ Failed to generate from manifest: {e}[/red]")
+            if logger.isEnabledFor(logging.DEBUG):
+                console.print(f"[red]Traceback: {traceback.format_exc()}[/red]")
+    
+    def _generate(self, specs: List[ToolSpec], out_dir: str, port: int, targets: Optional[List[str]] = None,
+                  runtime_options: Optional[Dict[str, Any]] = None):
+        """Generate MCP server(s) from one set of normalized tool specs"""
+        targets = targets or ["lowlevel"]
+        console.print(f"[bold blue]🚀 Generating MCP server ({', '.join(targets)})...[/bold blue]")
+        if targets == ["lowlevel"]:
+            self.generator.generate_server(specs, out_dir, port, runtime_options)
+            out_dirs = {"lowlevel": Path(out_dir)}
+        else:
+            out_dirs = render_targets(specs, targets, out_dir, port, runtime_options=runtime_options)
+        
+        console.print(f"[green]✅ MCP server generated: {out_dir}[/green]")
+        console.print("\n[yellow]Next steps:[/yellow]")
+        steps = next_steps(out_dirs) + ["mcp-wrap inspect"]
+        number = 0
+        for step in steps:
+            if step.startswith("# "):
+                console.print(f"[bold]{step[2:]}[/bold]")
+                continue
+            number += 1
+            console.print(f"{number}. {step}")
+    
     def dev(self, app_path: str, out_dir: str = ".mcp-generated", port: int = 8000, mcp_port: int = 8181):
         """Development mode with hot reload"""
         try:
@@ -295,7 +359,7 @@ mcp-wrap dev . --out-dir .mcp-generated
             
             # Generate initial MCP server
             try:
-                self.scan(app_path, out_dir, port, interactive=False)
+                self.scan(app_path, out_dir, port, interactive=False, reload=True)
             except Exception as e:
                 console.print(f"[red]❌ Failed to generate MCP server: {e}[/red]")
                 return
@@ -474,6 +538,8 @@ def main():
 Examples:
   mcp-wrap init my-app                    # Initialize new FastAPI project
   mcp-wrap scan ./my-app                  # Scan and generate MCP server
+  mcp-wrap scan ./my-app --emit-manifest endpoints.json --no-interactive
+  mcp-wrap generate --from-manifest endpoints.json --port 9000
   mcp-wrap dev ./my-app                   # Development mode with hot reload
   mcp-wrap inspect                        # Launch MCP Inspector
         """
@@ -490,8 +556,33 @@ Examples:
     scan_parser = subparsers.add_parser("scan", help="Scan FastAPI app and generate MCP server")
     scan_parser.add_argument("app_path", help="Path to FastAPI app")
     scan_parser.add_argument("--out-dir", default=".mcp-generated", help="Output directory")
-    scan_parser.add_argument("--port", type=int, default=8000, help="FastAPI app port")
+    scan_parser.add_argument("--port", type=port_or_socket, default=8000,
+                             help="FastAPI app port, or unix:///path/to.sock for uvicorn --uds")
     scan_parser.add_argument("--no-interactive", action="store_true", help="Disable interactive mode")
+    scan_parser.add_argument("--target", action="append", choices=sorted(BACKENDS),
+                             help="Server backend to generate; repeat for several (default: lowlevel)")
+    scan_parser.add_argument("--emit-manifest", metavar="PATH",
+                             help="Only write the scanned endpoints to a manifest (.json or .json.gz)")
+    scan_parser.add_argument("--in-process", nargs="?", const="auto", metavar="MODULE:ATTRIBUTE",
+                             help="Call the FastAPI app in-process through ASGI instead of over HTTP (HTTP stays the fallback); "
+                                  "the app object is detected unless given")
+    add_serve_arguments(scan_parser)
+    
+    # Generate command
+    generate_parser = subparsers.add_parser("generate", help="Generate MCP server from an endpoint manifest")
+    generate_parser.add_argument("--from-manifest", required=True, metavar="PATH", help="Manifest written by 'scan --emit-manifest'")
+    generate_parser.add_argument("--out-dir", default=".mcp-generated", help="Output directory")
+    generate_parser.add_argument("--port", type=port_or_socket, default=8000,
+                                 help="FastAPI app port, or unix:///path/to.sock for uvicorn --uds")
+    generate_parser.add_argument("--target", action="append", choices=sorted(BACKENDS),
+                                 help="Server backend to generate; repeat for several (default: lowlevel)")
+    generate_parser.add_argument("--include", action="append", metavar="GLOB",
+                                 help="Only generate tools whose name or path matches; repeatable")
+    generate_parser.add_argument("--tag", action="append", help="Only generate tools carrying this tag; repeatable")
+    generate_parser.add_argument("--in-process", nargs="?", const="auto", metavar="MODULE:ATTRIBUTE",
+                                 help="Call the FastAPI app in-process through ASGI instead of over HTTP (HTTP stays the fallback); "
+                                      "the app object is detected unless given")
+    add_serve_arguments(generate_parser)
     
     # Dev command
     dev_parser = subparsers.add_parser("dev", help="Development mode with hot reload")
@@ -522,7 +613,11 @@ Examples:
         if args.command == "init":
             cli.init(args.project_name, not args.no_interactive)
         elif args.command == "scan":
-            cli.scan(args.app_path, args.out_dir, args.port, not args.no_interactive)
+            cli.scan(args.app_path, args.out_dir, args.port, not args.no_interactive, args.target, args.emit_manifest,
+                     args.in_process, serve_options(args))
+        elif args.command == "generate":
+            cli.generate(args.from_manifest, args.out_dir, args.port, args.target, args.include, args.tag, args.in_process,
+                         serve_options(args))
         elif args.command == "dev":
             cli.dev(args.app_path, args.out_dir, args.port, args.mcp_port)
         elif args.command == "inspect":
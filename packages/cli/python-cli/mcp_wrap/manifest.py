@@ -0,0 +1,73 @@
+"""
+Endpoint Manifest - Persist scanned tool specs between scan and generate
+
+A manifest holds the normalized tool specs of one scan together with a schema
+version and a content hash, so CI can scan once, cache the manifest as a build
+artifact and generate any number of server variants from it without reparsing
+the FastAPI app. Manifests ending in .gz are gzip-compressed JSON.
+"""
+
+import gzip
+import hashlib
+import json
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from . import __version__
+from .tool_spec import ToolSpec
+
+MANIFEST_SCHEMA_VERSION = 1
+
+def manifest_hash(tools: List[Dict[str, Any]]) -> str:
+    """Content hash of the serialized tool specs"""
+    canonical = json.dumps(tools, sort_keys=True, separators=(',', ':'))
+    return "sha256:" + hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def write_manifest(specs: List[ToolSpec], path: str, source: Optional[str] = None) -> str:
+    """Write specs to a manifest file and return its content hash"""
+    tools = [spec.to_dict() for spec in specs]
+    content_hash = manifest_hash(tools)
+    manifest = {
+        "schema_version": MANIFEST_SCHEMA_VERSION,
+        "generator": f"mcp-wrap {__version__}",
+        "source": source,
+        "content_hash": content_hash,
+        "tools": tools,
+    }
+
+    data = json.dumps(manifest, separators=(',', ':')).encode('utf-8')
+    manifest_path = Path(path)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    if manifest_path.suffix == ".gz":
+        data = gzip.compress(data, mtime=0)
+    manifest_path.write_bytes(data)
+
+    return content_hash
+
+def read_manifest(path: str, verify: bool = True) -> Dict[str, Any]:
+    """Read a manifest file, checking its schema version and (optionally) its content hash"""
+    manifest_path = Path(path)
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"Manifest not found: {path}")
+
+    data = manifest_path.read_bytes()
+    if manifest_path.suffix == ".gz":
+        data = gzip.decompress(data)
+    manifest = json.loads(data)
+
+    version = manifest.get("schema_version")
+    if version != MANIFEST_SCHEMA_VERSION:
+        raise ValueError(
+            f"Unsupported manifest schema version {version} in {path} "
+            f"(expected {MANIFEST_SCHEMA_VERSION}); rescan the app to regenerate it"
+        )
+
+    if verify and manifest_hash(manifest.get("tools", [])) != manifest.get("content_hash"):
+        raise ValueError(f"Manifest content hash mismatch in {path}; the file was modified or truncated")
+
+    return manifest
+
+def load_manifest(path: str, verify: bool = True) -> List[ToolSpec]:
+    """Load the tool specs stored in a manifest file"""
+    manifest = read_manifest(path, verify)
+    return [ToolSpec.from_dict(tool) for tool in manifest["tools"]]
@@ -5,11 +5,18 @@ This module generates Python MCP servers with tools that map to FastAPI endpoint
 """
 
 import os
+import pprint
 import yaml
 import json
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from .fastapi_scanner import FastAPIEndpoint
+from .precompile import GeneratedCodeError, SourceMap, precompile_outputs
+from .runtime.batch import BATCH_DESCRIPTION
+from .runtime.metrics import METRICS_DESCRIPTION
+from .runtime.projection import FIELDS_HINT, projectable, with_fields_argument
+from .runtime_bundle import find_health_path, install_runtime, upstream_url, write_startup_manifest
+from .tool_spec import ToolSpec, build_tool_specs
 import asyncio
 from mcp.server.fastmcp import FastMCP
 from mcp.types import Tool
@@ -22,14 +29,19 @@ class MCPGenerator:
     
     def generate_from_endpoints(self, endpoints: List[FastAPIEndpoint], out_dir: str, port: int = 8000):
         """Generate MCP server from FastAPI endpoints"""
+        self.generate_from_specs(build_tool_specs(endpoints), out_dir, port)
+    
+    def generate_from_specs(self, specs: List[ToolSpec], out_dir: str, port: int = 8000,
+                            runtime_options: Optional[Dict[str, Any]] = None):
+        """Generate MCP server from normalized tool specs (runtime_options override runtime.json)"""
         out_path = Path(out_dir)
         out_path.mkdir(parents=True, exist_ok=True)
         
         # Generate MCP configuration
-        self._generate_mcp_config(endpoints, out_path)
+        self._generate_mcp_config(specs, out_path)
         
         # Generate Python server
-        self._generate_python_server(endpoints, out_path, port)
+        source_map = self._generate_python_server(specs, out_path, port)
         
         # Generate requirements.txt
         self._generate_requirements(out_path)
@@ -39,6 +51,15 @@ class MCPGenerator:
         
         # Generate demo FastAPI app if it doesn't exist
         self._generate_demo_fastapi_app(out_path)
+        
+        # Ship the shared runtime (pooled upstream client) and its runtime.json
+        install_runtime(out_path, port, runtime_options, find_health_path(specs))
+        
+        # Compile-check emitted modules and warm the bytecode cache
+        self._precompile(out_path, {"server.py": source_map})
+        
+        # Snapshot initialize and tools/list so the server starts without importing its tools
+        write_startup_manifest(out_path)
     
     def generate_blank_template(self, out_dir: str, name: str = "my-mcp-server"):
         """Generate a blank MCP server template"""
@@ -56,8 +77,19 @@ class MCPGenerator:
         
         # Generate README
         self._generate_readme(out_path)
+        
+        # Compile-check emitted modules and warm the bytecode cache
+        self._precompile(out_path)
     
-    def _generate_mcp_config(self, endpoints: List[FastAPIEndpoint], out_path: Path):
+    def _precompile(self, out_path: Path, source_maps: Optional[Dict[str, SourceMap]] = None):
+        """Compile every emitted module; raises GeneratedCodeError naming the endpoint of each syntax error"""
+        errors = precompile_outputs(out_path, source_maps)
+        for error in errors:
+            print(f"Error: Generated code does not compile: {error}")
+        if errors:
+            raise GeneratedCodeError(errors)
+    
+    def _generate_mcp_config(self, specs: List[ToolSpec], out_path: Path):
         """Generate MCP configuration file"""
         config = {
             "name": "generated-mcp-server",
@@ -66,22 +98,16 @@ class MCPGenerator:
             "tools": []
         }
         
-        for endpoint in endpoints:
+        for spec in specs:
             tool_config = {
-                "name": self._generate_tool_name(endpoint),
-                "description": endpoint.description or f"{endpoint.method} {endpoint.path}",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": self._generate_tool_schema(endpoint),
-                    "required": [p["name"] for p in endpoint.parameters if p.get("required", True)]
-                }
+                "name": spec.name,
+                "description": spec.description,
+                "inputSchema": spec.input_schema()
             }
             
-            if endpoint.response_type:
-                tool_config["outputSchema"] = {
-                    "type": self._map_type_to_json_schema(endpoint.response_type),
-                    "description": f"Response from {endpoint.method} {endpoint.path}"
-                }
+            output_schema = spec.output_schema()
+            if output_schema:
+                tool_config["outputSchema"] = output_schema
             
             config["tools"].append(tool_config)
         
@@ -131,8 +157,12 @@ class MCPGenerator:
         with open(out_path / "mcp.json", 'w') as f:
             json.dump(config, f, indent=2)
     
-    def _generate_python_server(self, endpoints: List[FastAPIEndpoint], out_path: Path, port: int):
+    def _generate_python_server(self, specs: List[ToolSpec], out_path: Path, port: int):
         """Generate Python MCP server"""
+        input_schemas = pprint.pformat(
+            {spec.name: with_fields_argument(spec.input_schema()) for spec in specs}, sort_dicts=False
+        )
+        tool_tags = pprint.pformat({spec.name: spec.tags for spec in specs if spec.tags}, sort_dicts=False)
         server_code = f'''"""
 Auto-generated MCP Server from FastAPI endpoints
 
@@ -142,19 +172,44 @@ Each tool makes HTTP requests to your FastAPI application and returns the respon
 To add a new tool manually, follow the template at the bottom of this file.
 """
 
-import asyncio
+# Run as a script, the server answers initialize and tools/list from manifest.json
+# and imports mcp, httpx and the tools below only when a client calls one
+if __name__ == "__main__":
+    from mcp_runtime.coldstart import run
+    run("server", __file__)
+    raise SystemExit
+
 import json
-import httpx
+import logging
+from pathlib import Path
 from typing import Any, Dict, List
+from urllib.parse import quote
 from mcp.server.fastmcp import FastMCP
-from mcp.types import Tool
+from mcp_runtime import InvalidArguments, ToolRuntime, build_http_app, serve_http
 
 # ============================================================================
 # SERVER CONFIGURATION
 # ============================================================================
 
-# Create FastMCP server
-server = FastMCP("generated-mcp-server")
+# Upstream URL, connection pool and timeouts live in runtime.json
+# (generated for {upstream_url(port)}; MCP_UPSTREAM_URL overrides the URL)
+runtime = ToolRuntime.from_file(Path(__file__).with_name("runtime.json"))
+
+# FastAPI app URL
+FASTAPI_URL = runtime.base_url
+
+# Create FastMCP server; the lifespan opens and closes the shared HTTP client
+server = FastMCP("generated-mcp-server", lifespan=runtime.lifespan)
+
+# Schema of each tool's args, compiled once, here, into the runtime's argument
+# validator ("validation" in runtime.json)
+TOOL_INPUT_SCHEMAS = {input_schemas}
+
+runtime.compile_validators(TOOL_INPUT_SCHEMAS)
+
+# Endpoint tags, which pick the scheduler lane of a tool's upstream requests
+# ("scheduler.lane_by_tag" in runtime.json)
+runtime.set_tool_tags({tool_tags})
 
 # ============================================================================
 # AUTO-GENERATED TOOLS FROM FASTAPI ENDPOINTS
@@ -164,53 +219,64 @@ server = FastMCP("generated-mcp-server")
 
 '''
         
-        for endpoint in endpoints:
-            tool_name = self._generate_tool_name(endpoint)
-            server_code += f'''# ===== {endpoint.method} {endpoint.path} =====
+        chunks = []
+        for spec in specs:
+            # The optional fields argument, unless the endpoint takes a parameter of that name;
+            # args is opaque to FastMCP clients, so the description mentions it
+            if projectable(spec.input_schema()):
+                description = spec.description + FIELDS_HINT
+                projection_line = '\n        fields = runtime.projection(args.get("fields"))'
+                render_fields = ', fields=fields'
+            else:
+                description = spec.description
+                projection_line = render_fields = ''
+            tool_code = f'''# ===== {spec.method} {spec.path} =====
 @server.tool()
-async def {tool_name}(args: Dict[str, Any]) -> str:
-    """{endpoint.description or f"{endpoint.method} {endpoint.path}"}"""
+@runtime.traced("{spec.name}")
+async def {spec.name}(args: Dict[str, Any]) -> str:
+    {json.dumps(description)}
     try:
+        args = runtime.validate("{spec.name}", args){projection_line}
+        
         # ===== REQUEST CONFIGURATION =====
-        url = f"http://localhost:{port}{endpoint.path}"
-        method = "{endpoint.method}"
+        url = FASTAPI_URL + {json.dumps(spec.path)}
+        method = "{spec.method}"
         
         # ===== PARAMETER HANDLING =====
         query_params = {{}}
         body_params = {{}}
         
-{self._generate_parameter_handling(endpoint)}
+{self._generate_parameter_handling(spec)}
         
         # ===== URL CONSTRUCTION =====
         # Replace path parameters first
-{self._generate_path_parameter_replacement(endpoint)}
-        
-        # Add query parameters
-        if query_params:
-            query_string = "&".join([f"{{k}}={{v}}" for k, v in query_params.items() if v is not None])
-            url += "?" + query_string
+{self._generate_path_parameter_replacement(spec)}
         
         # ===== HTTP REQUEST & RESPONSE =====
-        async with httpx.AsyncClient() as client:
-            if method in ["POST", "PUT", "PATCH"] and body_params:
-                response = await client.request(method, url, json=body_params)
-            else:
-                response = await client.request(method, url)
-            
-            data = response.json() if response.headers.get("content-type", "").startswith("application/json") else response.text
-            
-            return json.dumps({{
-                "request": f"{{method}} {{url}}",
-                "response": data,
-                "status_code": response.status_code
-            }}, indent=2)
-            
+        # Sent over the shared, pooled client owned by the runtime
+        if method in ["POST", "PUT", "PATCH"] and body_params:
+            response = await runtime.request("{spec.name}", method, url, params=query_params, json=body_params, route={json.dumps(spec.path)})
+        else:
+            response = await runtime.request("{spec.name}", method, url, params=query_params, route={json.dumps(spec.path)})
+        
+        # {{request, response, status_code}} envelope; the upstream JSON is passed through unparsed
+        return runtime.render("{spec.name}", response, request=f"{{method}} {{url}}"{render_fields})
+        
+    except InvalidArguments as error:
+        return json.dumps({{
+            "error": f"Invalid arguments for {spec.name}: {{str(error)}}"
+        }}, indent=2)
     except Exception as error:
         return json.dumps({{
-            "error": f"Error calling {{method}} {endpoint.path}: {{str(error)}}"
+            "error": f"Error calling {{method}} {{url}}: {{str(error)}}"
         }}, indent=2)
 
 '''
+            server_code += tool_code
+            chunks.append((spec.source or f"{spec.method} {spec.path}", tool_code))
+        
+        # Add batch meta-tool
+        server_code += self._generate_batch_tool(specs)
         
         # Add manual tool template
         server_code += '''# ============================================================================
@@ -234,16 +300,16 @@ async def {tool_name}(args: Dict[str, Any]) -> str:
 #         param2 = args.get("param2")
 #         
 #         # ===== CUSTOM LOGIC & HTTP REQUEST =====
-#         async with httpx.AsyncClient() as client:
-#             response = await client.request(method, url, json={"param1": param1, "param2": param2})
-#             data = response.json()
-#             
-#             return json.dumps({
-#                 "message": "Custom tool executed successfully",
-#                 "data": data,
-#                 "parameters": args
-#             }, indent=2)
-#             
+#         # runtime.request() reuses the shared connection pool
+#         response = await runtime.request("my_custom_tool", method, url, json={"param1": param1, "param2": param2})
+#         data = response.json()
+#         
+#         return json.dumps({
+#             "message": "Custom tool executed successfully",
+#             "data": data,
+#             "parameters": args
+#         }, indent=2)
+#         
 #     except Exception as error:
 #         return json.dumps({
 #             "error": f"Error in custom tool: {str(error)}"
@@ -256,15 +322,28 @@ async def {tool_name}(args: Dict[str, Any]) -> str:
 # SERVER STARTUP
 # ============================================================================
 
-if __name__ == "__main__":
-    print("🚀 MCP Server starting...")
-    print(f"📡 Connecting to FastAPI app on port {port}")
-    asyncio.run(server.run())
-    print("✅ MCP Server connected and ready")
+# tools/list and tools/call go to the runtime's current registry; with "reload" enabled in
+# runtime.json, a change to this file or mcp.json loads it again and swaps its tools in
+REGISTRY = runtime.serve_tools(server, __file__)
+
+def http_app():
+    """Streamable HTTP app serving every session from this process (serve.transport = "http")"""
+    return build_http_app(server, runtime)
+
+def serve():
+    """Start without the manifest: over streamable HTTP or stdio, as runtime.json says"""
+    # stdout carries the MCP protocol, so status goes to stderr
+    logging.getLogger("mcp_runtime").warning("MCP Server starting, connecting to FastAPI app at %s", FASTAPI_URL)
+    if runtime.config["serve"]["transport"] == "http":
+        serve_http(http_app, "server:http_app", Path(__file__).parent, runtime.config["serve"])
+    else:
+        server.run()
 '''
         
         with open(out_path / "server.py", 'w') as f:
             f.write(server_code)
+        
+        return SourceMap.from_chunks(server_code, chunks)
     
     def _generate_blank_python_server(self, name: str, out_path: Path):
         """Generate blank Python MCP server"""
@@ -376,124 +455,86 @@ async def get_user_info(args: Dict[str, Any]) -> str:
 # ============================================================================
 
 if __name__ == "__main__":
-    print("🚀 MCP Server starting...")
-    asyncio.run(server.run())
-    print("✅ MCP Server connected and ready")
+    # FastMCP.run() drives its own event loop over stdio
+    server.run()
 '''
         
         with open(out_path / "server.py", 'w') as f:
             f.write(server_code)
     
-    def _generate_parameter_handling(self, endpoint: FastAPIEndpoint) -> str:
-        """Generate parameter handling code for an endpoint"""
+    def _generate_batch_tool(self, specs: List[ToolSpec]) -> str:
+        """Generate the batch_call meta-tool that fans out to the generated tools"""
+        tool_functions = ''.join(f'    {json.dumps(spec.name)}: {spec.name},\n' for spec in specs)
+        return f'''# ============================================================================
+# BATCH META-TOOL
+# ============================================================================
+# Runs many of the tools above in one MCP round-trip. Set "batch": {{"enabled": false}}
+# in runtime.json to hide it.
+
+TOOL_FUNCTIONS = {{
+{tool_functions}}}
+
+async def _call_tool(name: str, arguments: Dict[str, Any]) -> str:
+    tool_function = TOOL_FUNCTIONS.get(name)
+    if tool_function is None:
+        raise ValueError(f"Unknown tool: {{name}}")
+    # Accept the {{"args": {{...}}}} form clients send to these tools as well as bare arguments
+    if set(arguments) == {{"args"}} and isinstance(arguments["args"], dict):
+        arguments = arguments["args"]
+    return await tool_function(arguments)
+
+async def batch_call(items: List[Dict[str, Any]], max_concurrency: int = 0) -> str:
+    {json.dumps(BATCH_DESCRIPTION)}
+    try:
+        return await runtime.batch(items, _call_tool, max_concurrency)
+    except Exception as error:
+        return json.dumps({{"error": f"Error in batch_call: {{str(error)}}"}})
+
+if runtime.batch_enabled:
+    server.tool()(runtime.traced("batch_call")(batch_call))
+
+# ============================================================================
+# METRICS TOOL
+# ============================================================================
+# Per-tool counts, errors and latency percentiles of this process. Set
+# "metrics": {{"tool": false}} in runtime.json to hide it.
+
+async def server_metrics() -> str:
+    {json.dumps(METRICS_DESCRIPTION)}
+    return runtime.metrics_report()
+
+if runtime.metrics_tool_enabled:
+    server.tool()(server_metrics)
+
+'''
+    
+    def _generate_parameter_handling(self, spec: ToolSpec) -> str:
+        """Generate query and body parameter handling code for a tool"""
         lines = []
         
-        # Handle path parameters
-        for param in endpoint.parameters:
-            if param["location"] == "path":
-                lines.append(f'        # Replace path parameter {{{param["name"]}}}')
-                lines.append(f'        if "{param["name"]}" in args:')
-                lines.append(f'            url = url.replace("{{{param["name"]}}}", str(args["{param["name"]}"]))')
-            elif param["location"] == "query":
-                lines.append(f'        # Add query parameter {param["name"]}')
-                lines.append(f'        if "{param["name"]}" in args and args["{param["name"]}"] is not None:')
-                lines.append(f'            query_params["{param["name"]}"] = args["{param["name"]}"]')
-            elif param["location"] == "body":
-                lines.append(f'        # Add body parameter {param["name"]}')
-                lines.append(f'        if "{param["name"]}" in args and args["{param["name"]}"] is not None:')
-                lines.append(f'            body_params["{param["name"]}"] = args["{param["name"]}"]')
+        for param in spec.query_parameters:
+            lines.append(f'        # Add query parameter {param.name}')
+            lines.append(f'        if args.get("{param.name}") is not None:')
+            lines.append(f'            query_params["{param.name}"] = args["{param.name}"]')
         
         # Handle request body for POST/PUT/PATCH requests
-        if endpoint.method in ["POST", "PUT", "PATCH"]:
+        if spec.has_body:
             lines.append('        # Add request body')
             lines.append('        if "body" in args and args["body"] is not None:')
             lines.append('            body_params.update(args["body"])')
         
         return '\n'.join(lines)
     
-    def _generate_tool_schema(self, endpoint: FastAPIEndpoint) -> Dict[str, Any]:
-        """Generate JSON schema for tool parameters"""
-        schema = {}
-        
-        # Add path and query parameters
-        for param in endpoint.parameters:
-            schema[param["name"]] = {
-                "type": self._map_type_to_json_schema(param["type"]),
-                "description": param.get("description", f"{param['location']} parameter")
-            }
-        
-        # Add request body for POST/PUT/PATCH requests
-        if endpoint.method in ["POST", "PUT", "PATCH"]:
-            if endpoint.request_body:
-                if endpoint.request_body.get("properties"):
-                    schema["body"] = {
-                        "type": "object",
-                        "description": "Request body data",
-                        "properties": endpoint.request_body["properties"],
-                        "required": endpoint.request_body.get("required", [])
-                    }
-                else:
-                    schema["body"] = {
-                        "type": self._map_type_to_json_schema(endpoint.request_body.get("type", "object")),
-                        "description": "Request body data"
-                    }
-            else:
-                schema["body"] = {
-                    "type": "object",
-                    "description": "Request body data"
-                }
-        
-        return schema
-    
-    def _map_type_to_json_schema(self, type_name: str) -> str:
-        """Map Python type names to JSON Schema types"""
-        type_mapping = {
-            "str": "string",
-            "string": "string",
-            "int": "number",
-            "float": "number",
-            "number": "number",
-            "bool": "boolean",
-            "boolean": "boolean",
-            "list": "array",
-            "array": "array",
-            "dict": "object",
-            "object": "object",
-            "any": "object",
-            "unknown": "object"
-        }
-        
-        return type_mapping.get(type_name.lower(), "object")
-    
-    def _generate_tool_name(self, endpoint: FastAPIEndpoint) -> str:
-        """Generate a tool name from endpoint path and method"""
-        method = endpoint.method.lower()
-        path_parts = endpoint.path.split('/')
-        
-        # Filter out empty parts and convert to camelCase
-        name_parts = []
-        for part in path_parts:
-            if part and part != '':
-                # Remove path parameters (e.g., {id} -> ById)
-                if part.startswith('{') and part.endswith('}'):
-                    param_name = part[1:-1]
-                    name_parts.append('By' + param_name.capitalize())
-                else:
-                    # Convert kebab-case or snake_case to camelCase
-                    words = part.replace('-', '_').split('_')
-                    camel_case = ''.join(word.capitalize() for word in words)
-                    name_parts.append(camel_case)
-        
-        return method + ''.join(name_parts)
-    
     def _generate_requirements(self, out_path: Path):
         """Generate requirements.txt file"""
         requirements = """# MCP Server Requirements
 # Core MCP dependencies
-mcp>=1.0.0
+# (1.8+ for the streamable HTTP transport)
+mcp>=1.8.0
 fastmcp>=1.0.0
 
 # HTTP client for making requests to FastAPI
+# (use httpx[http2] to enable "http2" in runtime.json)
 httpx>=0.24.0
 
 # JSON handling
@@ -543,6 +584,24 @@ The MCP server will connect to your FastAPI application and provide tools that m
 ## Configuration
 
 - **Port**: The server connects to your FastAPI app on the configured port (default: 8000)
+- **runtime.json**: Upstream URL, connection pool limits, keep-alive, timeouts and HTTP/2 for the shared HTTP client. Per-tool timeouts go under `tools.<tool_name>.http.timeout`. Set `MCP_UPSTREAM_URL` to point at another upstream without editing the file
+- **Output**: JSON responses are passed through compactly without re-parsing; set `output.indent` in runtime.json to pretty-print
+- **In-process mode**: Generated with `--in-process`, tools call the imported FastAPI app directly (no sockets or uvicorn); the app's dependencies must be installed next to the MCP server. Set `MCP_UPSTREAM_TRANSPORT=http` to go over the network instead
+- **Concurrency limiter**: Upstream calls are capped by an adaptive limit with a bounded wait queue (`limiter` in runtime.json); when the queue is full, calls fail fast with an "Upstream overloaded" error
+- **Fair scheduling**: Sessions sharing the server take turns at upstream slots, and calls in a higher `scheduler.lanes` lane (set per tool or by endpoint tag) go first; `scheduler.max_in_flight_per_session` caps one session
+- **Rate limits**: Token buckets per upstream (`rate_limit.global`), per tool (`tools.<name>.rate_limit`) and per route pattern (`rate_limit.paths`) queue requests up to `max_wait` seconds or reject them (`"mode": "reject"`)
+- **Retries and circuit breaker**: Idempotent calls are retried with jittered backoff (`retry`, per tool); after repeated upstream failures calls fail fast until a probe succeeds (`breaker`)
+- **Response cache**: Set `cache.enabled` in runtime.json (globally or per tool) to serve repeated reads from memory; writes invalidate the cached reads of the same collection
+- **Batch calls**: The `batch_call` tool runs a list of `{tool, arguments}` items concurrently (`batch.max_concurrency`) and returns one result per item, in order
+- **HTTP transport**: Set `serve.transport` to `"http"` (or `MCP_TRANSPORT=http`) to serve many MCP sessions from one process over streamable HTTP at `serve.bind` + `serve.path`
+- **Metrics**: Per-tool counts, errors and latency percentiles (upstream, serialization, total) from the `server_metrics` tool, at `/metrics` over HTTP, or dumped to `metrics.file`
+- **Tracing**: Set `tracing.enabled` to write nested spans per tool call to `traces.jsonl` (or Chrome trace format) and send a `traceparent` header upstream
+- **Pagination**: Enable `pagination` (globally or per tool) and a list tool returns the items of every page within a budget in one call, fetching offset/page requests ahead concurrently and sending progress notifications
+- **Field projection**: Pass `fields` (comma-separated paths such as `items[*].id,items[*].name,total`) to get only those parts of the response
+- **Argument validation**: Set `validation.enabled` in runtime.json to check arguments against each tool's inputSchema before any upstream request, with lossless coercions such as `"5"` to `5`
+- **Hot reload**: Set `reload.enabled` in runtime.json (the dev command does) to swap in regenerated tools without a restart; running calls finish on the old ones and clients get `tools/list_changed`
+- **Warm-up**: Set `warmup.enabled` to probe the app's health route (`upstream.health_path`, found when scanning) with backoff at startup and open pooled connections ahead of the first calls; calls made meanwhile wait instead of failing
+- **Fast start**: Over stdio, `initialize` and `tools/list` are answered from `manifest.json` while the tools load in the background (`serve.fast_start` in runtime.json)
 - **Tools**: Each tool corresponds to an endpoint in your FastAPI application
 - **Parameters**: Tool parameters are automatically mapped from your endpoint definitions
 
@@ -552,7 +611,7 @@ To add custom tools manually:
 
 1. Edit `server.py` and add new tool functions using the `@server.tool()` decorator
 2. Update `mcp.json` to include the new tool definitions
-3. Restart the server
+3. Restart the server (with `reload.enabled` in runtime.json, a running server picks the changes up itself)
 
 ## Development
 
@@ -692,15 +751,13 @@ if __name__ == "__main__":
             with open(demo_path, 'w') as f:
                 f.write(demo_app)
 
-    def _generate_path_parameter_replacement(self, endpoint: FastAPIEndpoint) -> str:
-        """Generate path parameter replacement code for an endpoint"""
+    def _generate_path_parameter_replacement(self, spec: ToolSpec) -> str:
+        """Generate path parameter replacement code for a tool"""
         lines = []
         
-        # Replace path parameters first
-        for param in endpoint.parameters:
-            if param["location"] == "path":
-                lines.append(f'        # Replace path parameter {{{param["name"]}}}')
-                lines.append(f'        if "{param["name"]}" in args:')
-                lines.append(f'            url = url.replace("{{{param["name"]}}}", str(args["{param["name"]}"]))')
+        for param in spec.path_parameters:
+            lines.append(f'        # Replace path parameter {{{param.name}}}')
+            lines.append(f'        if "{param.name}" in args:')
+            lines.append(f'            url = url.replace("{{{param.name}}}", quote(str(args["{param.name}"]), safe=""))')
         
-        return '\n'.join(lines) 
\ No newline at end of file
+        return '\n'.join(lines)
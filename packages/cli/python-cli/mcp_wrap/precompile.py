@@ -0,0 +1,100 @@
+"""
+Precompile - Compile-check generated MCP servers and warm their bytecode cache
+
+This module compiles every Python module emitted by a generator, maps syntax
+errors back to the FastAPI endpoint that produced the offending code, and
+writes .pyc files into __pycache__ so the first launch skips compilation.
+"""
+
+import importlib.util
+import py_compile
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Optimization levels to precompile: 0 is used by `python`, 1 by `python -O`
+DEFAULT_OPTIMIZE_LEVELS = (0, 1)
+
+class GeneratedCodeError(RuntimeError):
+    """Raised when an emitted module does not compile"""
+
+    def __init__(self, errors: List[str]):
+        super().__init__(errors)
+        self.errors = errors
+
+    def __str__(self) -> str:
+        return "Generated code does not compile: " + "; ".join(self.errors)
+
+class SourceMap:
+    """Line ranges of a generated module and the endpoint each range came from"""
+
+    def __init__(self):
+        self.spans: List[Tuple[int, int, str]] = []
+
+    def add(self, start_line: int, end_line: int, label: str):
+        """Record that lines start_line..end_line (1-based, inclusive) came from label"""
+        self.spans.append((start_line, end_line, label))
+
+    @classmethod
+    def from_chunks(cls, content: str, chunks: Sequence[Tuple[str, str]]) -> "SourceMap":
+        """Build a map by locating each (label, chunk) in order inside the final content"""
+        source_map = cls()
+        position = 0
+        for label, chunk in chunks:
+            if not chunk:
+                continue
+            index = content.find(chunk, position)
+            if index < 0:
+                continue
+            start_line = content.count('\n', 0, index) + 1
+            end_line = start_line + chunk.count('\n')
+            source_map.add(start_line, end_line, label)
+            position = index + len(chunk)
+        return source_map
+
+    def lookup(self, lineno: Optional[int]) -> Optional[str]:
+        """Return the label covering lineno, if any"""
+        if lineno is None:
+            return None
+        for start_line, end_line, label in self.spans:
+            if start_line <= lineno <= end_line:
+                return label
+        return None
+
+def precompile_outputs(out_path: Path, source_maps: Optional[Dict[str, SourceMap]] = None,
+                       optimize_levels: Sequence[int] = DEFAULT_OPTIMIZE_LEVELS) -> List[str]:
+    """Compile every emitted module under out_path and write its bytecode cache.
+
+    Returns a list of error messages; an empty list means every module compiled.
+    """
+    source_maps = source_maps or {}
+    errors = []
+
+    for module_path in sorted(Path(out_path).rglob("*.py")):
+        if "__pycache__" in module_path.parts:
+            continue
+
+        relative_name = module_path.relative_to(out_path).as_posix()
+        for level in optimize_levels:
+            cfile = importlib.util.cache_from_source(
+                str(module_path), optimization=level if level else ''
+            )
+            try:
+                py_compile.compile(str(module_path), cfile=cfile, doraise=True, optimize=level)
+            except py_compile.PyCompileError as e:
+                errors.append(_format_compile_error(relative_name, e, source_maps.get(relative_name)))
+                break
+
+    return errors
+
+def _format_compile_error(relative_name: str, error: py_compile.PyCompileError,
+                          source_map: Optional[SourceMap]) -> str:
+    """Describe a compile error, pointing at the endpoint that produced it"""
+    exc_value = error.exc_value
+    lineno = getattr(exc_value, 'lineno', None)
+    reason = getattr(exc_value, 'msg', None) or str(exc_value)
+
+    message = f"{relative_name}:{lineno}: {reason}" if lineno else f"{relative_name}: {reason}"
+    origin = source_map.lookup(lineno) if source_map else None
+    if origin:
+        message += f" (generated from {origin})"
+    return message
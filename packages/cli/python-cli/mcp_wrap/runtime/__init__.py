@@ -0,0 +1,66 @@
+"""
+MCP Runtime - Support code shared by generated MCP servers
+
+The generators copy this package next to every generated server.py as
+mcp_runtime, so generated servers only depend on mcp and httpx.
+
+Names are imported from their submodules on first use, so the cold-start
+path (mcp_runtime.coldstart) does not pay for httpx, mcp and the executor.
+"""
+
+import importlib
+from typing import Any
+
+# Exported name -> submodule defining it
+_EXPORTS = {
+    "DEFAULT_CONFIG": "config",
+    "load_config": "config",
+    "merge_config": "config",
+    "tool_config": "config",
+    "BATCH_DESCRIPTION": "batch",
+    "BATCH_TOOL_NAME": "batch",
+    "ToolError": "batch",
+    "batch_input_schema": "batch",
+    "run_batch": "batch",
+    "CircuitBreaker": "breaker",
+    "UpstreamUnavailable": "breaker",
+    "ResponseCache": "cache",
+    "build_client": "client",
+    "ToolRuntime": "executor",
+    "AdaptiveLimiter": "limiter",
+    "UpstreamOverloaded": "limiter",
+    "METRICS_DESCRIPTION": "metrics",
+    "METRICS_TOOL_NAME": "metrics",
+    "Histogram": "metrics",
+    "Metrics": "metrics",
+    "collect_pages": "pagination",
+    "RateLimited": "ratelimit",
+    "RateLimiter": "ratelimit",
+    "TokenBucket": "ratelimit",
+    "SingleFlight": "singleflight",
+    "Span": "tracing",
+    "Tracer": "tracing",
+    "InvalidArguments": "validate",
+    "compile_schema": "validate",
+    "compile_validator": "validate",
+    "FIELDS_ARGUMENT": "projection",
+    "compile_projection": "projection",
+    "with_fields_argument": "projection",
+    "render_result": "serialize",
+    "build_http_app": "serve",
+    "serve_http": "serve",
+    "write_manifest": "coldstart",
+    "Warmup": "warmup",
+    "Reloader": "reload",
+    "ToolRegistry": "reload",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
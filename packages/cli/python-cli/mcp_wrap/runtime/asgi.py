@@ -0,0 +1,79 @@
+"""
+In-process ASGI upstream for generated MCP servers
+
+When the MCP server runs next to the FastAPI app, tool calls can be handed to
+the imported app object through httpx.ASGITransport, skipping sockets, HTTP
+parsing and uvicorn. The app's lifespan (startup/shutdown handlers) is driven
+here because ASGITransport only speaks the http scope.
+"""
+
+import asyncio
+import importlib
+import logging
+import sys
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("mcp_runtime")
+
+def load_app(upstream: Dict[str, Any]) -> Optional[Any]:
+    """Import the "module:attribute" named by upstream.app; None (HTTP fallback) when that fails"""
+    spec = upstream.get("app")
+    if not spec:
+        logger.warning("In-process transport requested without upstream.app; using HTTP")
+        return None
+
+    app_dir = upstream.get("app_dir")
+    if app_dir and app_dir not in sys.path:
+        sys.path.insert(0, app_dir)
+
+    module_name, _, attribute = spec.partition(":")
+    try:
+        app = importlib.import_module(module_name)
+        for part in (attribute or "app").split("."):
+            app = getattr(app, part)
+    except Exception as e:
+        logger.warning("Could not import FastAPI app %s (%s); using HTTP", spec, e)
+        return None
+    return app
+
+class LifespanManager:
+    """Run an ASGI app's lifespan protocol: startup before the first call, shutdown at exit"""
+
+    def __init__(self, app: Any):
+        self.app = app
+        self._receive: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        self._send: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._supported = True
+
+    async def _run(self):
+        scope = {"type": "lifespan", "asgi": {"version": "3.0", "spec_version": "2.0"}, "state": {}}
+        try:
+            await self.app(scope, self._receive.get, self._send.put)
+        except Exception as e:
+            # Apps without lifespan support raise on the unknown scope type
+            logger.debug("ASGI app does not support lifespan: %s", e)
+        finally:
+            await self._send.put(None)
+
+    async def _exchange(self, message_type: str):
+        await self._receive.put({"type": message_type})
+        message = await self._send.get()
+        if message is None:
+            self._supported = False
+        elif message["type"].endswith(".failed"):
+            raise RuntimeError(f"ASGI {message_type} failed: {message.get('message', '')}")
+
+    async def startup(self):
+        self._task = asyncio.ensure_future(self._run())
+        await self._exchange("lifespan.startup")
+
+    async def shutdown(self):
+        if self._task is None:
+            return
+        try:
+            if self._supported and not self._task.done():
+                await self._exchange("lifespan.shutdown")
+        finally:
+            await self._task
+            self._task = None
@@ -0,0 +1,85 @@
+"""
+batch_call meta-tool for generated MCP servers
+
+Runs a list of {tool, arguments} items concurrently under a concurrency cap
+and returns one result per item, in order, so a fan-out of N lookups costs
+the agent a single MCP round-trip. A failing item does not fail the batch.
+"""
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, List
+
+BATCH_TOOL_NAME = "batch_call"
+
+BATCH_DESCRIPTION = (
+    "Run several tool calls concurrently in one request. "
+    "Pass items as a list of {\"tool\": <tool name>, \"arguments\": {...}}; "
+    "results come back in the same order, each with ok=true and the tool's result or ok=false and an error."
+)
+
+def batch_input_schema(tool_names: List[str], max_items: int) -> Dict[str, Any]:
+    """inputSchema of the batch_call tool"""
+    return {
+        "type": "object",
+        "properties": {
+            "items": {
+                "type": "array",
+                "maxItems": max_items,
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "tool": {"type": "string", "enum": tool_names},
+                        "arguments": {"type": "object"}
+                    },
+                    "required": ["tool"]
+                }
+            },
+            "max_concurrency": {
+                "type": "integer",
+                "description": "Optional lower cap on concurrently running items"
+            }
+        },
+        "required": ["items"]
+    }
+
+class ToolError(RuntimeError):
+    """A failed tool call; the message is what the tool reports"""
+
+def _item_result(index: int, tool: Any, text: Any) -> Dict[str, Any]:
+    """Wrap one tool result; tools report failures by raising or as an {"error": ...} object"""
+    try:
+        result = json.loads(text) if isinstance(text, str) else text
+    except ValueError:
+        # Plain text, such as a text/plain upstream body
+        return {"index": index, "tool": tool, "ok": True, "result": text}
+    if isinstance(result, dict) and set(result) == {"error"}:
+        return {"index": index, "tool": tool, "ok": False, "error": result["error"]}
+    return {"index": index, "tool": tool, "ok": True, "result": result}
+
+async def run_batch(items: List[Dict[str, Any]], call: Callable[[str, Dict[str, Any]], Awaitable[Any]],
+                    max_concurrency: int, max_items: int) -> str:
+    """Run every item through call(tool, arguments) with at most max_concurrency in flight"""
+    if not isinstance(items, list):
+        raise ValueError("items must be a list of {tool, arguments} objects")
+    if len(items) > max_items:
+        raise ValueError(f"batch_call accepts at most {max_items} items, got {len(items)}")
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run_item(index: int, item: Any) -> Dict[str, Any]:
+        tool = item.get("tool") if isinstance(item, dict) else None
+        try:
+            if not isinstance(tool, str):
+                raise ValueError("each item needs a tool name")
+            if tool == BATCH_TOOL_NAME:
+                raise ValueError("batch_call cannot be nested")
+            arguments = item.get("arguments") or {}
+            async with semaphore:
+                text = await call(tool, arguments)
+        except Exception as e:
+            return {"index": index, "tool": tool, "ok": False, "error": str(e)}
+        return _item_result(index, tool, text)
+
+    results = await asyncio.gather(*[run_item(index, item) for index, item in enumerate(items)])
+    return json.dumps({"results": results}, separators=(",", ":"))
@@ -0,0 +1,81 @@
+"""
+Circuit breaker for the upstream of generated MCP servers
+
+Closed: calls pass and consecutive failures are counted. After
+failure_threshold failures the circuit opens and calls fail fast without
+touching the network. After recovery_timeout seconds it turns half-open and
+lets a few probe calls through: a successful probe closes the circuit, a
+failed one opens it again.
+"""
+
+import time
+from typing import Any, Dict
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class UpstreamUnavailable(RuntimeError):
+    """Raised instead of calling the upstream while the circuit is open"""
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 10.0, half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self.counters = {"opened": 0, "short_circuited": 0, "probes": 0}
+
+    @classmethod
+    def from_config(cls, breaker: Dict[str, Any]) -> "CircuitBreaker":
+        return cls(
+            failure_threshold=breaker["failure_threshold"],
+            recovery_timeout=breaker["recovery_timeout"],
+            half_open_max_calls=breaker["half_open_max_calls"],
+        )
+
+    def before_call(self):
+        """Admit a call or raise UpstreamUnavailable"""
+        if self.state == OPEN:
+            remaining = self._opened_at + self.recovery_timeout - time.monotonic()
+            if remaining > 0:
+                self.counters["short_circuited"] += 1
+                raise UpstreamUnavailable(f"Upstream circuit open; retrying the upstream in {remaining:.1f}s")
+            self.state = HALF_OPEN
+            self._probes = 0
+
+        if self.state == HALF_OPEN:
+            if self._probes >= self.half_open_max_calls:
+                self.counters["short_circuited"] += 1
+                raise UpstreamUnavailable("Upstream circuit half-open; waiting for the recovery probe")
+            self._probes += 1
+            self.counters["probes"] += 1
+
+    def record(self, success: bool):
+        """Report the outcome of an admitted call"""
+        if self.state == HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+
+        if success:
+            self.state = CLOSED
+            self.failures = 0
+            return
+
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.counters["opened"] += 1
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+
+    def release(self):
+        """Forget an admitted call that ended without an outcome (e.g. cancelled)"""
+        if self.state == HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "state": self.state, "consecutive_failures": self.failures}
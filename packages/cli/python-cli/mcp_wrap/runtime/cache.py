@@ -0,0 +1,161 @@
+"""
+Response cache for generated MCP servers
+
+An in-memory LRU of upstream responses for idempotent tools. Entries expire
+after the tool's TTL (or the upstream Cache-Control max-age), stale entries
+carrying an ETag are revalidated with If-None-Match, and successful
+mutations drop every entry under the mutated collection.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+CacheKey = Tuple[str, str, str, str, str]
+
+# Content is stored decoded, so transfer-level headers must not be replayed
+_DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+def cache_key(method: str, url: str, params: Optional[Dict[str, Any]] = None,
+              headers: Optional[Dict[str, str]] = None, body: Any = None) -> CacheKey:
+    """Canonical key for a request: method, URL and sorted arguments"""
+    return (
+        method.upper(),
+        url,
+        json.dumps(params or {}, sort_keys=True, default=str),
+        json.dumps({k.lower(): v for k, v in (headers or {}).items()}, sort_keys=True),
+        json.dumps(body, sort_keys=True, default=str),
+    )
+
+def parse_cache_control(value: str) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into {directive: argument}"""
+    directives = {}
+    for part in value.split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+def response_ttl(response: httpx.Response, default: float) -> Optional[float]:
+    """Seconds response may be served without revalidation; None when it must not be stored"""
+    directives = parse_cache_control(response.headers.get("cache-control", ""))
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    if directives.get("max-age") is not None:
+        try:
+            return float(directives["max-age"])
+        except ValueError:
+            pass
+    return default
+
+def collection_prefix(path: str, route: Optional[str]) -> str:
+    """The collection a mutation of path touches, e.g. /users/5 for route /users/{user_id} -> /users"""
+    segments = [s for s in path.split("/") if s]
+    if route:
+        template = [s for s in route.split("/") if s]
+        while template and template[-1].startswith("{") and segments:
+            template.pop()
+            segments.pop()
+    return "/" + "/".join(segments)
+
+class CacheEntry:
+    __slots__ = ("path", "status_code", "headers", "content", "etag", "expires")
+
+    def __init__(self, path: str, response: httpx.Response, ttl: float):
+        self.path = path
+        self.status_code = response.status_code
+        self.headers = [(k, v) for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS]
+        self.content = response.content
+        self.etag = response.headers.get("etag")
+        self.expires = time.monotonic() + ttl
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(self.status_code, headers=self.headers, content=self.content, request=request)
+
+class ResponseCache:
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self.counters = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0, "evictions": 0, "invalidations": 0}
+        self.tool_counters: Dict[str, Dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _count(self, tool: str, name: str):
+        self.counters[name] += 1
+        per_tool = self.tool_counters.setdefault(tool, {"hits": 0, "misses": 0})
+        if name in per_tool:
+            per_tool[name] += 1
+
+    def lookup(self, key: CacheKey) -> Optional[CacheEntry]:
+        """Return the entry for key (fresh or stale), marking it recently used"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def record(self, tool: str, hit: bool):
+        self._count(tool, "hits" if hit else "misses")
+
+    def store(self, key: CacheKey, path: str, response: httpx.Response, ttl: float) -> Optional[CacheEntry]:
+        """Cache a successful response unless Cache-Control forbids it"""
+        if response.status_code != 200:
+            return None
+
+        ttl = response_ttl(response, ttl)
+        # Without an ETag there is nothing to revalidate, so an already-stale entry is useless
+        if ttl is None or (ttl <= 0 and not response.headers.get("etag")):
+            self._entries.pop(key, None)
+            return None
+
+        entry = CacheEntry(path, response, ttl)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self.counters["stores"] += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+        return entry
+
+    def refresh(self, tool: str, entry: CacheEntry, response: httpx.Response, ttl: float):
+        """Extend a stale entry after the upstream answered 304 Not Modified"""
+        # A 304 without Cache-Control leaves the stored response's directives in force
+        source = response if "cache-control" in response.headers else entry.to_response(response.request)
+        entry.expires = time.monotonic() + (response_ttl(source, ttl) or 0.0)
+        self.counters["revalidated"] += 1
+        self._count(tool, "hits")
+
+    def invalidate(self, prefix: str) -> int:
+        """Drop every entry whose path is prefix or lies below it"""
+        prefix = prefix.rstrip("/")
+        stale = [
+            key for key, entry in self._entries.items()
+            if not prefix or entry.path == prefix or entry.path.startswith(prefix + "/")
+        ]
+        for key in stale:
+            del self._entries[key]
+        self.counters["invalidations"] += len(stale)
+        return len(stale)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, overall and per tool"""
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "entries": len(self._entries),
+            "hit_ratio": round(self.counters["hits"] / lookups, 4) if lookups else 0.0,
+            "tools": {tool: dict(counts) for tool, counts in self.tool_counters.items()},
+        }
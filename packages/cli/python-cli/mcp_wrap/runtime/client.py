@@ -0,0 +1,57 @@
+"""
+Shared upstream HTTP client for generated MCP servers
+
+One httpx.AsyncClient per process keeps connections to the FastAPI app alive
+between tool calls instead of paying a TCP (and TLS) handshake per call.
+"""
+
+import importlib.util
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+
+from .config import split_upstream_url
+
+logger = logging.getLogger("mcp_runtime")
+
+def build_client(config: Dict[str, Any], app: Optional[Any] = None) -> httpx.AsyncClient:
+    """Create the pooled client described by the "http" config section.
+
+    With an ASGI app the client calls it in-process instead of over the network;
+    a unix:// upstream URL connects through that Unix domain socket.
+    """
+    http = config["http"]
+    timeout = http["timeout"]
+
+    http2 = bool(http.get("http2"))
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP/2 requested but the h2 package is missing; falling back to HTTP/1.1")
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=http["max_connections"],
+        max_keepalive_connections=http["max_keepalive_connections"],
+        keepalive_expiry=http["keepalive_expiry"],
+    )
+
+    transport = None
+    _, uds = split_upstream_url(config["upstream"]["url"])
+    if app is not None:
+        # Unhandled app errors become 500 responses, as they would behind uvicorn
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    elif uds:
+        # An explicit transport ignores the client's limits, so it carries its own
+        transport = httpx.AsyncHTTPTransport(uds=uds, limits=limits, http2=http2)
+
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=httpx.Timeout(
+            connect=timeout["connect"],
+            read=timeout["read"],
+            write=timeout["write"],
+            pool=timeout["pool"],
+        ),
+        http2=http2,
+        transport=transport,
+    )
@@ -0,0 +1,228 @@
+"""
+Cold start for generated MCP servers
+
+Clients that spawn a server per session wait for `initialize` and
+`tools/list` before anything else, and importing mcp, httpx and the
+generated tool handlers takes a few hundred milliseconds. Over stdio,
+generated servers answer those two requests (and pings) from manifest.json
+instead: a snapshot of the server's initialize result and tool list, served
+with nothing but the standard library.
+
+The handler module is imported in a background thread meanwhile. The first
+other request hands the connection to the MCP SDK server, which is first
+sent the initialize exchange again (its response suppressed) so the session
+state is the same as after a normal start.
+
+The manifest is written when the server is generated. It records the size
+and mtime of server.py and runtime.json, and is rewritten at startup when
+either has changed, so a stale tool list is never served.
+"""
+
+import importlib
+import json
+import logging
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .config import load_config
+
+logger = logging.getLogger("mcp_runtime")
+
+MANIFEST_FILE = "manifest.json"
+
+# Request id of the replayed initialize, whose response the client already got
+REPLAY_ID = "mcp-runtime-replay-initialize"
+
+def fingerprint(base_dir: Path, module_name: str) -> Dict[str, Optional[List[int]]]:
+    """[mtime_ns, size] of the files a manifest is derived from"""
+    prints: Dict[str, Optional[List[int]]] = {}
+    for name in (f"{module_name}.py", "runtime.json"):
+        try:
+            stat = (base_dir / name).stat()
+            prints[name] = [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            prints[name] = None
+    return prints
+
+def load_manifest(base_dir: Path, module_name: str) -> Optional[Dict[str, Any]]:
+    """The manifest, or None when it is missing, unreadable or stale"""
+    try:
+        with open(base_dir / MANIFEST_FILE, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("fingerprint") != fingerprint(base_dir, module_name):
+        return None
+    return manifest
+
+async def snapshot(server: Any) -> Dict[str, Any]:
+    """Initialize result and tool list of a low-level Server or FastMCP server"""
+    import mcp.types as types
+    from mcp.shared.version import SUPPORTED_PROTOCOL_VERSIONS
+
+    mcp_server = getattr(server, "_mcp_server", server)
+    options = mcp_server.create_initialization_options()
+    result = await mcp_server.request_handlers[types.ListToolsRequest](types.ListToolsRequest(method="tools/list"))
+    return {
+        "protocol_versions": list(SUPPORTED_PROTOCOL_VERSIONS),
+        "latest_protocol_version": types.LATEST_PROTOCOL_VERSION,
+        "capabilities": options.capabilities.model_dump(by_alias=True, mode="json", exclude_none=True),
+        "server_info": {"name": options.server_name, "version": options.server_version},
+        "instructions": options.instructions,
+        "tools": result.root.model_dump(by_alias=True, mode="json", exclude_none=True)["tools"],
+    }
+
+def write_manifest(module_name: str = "server", base_dir: Optional[Path] = None) -> Path:
+    """Import the server module and write its manifest next to it"""
+    import asyncio
+    from .metrics import write_atomic
+
+    base_dir = Path(base_dir or Path.cwd())
+    module = importlib.import_module(module_name)
+    manifest = {"fingerprint": fingerprint(base_dir, module_name), **asyncio.run(snapshot(module.server))}
+    path = base_dir / MANIFEST_FILE
+    write_atomic(path, json.dumps(manifest, indent=1, ensure_ascii=False) + "\n")
+    return path
+
+def run(module_name: str, file: str):
+    """Start a generated server run as a script: from the manifest when possible, else normally"""
+    base_dir = Path(file).resolve().parent
+    serve = load_config(base_dir / "runtime.json")["serve"]
+    if serve["transport"] != "stdio" or not serve["fast_start"]:
+        importlib.import_module(module_name).serve()
+        return
+
+    manifest = load_manifest(base_dir, module_name)
+    if manifest is None:
+        module = importlib.import_module(module_name)
+        try:
+            write_manifest(module_name, base_dir)
+        except Exception as e:
+            logger.warning("Could not write %s: %s", MANIFEST_FILE, e)
+        module.serve()
+        return
+
+    FastStart(manifest, module_name).serve()
+
+class FastStart:
+    """Answers initialize, tools/list and ping from the manifest until another request arrives"""
+
+    def __init__(self, manifest: Dict[str, Any], module_name: str):
+        self.manifest = manifest
+        self.module_name = module_name
+        # Client messages the SDK server has to see before the one that is handed off
+        self.replay: List[bytes] = []
+        self.initialized = False
+        self._preloading: Optional[threading.Thread] = None
+
+    def serve(self):
+        stdin = sys.stdin.buffer
+        while True:
+            line = stdin.readline()
+            if not line:
+                return
+            if not line.strip():
+                continue
+            try:
+                message = json.loads(line)
+            except ValueError:
+                message = None
+            method = message.get("method") if isinstance(message, dict) else None
+            is_request = isinstance(message, dict) and "id" in message
+
+            if method == "initialize" and is_request and not self.replay:
+                self._respond(message["id"], self._initialize_result(message.get("params") or {}))
+                self.replay.append(json.dumps({**message, "id": REPLAY_ID}).encode())
+                self._preload()
+            elif method == "notifications/initialized" and self.replay:
+                self.initialized = True
+                self.replay.append(line)
+            elif method == "ping" and is_request:
+                self._respond(message["id"], {})
+            elif method == "tools/list" and is_request and self.initialized \
+                    and not (message.get("params") or {}).get("cursor"):
+                self._respond(message["id"], {"tools": self.manifest["tools"]})
+            elif method is not None and not is_request and self.initialized:
+                # Other notifications (cancellations, roots changes) reach the SDK server later
+                self.replay.append(line)
+            else:
+                self._hand_off(line)
+                return
+
+    def _initialize_result(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """The result the SDK would send: the client's protocol version when supported, else the latest"""
+        requested = params.get("protocolVersion")
+        manifest = self.manifest
+        result = {
+            "protocolVersion": requested if requested in manifest["protocol_versions"]
+            else manifest["latest_protocol_version"],
+            "capabilities": manifest["capabilities"],
+            "serverInfo": manifest["server_info"],
+        }
+        if manifest.get("instructions"):
+            result["instructions"] = manifest["instructions"]
+        return result
+
+    def _respond(self, request_id: Any, result: Dict[str, Any]):
+        response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        sys.stdout.buffer.write(json.dumps(response, separators=(",", ":"), ensure_ascii=False).encode() + b"\n")
+        sys.stdout.buffer.flush()
+
+    def _preload(self):
+        """Import the handlers while the client is still busy with initialize and tools/list"""
+        def preload():
+            try:
+                importlib.import_module(self.module_name)
+            except Exception:
+                # Raised again, with its traceback, when the import is retried at hand-off
+                pass
+
+        self._preloading = threading.Thread(target=preload, name="mcp-runtime-preload", daemon=True)
+        self._preloading.start()
+
+    def _hand_off(self, line: bytes):
+        if self._preloading is not None:
+            self._preloading.join()
+        module = importlib.import_module(self.module_name)
+        import asyncio
+        asyncio.run(hand_off(module.server, self.replay + [line]))
+
+async def hand_off(server: Any, replay: List[bytes]):
+    """Run the SDK server over stdio, feeding it the replayed client messages first"""
+    import anyio
+    import mcp.types as types
+    from mcp.server.stdio import stdio_server
+    from mcp.shared.message import SessionMessage
+
+    mcp_server = getattr(server, "_mcp_server", server)
+    async with stdio_server() as (read_stream, write_stream):
+        to_server, server_reads = anyio.create_memory_object_stream(0)
+        server_writes, from_server = anyio.create_memory_object_stream(0)
+
+        async def feed():
+            async with to_server:
+                for line in replay:
+                    try:
+                        message = types.JSONRPCMessage.model_validate_json(line)
+                    except Exception as e:
+                        await to_server.send(e)
+                        continue
+                    await to_server.send(SessionMessage(message))
+                async for message in read_stream:
+                    await to_server.send(message)
+
+        async def forward():
+            # Closing write_stream ends the stdout writer once the server is done
+            async with from_server, write_stream:
+                async for message in from_server:
+                    response = message.message.root
+                    if isinstance(response, (types.JSONRPCResponse, types.JSONRPCError)) and response.id == REPLAY_ID:
+                        continue
+                    await write_stream.send(message)
+
+        async with anyio.create_task_group() as tasks:
+            tasks.start_soon(feed)
+            tasks.start_soon(forward)
+            await mcp_server.run(server_reads, server_writes, mcp_server.create_initialization_options())
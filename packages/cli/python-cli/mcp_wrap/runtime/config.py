@@ -0,0 +1,278 @@
+"""
+Runtime configuration for generated MCP servers
+
+Settings live in runtime.json next to server.py. Missing keys fall back to
+DEFAULT_CONFIG, so a generated file only has to contain what was customized.
+"""
+
+import copy
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "upstream": {
+        # Base URL of the wrapped FastAPI app, or unix:///path/to.sock for an app
+        # served with uvicorn --uds; MCP_UPSTREAM_URL overrides it
+        "url": "http://localhost:8000",
+        # "http", or "asgi" to call the imported app in-process (HTTP is the fallback);
+        # MCP_UPSTREAM_TRANSPORT overrides it
+        "transport": "http",
+        # "module:attribute" of the FastAPI app and the directory to import it from
+        "app": None,
+        "app_dir": None,
+        # Route of the app's health check, probed by the warm-up (set from the scanned endpoints)
+        "health_path": None,
+    },
+    "serve": {
+        # "stdio" (one client per process) or "http" (streamable HTTP with SSE, many
+        # sessions per process sharing one runtime); MCP_TRANSPORT overrides it
+        "transport": "stdio",
+        # HOST:PORT to listen on over HTTP; MCP_BIND overrides it
+        "bind": "127.0.0.1:3000",
+        "path": "/mcp",
+        # uvicorn worker processes; each has its own pools and caches, and several run stateless
+        "workers": 1,
+        # Open sessions per process; a new session beyond this gets a 503
+        "max_sessions": 1000,
+        # Seconds without requests before a session is closed (null: until the client ends it)
+        "session_idle_timeout": 1800.0,
+        # Fresh transport per request, no session tracking
+        "stateless": False,
+        # Answer POSTs with plain JSON instead of an SSE stream
+        "json_response": False,
+        # stdio: answer initialize and tools/list from manifest.json and load mcp, httpx
+        # and the tools on the first other request
+        "fast_start": True,
+    },
+    "http": {
+        # Process-wide connection pool shared by every tool
+        "max_connections": 100,
+        "max_keepalive_connections": 20,
+        "keepalive_expiry": 30.0,
+        "timeout": {"connect": 5.0, "read": 30.0, "write": 30.0, "pool": 10.0},
+        # Requires the h2 package (pip install "httpx[http2]")
+        "http2": False,
+    },
+    "warmup": {
+        # At startup, in the background: probe upstream.health_path (the app root if there is none)
+        # with backoff until the app answers, then open this many pooled connections; tool calls
+        # made meanwhile wait for it instead of failing
+        "enabled": False,
+        "connections": 4,
+        # Seconds until the warm-up gives up and lets calls through
+        "timeout": 30.0,
+        "backoff": 0.1,
+        "max_backoff": 1.0,
+        "probe_timeout": 2.0,
+        # Readiness endpoint of the HTTP transport: 200 once ready, 503 before
+        "path": "/ready",
+    },
+    "limiter": {
+        # Adaptive cap on concurrent upstream requests (AIMD on observed latency)
+        "enabled": True,
+        "initial_limit": 16,
+        "min_limit": 1,
+        "max_limit": 256,
+        # Calls over the limit wait in a FIFO queue; beyond max_queue they are rejected at once
+        "max_queue": 1024,
+        # Seconds a call may wait for a slot; per-tool overrides allowed
+        "queue_timeout": 30.0,
+        # Cut the limit by backoff when latency exceeds latency_tolerance x the baseline
+        "latency_tolerance": 1.5,
+        "backoff": 0.9,
+    },
+    "scheduler": {
+        # Which waiting call gets a free upstream slot: the first priority lane with waiting calls,
+        # and within it each session in turn (deficit round-robin); disabled, a single FIFO queue
+        "enabled": True,
+        # Lanes, highest priority first; tools.<name>.scheduler.lane puts one tool in a lane
+        "lanes": ["interactive", "default", "bulk"],
+        "default_lane": "default",
+        # Endpoint tag -> lane, e.g. {"health": "interactive", "exports": "bulk"}
+        "lane_by_tag": {},
+        # Share of a turn one upstream request uses (per-tool overrides allowed); a session gets
+        # quantum per turn, so a tool with cost 4 is admitted a quarter as often as one with cost 1
+        "cost": 1.0,
+        "quantum": 1.0,
+        # Upstream requests one session may have in flight; its other calls wait (null: no cap)
+        "max_in_flight_per_session": None,
+    },
+    "rate_limit": {
+        # Token buckets on upstream requests (retries included); a request takes a token from
+        # every bucket that applies. rate: requests per second, burst: bucket size (default: rate)
+        # One bucket shared by every upstream request
+        "global": {"rate": None, "burst": None},
+        # A bucket per tool: set rate (and burst) under tools.<name>.rate_limit
+        "rate": None,
+        "burst": None,
+        # A bucket per route pattern, shared by the tools it matches: "METHOD /path" or "/path",
+        # matched against the route template with * wildcards,
+        # e.g. {"POST /search": {"rate": 5}, "/reports/*": {"rate": 1, "burst": 3}}
+        "paths": {},
+        # "queue": wait for a token up to max_wait seconds; "reject": fail at once when a bucket
+        # is empty (per-tool overrides allowed)
+        "mode": "queue",
+        "max_wait": 10.0,
+    },
+    "retry": {
+        # Retry idempotent calls on transport errors and these statuses, with
+        # exponential backoff (backoff x 2^attempt, capped, full jitter); per-tool overrides allowed
+        "enabled": True,
+        "attempts": 3,
+        "methods": ["GET", "HEAD", "OPTIONS", "PUT", "DELETE"],
+        "status_codes": [429, 502, 503, 504],
+        "backoff": 0.2,
+        "max_backoff": 5.0,
+    },
+    "breaker": {
+        # Fail fast after failure_threshold consecutive upstream failures, then probe
+        # again after recovery_timeout seconds
+        "enabled": True,
+        "failure_threshold": 5,
+        "recovery_timeout": 10.0,
+        "half_open_max_calls": 1,
+    },
+    "batch": {
+        # The batch_call meta-tool: many tool calls in one MCP round-trip
+        "enabled": True,
+        "max_concurrency": 8,
+        "max_items": 50,
+    },
+    "metrics": {
+        # Per-tool counts, errors, in-flight calls, latency and size histograms
+        "enabled": True,
+        # Offer the server_metrics tool
+        "tool": True,
+        # Prometheus text endpoint of the HTTP transport
+        "path": "/metrics",
+        # Dump a snapshot every interval seconds (*.prom: Prometheus text, else JSON);
+        # relative to runtime.json
+        "file": None,
+        "interval": 60.0,
+    },
+    "tracing": {
+        # Nested spans per tool call (arguments, queue, connection, upstream, render),
+        # appended to a local file; no collector needed
+        "enabled": False,
+        # Relative to runtime.json; "jsonl" (one span per line) or "chrome" (Perfetto / chrome://tracing)
+        "file": "traces.jsonl",
+        "format": "jsonl",
+        # Fraction of tool calls traced
+        "sample_rate": 1.0,
+        # Send a W3C traceparent header to the upstream
+        "propagate": True,
+    },
+    "pagination": {
+        # Return the items of several pages in one tool call; enable globally or per tool (GET only)
+        "enabled": False,
+        # How the next page is found: "offset" (offset_param += limit), "page" (page_param += 1),
+        # "cursor" (cursor_field of the body sent back as cursor_param), "link" (Link rel="next"
+        # header) or "auto": a Link header, then a cursor, then the offset or page parameters
+        # the call was made with
+        "mode": "auto",
+        "limit_param": "limit",
+        "offset_param": "offset",
+        "page_param": "page",
+        "cursor_param": "cursor",
+        # Dotted path into the body
+        "cursor_field": "next_cursor",
+        # List field holding a page's items (null: the body if it is a list, else its first list field)
+        "items_field": None,
+        # limit sent when an "offset" or "page" call has none
+        "page_size": 100,
+        # Offset and page requests fetched ahead concurrently
+        "prefetch": 4,
+        # Stop after this many items, bytes of page bodies or pages
+        "max_items": 1000,
+        "max_bytes": 1048576,
+        "max_pages": 50,
+    },
+    "cache": {
+        # In-memory LRU of upstream responses; enable globally or per tool
+        "enabled": False,
+        "max_entries": 1024,
+        # Seconds a response is served without asking the upstream (Cache-Control max-age wins)
+        "ttl": 30.0,
+        "methods": ["GET"],
+    },
+    "coalesce": {
+        # Identical concurrent calls with these methods share one upstream request
+        "enabled": True,
+        "methods": ["GET", "HEAD"],
+    },
+    "output": {
+        # Return JSON upstream bodies verbatim instead of parsing and re-serializing them
+        "passthrough": True,
+        # Pretty-print results (e.g. 2); forces a parse of every body
+        "indent": None,
+    },
+    "validation": {
+        # Check arguments against each tool's inputSchema before any upstream request, instead of
+        # the MCP SDK's slower jsonschema pass; per-tool overrides allowed
+        "enabled": False,
+        # Convert lossless mismatches ("5" -> 5, "true" -> true, 5 -> "5") instead of rejecting them
+        "coerce": True,
+    },
+    "reload": {
+        # Watch server.py, mcp.json and mcp.yaml and swap in the regenerated tools without a
+        # restart; calls already running finish on the old tools and clients get tools/list_changed.
+        # Off unless generated by the dev command, so a deployed server never re-imports its code
+        "enabled": False,
+        # Seconds between checks; a change is loaded once two checks agree
+        "interval": 1.0,
+        # More files to watch, relative to runtime.json
+        "watch": [],
+        # Seconds to wait for calls on the old tools before their module is dropped anyway
+        "drain_timeout": 30.0,
+    },
+    # Per-tool overrides, keyed by tool name, of any section above that supports them
+    "tools": {},
+}
+
+def merge_config(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """Recursively merge override into a copy of base"""
+    merged = copy.deepcopy(base)
+    for key, value in (override or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+def load_config(path: Optional[Path] = None) -> Dict[str, Any]:
+    """Load runtime.json (if present) over the defaults"""
+    overrides = {}
+    if path and Path(path).exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+
+    config = merge_config(DEFAULT_CONFIG, overrides)
+
+    upstream_url = os.environ.get("MCP_UPSTREAM_URL")
+    if upstream_url:
+        config["upstream"]["url"] = upstream_url
+    upstream_transport = os.environ.get("MCP_UPSTREAM_TRANSPORT")
+    if upstream_transport:
+        config["upstream"]["transport"] = upstream_transport
+    transport = os.environ.get("MCP_TRANSPORT")
+    if transport:
+        config["serve"]["transport"] = transport
+    bind = os.environ.get("MCP_BIND")
+    if bind:
+        config["serve"]["bind"] = bind
+
+    return config
+
+def split_upstream_url(url: str) -> Tuple[str, Optional[str]]:
+    """(HTTP base URL, Unix socket path) for an upstream URL; unix:// URLs are served as http://localhost"""
+    if url.startswith("unix://"):
+        return "http://localhost", url[len("unix://"):]
+    return url.rstrip("/"), None
+
+def tool_config(config: Dict[str, Any], tool: str, section: str) -> Dict[str, Any]:
+    """A config section with the per-tool overrides for tool applied"""
+    overrides = config.get("tools", {}).get(tool, {}).get(section)
+    base = config.get(section, {})
+    return merge_config(base, overrides) if overrides else base
@@ -0,0 +1,552 @@
+"""
+Tool executor for generated MCP servers
+
+ToolRuntime owns the process-wide upstream client. It is opened by the MCP
+server lifespan at startup, closed at shutdown, and every generated tool
+sends its upstream request through ToolRuntime.request(). There is one
+runtime per runtime.json in a process, so a reloaded server module keeps it.
+"""
+
+import asyncio
+import json as jsonlib
+import logging
+import time
+import weakref
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from .asgi import LifespanManager, load_app
+from .batch import run_batch
+from .breaker import CLOSED, CircuitBreaker
+from .cache import ResponseCache, cache_key, collection_prefix
+from .client import build_client
+from .config import load_config, split_upstream_url, tool_config
+from .limiter import AdaptiveLimiter
+from .metrics import Metrics, call_started, write_atomic
+from .pagination import collect_pages, share_progress
+from .projection import Projection, compile_projection
+from .ratelimit import RateLimiter, TokenBucket
+from .reload import Reloader, ToolRegistry, route_tools
+from .retry import backoff_delay, retry_after
+from .scheduler import current_session, lane_for
+from .serialize import render_result
+from .singleflight import SingleFlight
+from .tracing import HttpPhases, Tracer, annotate, current_span
+from .validate import InvalidArguments, compile_validator
+from .warmup import Warmup
+
+logger = logging.getLogger("mcp_runtime")
+
+MUTATING_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+# Responses that mean the upstream is shedding load
+OVERLOAD_STATUS_CODES = (429, 503, 504)
+
+# Responses that count as upstream failures for the circuit breaker
+UNAVAILABLE_STATUS_CODES = (502, 503, 504)
+
+class ToolRuntime:
+    # Runtimes by resolved runtime.json path
+    _instances: Dict[Path, "ToolRuntime"] = {}
+
+    def __init__(self, config: Dict[str, Any], base_dir: Optional[Path] = None):
+        self.config = config
+        # Relative file paths in the config (metrics dump, traces) are relative to runtime.json
+        self.base_dir = Path(base_dir or ".")
+        self.base_url, self.uds = split_upstream_url(config["upstream"]["url"])
+        self.cache = ResponseCache(config["cache"]["max_entries"])
+        self.flights = SingleFlight()
+        self.limiter = AdaptiveLimiter.from_config(config["limiter"], config["scheduler"])
+        self.breaker = CircuitBreaker.from_config(config["breaker"])
+        self.rate_limits = RateLimiter(config["rate_limit"])
+        # Per tool: the buckets its requests take tokens from, reject mode and max_wait
+        self._rate_limited: Dict[str, Tuple[Tuple[TokenBucket, ...], bool, float]] = {}
+        self.retries = 0
+        self.metrics: Optional[Metrics] = Metrics() if config["metrics"]["enabled"] else None
+        self.tracer: Optional[Tracer] = (
+            Tracer.from_config(config["tracing"], self.base_dir) if config["tracing"]["enabled"] else None
+        )
+        self.app: Optional[Any] = None
+        self._app_loaded = False
+        self._lifespan: Optional[LifespanManager] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._users = 0
+        self.warmup: Optional[Warmup] = None
+        self._warming = False
+        self._warmup_task: Optional[asyncio.Task] = None
+        self._metrics_dump: Optional[asyncio.Task] = None
+        self._validators: Dict[str, Callable[[Optional[Dict[str, Any]]], Dict[str, Any]]] = {}
+        # Endpoint tags of each tool, and the scheduler lane they resolve to
+        self._tags: Dict[str, List[str]] = {}
+        self._lanes: Dict[str, str] = {}
+        # Tools that new calls go to, and the sessions told when a reload replaces them
+        self.registry: Optional[ToolRegistry] = None
+        self.sessions: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        self.reloader: Optional[Reloader] = None
+        self._watch: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_file(cls, path: Path) -> "ToolRuntime":
+        """The process's runtime for a runtime.json file (defaults when it is missing), created on first use"""
+        key = Path(path).resolve()
+        runtime = cls._instances.get(key)
+        if runtime is None:
+            runtime = cls._instances[key] = cls(load_config(path), Path(path).parent)
+        return runtime
+
+    @property
+    def in_process(self) -> bool:
+        """Whether tool calls go to the imported app instead of over the network"""
+        return self.app is not None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared upstream client, created on first use"""
+        if not self._app_loaded:
+            self._app_loaded = True
+            if self.config["upstream"].get("transport") == "asgi":
+                self.app = load_app(self.config["upstream"])
+        if self._client is None or self._client.is_closed:
+            self._client = build_client(self.config, self.app)
+        return self._client
+
+    async def __aenter__(self) -> "ToolRuntime":
+        self._users += 1
+        self.client
+        if self.app is not None and self._lifespan is None:
+            self._lifespan = LifespanManager(self.app)
+            try:
+                await self._lifespan.startup()
+            except Exception as e:
+                logger.warning("In-process app failed to start (%s); using HTTP", e)
+                await self._lifespan.shutdown()
+                self._lifespan = None
+                self.app = None
+                await self.aclose()
+                self.client
+        if self.config["warmup"]["enabled"] and self._warmup_task is None:
+            # In the background, so the MCP server answers initialize meanwhile
+            self.warmup = Warmup.from_config(self.base_url, self.config["upstream"], self.config["warmup"])
+            self._warming = True
+            self._warmup_task = asyncio.create_task(self._warm_up())
+        metrics_file = self.config["metrics"]["file"]
+        if self.metrics is not None and metrics_file and self._metrics_dump is None:
+            self._metrics_dump = asyncio.create_task(self._dump_metrics(self.base_dir / metrics_file))
+        if self.registry is not None and self.config["reload"]["enabled"] and self._watch is None:
+            self.reloader = self.reloader or Reloader.from_config(self, self.config["reload"])
+            self._watch = asyncio.create_task(self.reloader.watch())
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._users -= 1
+        if self._users <= 0:
+            self._users = 0
+            await self.aclose()
+
+    async def aclose(self):
+        """Close the shared client and its pooled connections"""
+        if self._warmup_task is not None:
+            task, self._warmup_task = self._warmup_task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._watch is not None:
+            task, self._watch = self._watch, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            await self.reloader.aclose()
+        if self._metrics_dump is not None:
+            task, self._metrics_dump = self._metrics_dump, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._lifespan is not None:
+            lifespan, self._lifespan = self._lifespan, None
+            await lifespan.shutdown()
+        if self.tracer is not None:
+            self.tracer.close()
+
+    async def _warm_up(self):
+        try:
+            # In-process calls need no connections
+            await self.warmup.run(self.client, preopen=not self.in_process)
+        finally:
+            self._warming = False
+
+    def readiness(self) -> Dict[str, Any]:
+        """Whether the upstream is ready for tool calls, with the warm-up report"""
+        if self.warmup is None:
+            enabled = self.config["warmup"]["enabled"]
+            return {"ready": not enabled, "state": "idle" if enabled else "disabled"}
+        return {"ready": self.warmup.ready, **self.warmup.report()}
+
+    @asynccontextmanager
+    async def lifespan(self, server: Any):
+        """MCP server lifespan: open the shared client at startup, close it at shutdown"""
+        async with self:
+            yield {}
+
+    def stats(self) -> Dict[str, Any]:
+        """Runtime counters for diagnostics"""
+        return {
+            "cache": self.cache.stats(),
+            "coalesce": self.flights.stats(),
+            "limiter": self.limiter.stats(),
+            "breaker": self.breaker.stats(),
+            "rate_limit": self.rate_limits.stats(),
+            "retries": self.retries,
+            **({"tracing": self.tracer.stats()} if self.tracer is not None else {}),
+            **({"reload": self.reloader.stats()} if self.reloader is not None else {}),
+            **({"warmup": self.warmup.report()} if self.warmup is not None else {}),
+        }
+
+    def serve_tools(self, server: Any, source: str) -> ToolRegistry:
+        """Registry of server's tools; the first one is served, later ones are swapped in by the reloader"""
+        registry = ToolRegistry(server, source)
+        if self.registry is None:
+            self.registry = registry
+            if self.config["reload"]["enabled"]:
+                route_tools(server, self)
+        return registry
+
+    def traced(self, tool: str) -> Callable:
+        """Decorator tracing a generated tool function; a no-op unless tracing is enabled"""
+        if self.tracer is None:
+            return lambda function: function
+        return self.tracer.traced(tool)
+
+    def metrics_report(self) -> str:
+        """JSON snapshot of the per-tool metrics and runtime counters (the server_metrics tool)"""
+        if self.metrics is None:
+            raise ValueError("Metrics are disabled in runtime.json")
+        return jsonlib.dumps({**self.metrics.snapshot(), "runtime": self.stats()}, separators=(",", ":"))
+
+    def metrics_text(self) -> str:
+        """Per-tool metrics and runtime gauges in the Prometheus text format"""
+        if self.metrics is None:
+            raise ValueError("Metrics are disabled in runtime.json")
+        limiter = self.limiter.stats()
+        return self.metrics.prometheus({
+            "mcp_upstream_concurrency_limit": ("Current adaptive upstream concurrency limit", limiter["limit"]),
+            "mcp_upstream_in_flight": ("Upstream requests in flight", limiter["in_flight"]),
+            "mcp_upstream_queue_depth": ("Calls waiting for an upstream slot", limiter["queue_depth"]),
+            "mcp_upstream_circuit_open": ("1 while the upstream circuit breaker is not closed",
+                                          int(self.breaker.state != CLOSED)),
+            "mcp_upstream_retries": ("Upstream retries since startup", self.retries),
+            "mcp_upstream_rate_limited": ("Calls rejected by upstream rate limits since startup",
+                                          self.rate_limits.counters["rejected"]),
+        })
+
+    async def _dump_metrics(self, path: Path):
+        """Write a metrics snapshot to path every metrics.interval seconds, and once more at shutdown"""
+        try:
+            while True:
+                await asyncio.sleep(self.config["metrics"]["interval"])
+                self._write_metrics(path)
+        finally:
+            self._write_metrics(path)
+
+    def _write_metrics(self, path: Path):
+        try:
+            write_atomic(path, self.metrics_text() if path.suffix == ".prom" else self.metrics_report() + "\n")
+        except OSError as e:
+            logger.warning("Could not write metrics to %s: %s", path, e)
+
+    @property
+    def metrics_tool_enabled(self) -> bool:
+        """Whether the server_metrics tool is offered"""
+        return self.metrics is not None and bool(self.config["metrics"]["tool"])
+
+    @property
+    def batch_enabled(self) -> bool:
+        """Whether the batch_call meta-tool is offered"""
+        return bool(self.config["batch"]["enabled"])
+
+    @property
+    def validation_enabled(self) -> bool:
+        """Whether arguments are validated here, so the MCP SDK's own inputSchema check can be skipped"""
+        return bool(self.config["validation"]["enabled"])
+
+    def compile_validators(self, schemas: Dict[str, Dict[str, Any]]):
+        """Compile the inputSchema of every tool once, at startup"""
+        for tool, schema in schemas.items():
+            validation = tool_config(self.config, tool, "validation")
+            if validation["enabled"]:
+                self._validators[tool] = compile_validator(schema, validation["coerce"])
+            else:
+                self._validators.pop(tool, None)
+
+    def set_tool_tags(self, tags: Dict[str, List[str]]):
+        """Endpoint tags of the tools, which pick their scheduler lane (scheduler.lane_by_tag)"""
+        self._tags = dict(tags)
+        self._lanes = {}
+
+    def lane(self, tool: str) -> str:
+        """The scheduler lane tool's upstream requests wait in"""
+        lane = self._lanes.get(tool)
+        if lane is None:
+            lane = self._lanes[tool] = lane_for(tool_config(self.config, tool, "scheduler"), self._tags.get(tool, []))
+        return lane
+
+    def validate(self, tool: str, arguments: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """tool's arguments checked against its inputSchema and coerced; raises InvalidArguments"""
+        validator = self._validators.get(tool)
+        if validator is None:
+            return {} if arguments is None else arguments
+        return validator(arguments)
+
+    async def batch(self, items: List[Dict[str, Any]], call: Callable[[str, Dict[str, Any]], Awaitable[Any]],
+                    max_concurrency: int = 0) -> str:
+        """Run batch_call items concurrently; max_concurrency may only lower the configured cap"""
+        batch = self.config["batch"]
+        if not batch["enabled"]:
+            raise ValueError("batch_call is disabled in runtime.json")
+        cap = batch["max_concurrency"]
+        if max_concurrency and 0 < max_concurrency < cap:
+            cap = max_concurrency
+        # Paginated items report progress on one count, so notifications keep increasing
+        share_progress()
+        return await run_batch(items, call, cap, batch["max_items"])
+
+    def projection(self, fields: Optional[str]) -> Optional[Projection]:
+        """Compiled (and cached) projection for a tool's fields argument; raises InvalidArguments"""
+        if fields is None or fields == "":
+            return None
+        if not isinstance(fields, str):
+            raise InvalidArguments(f"fields: expected string, got {type(fields).__name__}")
+        return compile_projection(fields)
+
+    def render(self, tool: str, response: httpx.Response, request: Optional[str] = None,
+               fields: Optional[Projection] = None) -> str:
+        """Serialize a tool result according to the tool's output settings, keeping only fields if given"""
+        output = tool_config(self.config, tool, "output")
+        if self.metrics is None and self.tracer is None:
+            return render_result(response, request, output.get("indent"), output.get("passthrough", True), fields)
+
+        started = time.perf_counter_ns()
+        result = render_result(response, request, output.get("indent"), output.get("passthrough", True), fields)
+        finished = time.perf_counter_ns()
+        if self.tracer is not None:
+            self.tracer.record("render", started, finished, bytes=len(result))
+        if self.metrics is not None:
+            metrics = self.metrics.tool(tool)
+            metrics.serialization.record((finished - started) / 1e9)
+            call = call_started.get()
+            if call is not None and call[0] == tool:
+                metrics.total.record(finished / 1e9 - call[1])
+        return result
+
+    async def request(self, tool: str, method: str, url: str, params: Optional[Dict[str, Any]] = None,
+                      json: Any = None, headers: Optional[Dict[str, str]] = None,
+                      route: Optional[str] = None) -> httpx.Response:
+        """Send one upstream request for tool; route is the endpoint's path template"""
+        method = method.upper()
+        if self._warming:
+            # The upstream may still be starting; the warm-up ends within its timeout either way
+            await self.warmup.wait()
+        if tool not in self._rate_limited:
+            rate_limit = tool_config(self.config, tool, "rate_limit")
+            buckets = self.rate_limits.buckets_for(tool, method, route or httpx.URL(url).path, rate_limit)
+            self._rate_limited[tool] = (buckets, rate_limit["mode"] == "reject", rate_limit["max_wait"])
+        parent = current_span.get() if self.tracer is not None else None
+        if parent is None:
+            return await self._measured_request(tool, method, url, params, json, headers, route)
+
+        if parent.attributes.get("tool") == tool:
+            # The tool span started when the tool was called; until now it was preparing arguments
+            self.tracer.record("arguments", parent.start, time.perf_counter_ns(), parent)
+        with self.tracer.span("request", method=method, route=route or httpx.URL(url).path) as span:
+            response = await self._measured_request(tool, method, url, params, json, headers, route)
+            span.set(status_code=response.status_code, bytes=len(response.content))
+            return response
+
+    async def _measured_request(self, tool: str, method: str, url: str, params: Optional[Dict[str, Any]],
+                                json: Any, headers: Optional[Dict[str, str]], route: Optional[str]) -> httpx.Response:
+        """request() with the per-tool metrics recorded"""
+        if self.metrics is None:
+            return await self._paged_request(tool, method, url, params, json, headers, route)
+
+        metrics = self.metrics.tool(tool)
+        started = time.perf_counter()
+        call_started.set((tool, started))
+        metrics.in_flight += 1
+        try:
+            response = await self._paged_request(tool, method, url, params, json, headers, route)
+        except Exception:
+            metrics.record_upstream(time.perf_counter() - started, None, 0)
+            raise
+        finally:
+            metrics.in_flight -= 1
+        metrics.record_upstream(time.perf_counter() - started, response.status_code, len(response.content))
+        return response
+
+    async def _paged_request(self, tool: str, method: str, url: str, params: Optional[Dict[str, Any]],
+                             json: Any, headers: Optional[Dict[str, str]], route: Optional[str]) -> httpx.Response:
+        """Follow further pages of a GET within the budget when pagination is enabled for tool"""
+        pagination = tool_config(self.config, tool, "pagination")
+        if not pagination["enabled"] or method != "GET":
+            return await self._coalesced_request(tool, method, url, params, json, headers, route)
+
+        async def fetch(page_url: str, page_params: Optional[Dict[str, Any]]) -> httpx.Response:
+            return await self._coalesced_request(tool, method, page_url, page_params, json, headers, route)
+
+        return await collect_pages(tool, fetch, url, params, pagination)
+
+    async def _coalesced_request(self, tool: str, method: str, url: str, params: Optional[Dict[str, Any]],
+                                 json: Any, headers: Optional[Dict[str, str]], route: Optional[str]) -> httpx.Response:
+        """Share one upstream request between identical concurrent calls"""
+        coalesce = tool_config(self.config, tool, "coalesce")
+        if coalesce["enabled"] and method in coalesce["methods"]:
+            key = cache_key(method, url, params, headers, json)
+            return await self.flights.do(key, lambda: self._request(tool, method, url, params, json, headers, route))
+        return await self._request(tool, method, url, params, json, headers, route)
+
+    async def _request(self, tool: str, method: str, url: str, params: Optional[Dict[str, Any]],
+                       json: Any, headers: Optional[Dict[str, str]], route: Optional[str]) -> httpx.Response:
+        """Serve a request from the cache or the upstream, invalidating on mutations"""
+        cache = tool_config(self.config, tool, "cache")
+        if cache["enabled"] and method in cache["methods"] and json is None:
+            return await self._cached_request(tool, method, url, params, headers, cache["ttl"])
+
+        response = await self._send(tool, method, url, params, json, headers)
+
+        # A successful mutation makes every cached read of the same collection suspect
+        if method in MUTATING_METHODS and response.is_success and len(self.cache):
+            self.cache.invalidate(collection_prefix(httpx.URL(url).path, route))
+        return response
+
+    async def _cached_request(self, tool: str, method: str, url: str, params: Optional[Dict[str, Any]],
+                              headers: Optional[Dict[str, str]], ttl: float) -> httpx.Response:
+        """Serve from the response cache, revalidating stale entries by ETag"""
+        key = cache_key(method, url, params, headers)
+        entry = self.cache.lookup(key)
+        if entry is not None and entry.fresh:
+            self.cache.record(tool, hit=True)
+            annotate(cache="hit")
+            return entry.to_response(httpx.Request(method, url, params=params or None, headers=headers))
+
+        send_headers = dict(headers or {})
+        if entry is not None and entry.etag:
+            send_headers["If-None-Match"] = entry.etag
+        response = await self._send(tool, method, url, params, None, send_headers or None)
+
+        if entry is not None and response.status_code == 304:
+            self.cache.refresh(tool, entry, response, ttl)
+            annotate(cache="revalidated")
+            return entry.to_response(response.request)
+
+        self.cache.record(tool, hit=False)
+        annotate(cache="miss")
+        self.cache.store(key, httpx.URL(url).path, response, ttl)
+        return response
+
+    async def _send(self, tool: str, method: str, url: str, params: Optional[Dict[str, Any]],
+                    json: Any, headers: Optional[Dict[str, str]]) -> httpx.Response:
+        """Send one request over the shared client, retrying idempotent methods with jittered backoff"""
+        kwargs: Dict[str, Any] = {"params": params or None, "json": json, "headers": headers}
+
+        overrides = self.config.get("tools", {}).get(tool, {}).get("http", {})
+        if "timeout" in overrides:
+            timeout = tool_config(self.config, tool, "http")["timeout"]
+            kwargs["timeout"] = httpx.Timeout(**timeout)
+
+        retry = tool_config(self.config, tool, "retry")
+        attempts = max(1, retry["attempts"]) if retry["enabled"] and method in retry["methods"] else 1
+
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                response = await self._attempt(tool, method, url, kwargs)
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+                delay = backoff_delay(attempt, retry["backoff"], retry["max_backoff"])
+            else:
+                if last_attempt or response.status_code not in retry["status_codes"]:
+                    return response
+                delay = retry_after(response, retry["max_backoff"])
+                if delay is None:
+                    delay = backoff_delay(attempt, retry["backoff"], retry["max_backoff"])
+                await response.aclose()
+
+            self.retries += 1
+            logger.debug("Retrying %s %s in %.2fs (attempt %d of %d)", method, url, delay, attempt + 2, attempts)
+            slept = time.perf_counter_ns()
+            await asyncio.sleep(delay)
+            if self.tracer is not None:
+                self.tracer.record("backoff", slept, time.perf_counter_ns(), retry=attempt + 1)
+
+    async def _attempt(self, tool: str, method: str, url: str, kwargs: Dict[str, Any]) -> httpx.Response:
+        """One upstream attempt through the rate limits, the circuit breaker and the concurrency limiter"""
+        buckets, reject, max_wait = self._rate_limited.get(tool) or ((), False, 0.0)
+        if buckets:
+            waited = time.perf_counter_ns()
+            await self.rate_limits.acquire(buckets, reject, max_wait)
+            if self.tracer is not None:
+                self.tracer.record("rate_limit", waited, time.perf_counter_ns())
+
+        breaker = self.config["breaker"]["enabled"]
+        if breaker:
+            self.breaker.before_call()
+
+        limiter = tool_config(self.config, tool, "limiter")
+        started = None
+        healthy = None
+        session = None
+        try:
+            if limiter["enabled"]:
+                queued = time.perf_counter_ns()
+                scheduler = tool_config(self.config, tool, "scheduler")
+                if scheduler["enabled"]:
+                    session = current_session()
+                    started = await self.limiter.acquire(limiter["queue_timeout"], session, self.lane(tool),
+                                                         scheduler["cost"])
+                else:
+                    started = await self.limiter.acquire(limiter["queue_timeout"])
+                if self.tracer is not None:
+                    self.tracer.record("queue", queued, time.perf_counter_ns())
+            if self.tracer is not None and current_span.get() is not None:
+                response = await self._traced_send(method, url, kwargs)
+            else:
+                response = await self.client.request(method, url, **kwargs)
+            healthy = response.status_code not in OVERLOAD_STATUS_CODES
+            if breaker:
+                self.breaker.record(response.status_code not in UNAVAILABLE_STATUS_CODES)
+            return response
+        except httpx.TransportError:
+            healthy = False
+            if breaker:
+                self.breaker.record(False)
+            raise
+        finally:
+            if breaker and healthy is None:
+                self.breaker.release()
+            if started is not None:
+                self.limiter.release(started, healthy, session)
+
+    async def _traced_send(self, method: str, url: str, kwargs: Dict[str, Any]) -> httpx.Response:
+        """Send as an attempt span with HTTP phase spans, passing the span upstream as traceparent"""
+        with self.tracer.span("attempt") as span:
+            phases = HttpPhases(self.tracer, span)
+            kwargs = {**kwargs, "extensions": {"trace": phases}}
+            if self.tracer.propagate:
+                kwargs["headers"] = {**(kwargs.get("headers") or {}), "traceparent": span.traceparent}
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            finally:
+                phases.flush()
+            span.set(status_code=response.status_code)
+            return response
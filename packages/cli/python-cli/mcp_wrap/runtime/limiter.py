@@ -0,0 +1,156 @@
+"""
+Adaptive upstream concurrency limiter for generated MCP servers
+
+Admission control in front of the FastAPI app. The number of concurrent
+upstream requests is capped by a limit that adapts AIMD-style: it grows by
+about one per window of healthy responses while the limit is in use, and is
+cut multiplicatively when latency rises well above the observed baseline or
+the upstream signals overload. Calls over the limit wait in a bounded queue
+with a timeout; once the queue is full they are rejected immediately. The
+queue is a FairQueue: the next free slot goes to the highest priority lane,
+and within it to the sessions in turn, skipping sessions at their cap.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Hashable, List, Optional
+
+from .scheduler import FairQueue, Ticket
+
+DEFAULT_LANE = "default"
+
+class UpstreamOverloaded(RuntimeError):
+    """Raised when a call is rejected or times out waiting for an upstream slot"""
+
+class AdaptiveLimiter:
+    def __init__(self, initial_limit: int = 16, min_limit: int = 1, max_limit: int = 256,
+                 max_queue: int = 1024, latency_tolerance: float = 1.5, backoff: float = 0.9,
+                 lanes: Optional[List[str]] = None, quantum: float = 1.0, session_limit: Optional[int] = None):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+
+        self.in_flight = 0
+        self.baseline: Optional[float] = None
+        self._waiters = FairQueue(lanes or [DEFAULT_LANE], max(quantum, 1e-3))
+        # Upstream requests in flight per session, and the cap on them
+        self.session_limit = session_limit
+        self._sessions: Dict[Optional[Hashable], int] = {}
+        self._last_decrease = 0.0
+        self.counters = {"admitted": 0, "queued": 0, "rejected": 0, "timed_out": 0, "decreases": 0}
+
+    @classmethod
+    def from_config(cls, limiter: Dict[str, Any], scheduler: Optional[Dict[str, Any]] = None) -> "AdaptiveLimiter":
+        scheduler = scheduler if scheduler and scheduler["enabled"] else None
+        return cls(
+            initial_limit=limiter["initial_limit"],
+            min_limit=limiter["min_limit"],
+            max_limit=limiter["max_limit"],
+            max_queue=limiter["max_queue"],
+            latency_tolerance=limiter["latency_tolerance"],
+            backoff=limiter["backoff"],
+            lanes=scheduler["lanes"] if scheduler else None,
+            quantum=scheduler["quantum"] if scheduler else 1.0,
+            session_limit=scheduler["max_in_flight_per_session"] if scheduler else None,
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def _eligible(self, session: Optional[Hashable]) -> bool:
+        return self.session_limit is None or self._sessions.get(session, 0) < self.session_limit
+
+    def _admit(self, session: Optional[Hashable]):
+        self.in_flight += 1
+        self._sessions[session] = self._sessions.get(session, 0) + 1
+
+    async def acquire(self, timeout: Optional[float] = None, session: Optional[Hashable] = None,
+                      lane: str = DEFAULT_LANE, cost: float = 1.0) -> float:
+        """Wait for an upstream slot for session; returns the admission time to pass to release()"""
+        # Waiting calls that could use a free slot have already been given one,
+        # so a free slot means every queued call belongs to a capped session
+        if self.in_flight < int(self.limit) and self._eligible(session):
+            self._admit(session)
+            self.counters["admitted"] += 1
+            return time.monotonic()
+
+        if len(self._waiters) >= self.max_queue:
+            self.counters["rejected"] += 1
+            raise UpstreamOverloaded(
+                f"Upstream overloaded: {self.in_flight} calls in flight and {len(self._waiters)} queued"
+            )
+
+        ticket = Ticket(asyncio.get_running_loop().create_future(), session, lane, cost)
+        self._waiters.push(ticket)
+        self.counters["queued"] += 1
+        try:
+            await asyncio.wait_for(ticket.future, timeout)
+        except asyncio.TimeoutError:
+            self._waiters.remove(ticket)
+            self.counters["timed_out"] += 1
+            raise UpstreamOverloaded(f"Timed out after {timeout}s waiting for an upstream slot") from None
+        except asyncio.CancelledError:
+            if ticket.future.done() and not ticket.future.cancelled():
+                # The slot was granted as the caller went away
+                self._release_slot(session)
+            else:
+                self._waiters.remove(ticket)
+            raise
+
+        self.counters["admitted"] += 1
+        return time.monotonic()
+
+    def release(self, started: float, healthy: Optional[bool], session: Optional[Hashable] = None):
+        """Free session's slot; healthy=None skips the limit update (e.g. for cancelled calls)"""
+        if healthy is not None:
+            self._update(started, time.monotonic() - started, healthy)
+        self._release_slot(session)
+
+    def _update(self, started: float, latency: float, healthy: bool):
+        if healthy:
+            # The baseline follows new minimums at once and drifts up slowly
+            if self.baseline is None or latency < self.baseline:
+                self.baseline = latency
+            else:
+                self.baseline += (latency - self.baseline) * 0.002
+
+        slow = self.baseline is not None and latency > self.baseline * self.latency_tolerance
+        if not healthy or slow:
+            # Decrease at most once per batch: only calls admitted after the last cut count
+            if started > self._last_decrease:
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                self._last_decrease = time.monotonic()
+                self.counters["decreases"] += 1
+        elif self.in_flight >= self.limit / 2:
+            # Only grow a limit that is actually being used
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+    def _release_slot(self, session: Optional[Hashable]):
+        self.in_flight -= 1
+        remaining = self._sessions.get(session, 1) - 1
+        if remaining > 0:
+            self._sessions[session] = remaining
+        else:
+            self._sessions.pop(session, None)
+        while self._waiters and self.in_flight < int(self.limit):
+            ticket = self._waiters.pop(self._eligible)
+            if ticket is None:
+                break
+            if not ticket.future.done():
+                self._admit(ticket.session)
+                ticket.future.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queue_depth": len(self._waiters),
+            "sessions": len(self._sessions),
+            "lanes": self._waiters.stats(),
+            "baseline_ms": round(self.baseline * 1000, 2) if self.baseline is not None else None,
+        }
@@ -0,0 +1,168 @@
+"""
+Per-tool metrics for generated MCP servers
+
+Every tool call made through ToolRuntime records a call and error count, an
+in-flight gauge, the response size and three latencies: upstream (from
+request() until the response is back, including cache lookups, queueing and
+retries), serialization (render()) and total (request() start to rendered
+result). Latencies and sizes go into HDR-style histograms whose buckets grow
+geometrically, so percentiles keep a bounded relative error from
+microseconds to minutes in a small, fixed amount of memory.
+
+Snapshots are served as JSON by the server_metrics tool and the periodic
+file dump, and in the Prometheus text format at /metrics over HTTP.
+"""
+
+import math
+import os
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+METRICS_TOOL_NAME = "server_metrics"
+
+METRICS_DESCRIPTION = (
+    "Report this server's per-tool call and error counts, in-flight calls, latency percentiles "
+    "(upstream, serialization and total) and response sizes."
+)
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+# (tool, perf_counter at request start) of the tool call running in this task
+call_started: ContextVar[Optional[Tuple[str, float]]] = ContextVar("mcp_runtime_call_started", default=None)
+
+class Histogram:
+    """Geometric buckets: a reported percentile is within `precision` of the recorded value"""
+
+    def __init__(self, precision: float = 0.01, lowest: float = 1e-6):
+        self.lowest = lowest
+        self._log_growth = math.log1p(2 * precision)
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, value: float):
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+        index = int(math.log(value / self.lowest) / self._log_growth) if value > self.lowest else 0
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Geometric midpoint of the bucket, never above the largest value seen
+                return min(self.lowest * math.exp((index + 0.5) * self._log_growth), self.max)
+        return self.max
+
+    def snapshot(self, scale: float = 1.0, digits: int = 3) -> Dict[str, Any]:
+        summary = {"count": self.count, "mean": round(self.sum / self.count * scale, digits) if self.count else 0.0}
+        for q in QUANTILES:
+            summary[f"p{int(q * 100)}"] = round(self.percentile(q) * scale, digits)
+        summary["max"] = round(self.max * scale, digits)
+        return summary
+
+class ToolMetrics:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.upstream = Histogram()
+        self.serialization = Histogram()
+        self.total = Histogram()
+        self.response_bytes = Histogram(lowest=1.0)
+
+    def record_upstream(self, elapsed: float, status_code: Optional[int], size: int):
+        """One finished request(); status_code None means it raised"""
+        self.calls += 1
+        if status_code is None or status_code >= 400:
+            self.errors += 1
+        self.upstream.record(elapsed)
+        if status_code is not None:
+            self.response_bytes.record(size)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "upstream_ms": self.upstream.snapshot(1000),
+            "serialization_ms": self.serialization.snapshot(1000),
+            "total_ms": self.total.snapshot(1000),
+            "response_bytes": self.response_bytes.snapshot(digits=0),
+        }
+
+class Metrics:
+    def __init__(self):
+        self.tools: Dict[str, ToolMetrics] = {}
+        self.started = time.time()
+
+    def tool(self, name: str) -> ToolMetrics:
+        metrics = self.tools.get(name)
+        if metrics is None:
+            metrics = self.tools[name] = ToolMetrics()
+        return metrics
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "tools": {name: metrics.snapshot() for name, metrics in sorted(self.tools.items())},
+        }
+
+    def prometheus(self, gauges: Optional[Dict[str, Tuple[str, float]]] = None) -> str:
+        """Prometheus text exposition; gauges adds unlabelled runtime gauges as name -> (help, value)"""
+        lines: List[str] = []
+        tools = sorted(self.tools.items())
+
+        def family(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        for attribute, name, kind, help_text in (
+            ("calls", "mcp_tool_calls_total", "counter", "Tool calls sent through the runtime"),
+            ("errors", "mcp_tool_errors_total", "counter", "Tool calls that raised or got an HTTP error status"),
+            ("in_flight", "mcp_tool_in_flight", "gauge", "Tool calls waiting on the upstream"),
+        ):
+            family(name, kind, help_text)
+            for tool, metrics in tools:
+                lines.append(f'{name}{{tool="{_label(tool)}"}} {getattr(metrics, attribute)}')
+
+        for attribute, name, help_text in (
+            ("upstream", "mcp_tool_upstream_seconds", "Upstream time per call, including cache, queueing and retries"),
+            ("serialization", "mcp_tool_serialization_seconds", "Time spent rendering the tool result"),
+            ("total", "mcp_tool_duration_seconds", "Request start to rendered tool result"),
+            ("response_bytes", "mcp_tool_response_bytes", "Upstream response body size"),
+        ):
+            family(name, "summary", help_text)
+            for tool, metrics in tools:
+                histogram: Histogram = getattr(metrics, attribute)
+                label = _label(tool)
+                for q in QUANTILES:
+                    lines.append(f'{name}{{tool="{label}",quantile="{q}"}} {histogram.percentile(q):.6g}')
+                lines.append(f'{name}_sum{{tool="{label}"}} {histogram.sum:.6g}')
+                lines.append(f'{name}_count{{tool="{label}"}} {histogram.count}')
+
+        for name, (help_text, value) in (gauges or {}).items():
+            family(name, "gauge", help_text)
+            lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+def write_atomic(path: Path, content: str):
+    """Replace path with content without readers ever seeing a partial file"""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
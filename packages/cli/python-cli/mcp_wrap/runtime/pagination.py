@@ -0,0 +1,284 @@
+"""
+Pagination following for generated MCP servers
+
+With pagination enabled for a tool, one tool call returns the items of as
+many pages as fit the budget instead of a single page. The next page is
+found from the request's offset/limit or page parameters, a cursor field in
+the body, or an RFC 8288 Link rel="next" header. Offset and page numbers are
+known in advance, so up to `prefetch` pages are fetched concurrently; cursors
+and links are followed one page at a time.
+
+Only the collected items are kept: each page body is decoded, its items are
+appended, and the body is dropped, with no more than `prefetch` pages in
+flight. Collection stops at max_items, max_bytes (of page bodies) or
+max_pages. The combined result is the first page with its item list
+replaced by all the items and a "_pagination" summary added. While pages
+arrive, clients that sent a progressToken get MCP progress notifications.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+from .tracing import annotate
+
+logger = logging.getLogger("mcp_runtime")
+
+# fetch(url, params) -> response of one page
+Fetch = Callable[[str, Optional[Dict[str, Any]]], Awaitable[httpx.Response]]
+
+# Progress reported so far for the MCP request running in this task; shared by
+# the items of a batch_call so their notifications keep increasing
+_progress: ContextVar[Optional[List[float]]] = ContextVar("mcp_runtime_progress", default=None)
+
+def share_progress():
+    """Make concurrent tasks started from here add to one progress count"""
+    _progress.set([0.0])
+
+async def report_progress(advance: float, message: str):
+    """Send an MCP progress notification for the current request if the client asked for them"""
+    try:
+        from mcp.server.lowlevel.server import request_ctx
+        context = request_ctx.get()
+    except (ImportError, LookupError):
+        return
+    token = getattr(context.meta, "progressToken", None) if context.meta is not None else None
+    if token is None:
+        return
+    counter = _progress.get()
+    if counter is None:
+        counter = [0.0]
+        _progress.set(counter)
+    counter[0] += advance
+    notification = {"progress_token": token, "progress": counter[0], "related_request_id": str(context.request_id)}
+    try:
+        try:
+            await context.session.send_progress_notification(**notification, message=message)
+        except TypeError:
+            # mcp < 1.10 has no progress messages
+            await context.session.send_progress_notification(**notification)
+    except Exception as e:
+        logger.debug("Could not send progress notification: %s", e)
+
+def _field(body: Any, path: str) -> Any:
+    """Value at a dotted path in a JSON body, or None"""
+    for key in path.split("."):
+        if not isinstance(body, dict):
+            return None
+        body = body.get(key)
+    return body
+
+def find_items(body: Any, items_field: Optional[str]) -> Tuple[Optional[str], Optional[List[Any]]]:
+    """(field, items) of a page: items_field, the body itself if it is a list, else its first list field"""
+    if isinstance(body, list):
+        return None, body
+    if not isinstance(body, dict):
+        return None, None
+    if items_field:
+        items = body.get(items_field)
+        return (items_field, items) if isinstance(items, list) else (None, None)
+    for key, value in body.items():
+        if isinstance(value, list):
+            return key, value
+    return None, None
+
+def _next_link(response: httpx.Response) -> Optional[str]:
+    url = response.links.get("next", {}).get("url")
+    return str(response.url.join(url)) if url else None
+
+def _integer(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def _decode(response: httpx.Response) -> Any:
+    try:
+        return response.json()
+    except ValueError:
+        return None
+
+class PageCollector:
+    """Items of the pages collected so far, within the item and byte budget"""
+
+    def __init__(self, tool: str, items_field: Optional[str], settings: Dict[str, Any]):
+        self.tool = tool
+        self.items_field = items_field
+        self.max_items = settings["max_items"]
+        self.max_bytes = settings["max_bytes"]
+        self.items: List[Any] = []
+        self.pages = 0
+        self.bytes = 0
+        self.stopped: Optional[str] = None
+        # Decoded body of the latest page, for finding the next cursor
+        self.last_body: Any = None
+
+    async def add(self, response: httpx.Response, body: Any = None) -> Optional[List[Any]]:
+        """Append a page's items; returns them, or None when collection has to stop"""
+        if response.status_code >= 400:
+            self.stopped = f"page {self.pages + 1} failed with HTTP {response.status_code}"
+            return None
+        if self.pages and self.bytes + len(response.content) > self.max_bytes:
+            self.stopped = "max_bytes"
+            return None
+        self.last_body = body if body is not None else _decode(response)
+        _, items = find_items(self.last_body, self.items_field)
+        if items is None:
+            self.stopped = f"page {self.pages + 1} has no item list"
+            return None
+        self.pages += 1
+        self.bytes += len(response.content)
+        room = self.max_items - len(self.items)
+        if len(items) > room:
+            items = items[:room]
+            self.stopped = "max_items"
+        self.items.extend(items)
+        if items:
+            # Progress has to increase with every notification
+            await report_progress(len(items), f"{self.tool}: {len(self.items)} items from {self.pages} pages")
+        return items if self.stopped is None else None
+
+    def failed(self, error: Exception):
+        """A later page raised: keep what was collected and say why it stopped"""
+        self.stopped = f"page {self.pages + 1} failed: {error}"
+
+    def budget_spent(self) -> bool:
+        if len(self.items) >= self.max_items:
+            self.stopped = self.stopped or "max_items"
+        elif self.bytes >= self.max_bytes:
+            self.stopped = self.stopped or "max_bytes"
+        return self.stopped is not None
+
+async def _follow_numbers(fetch: Fetch, url: str, params: Dict[str, Any], collector: PageCollector,
+                          settings: Dict[str, Any], param: str, first: int, step: int, page_size: int) -> bool:
+    """Fetch pages by offset or page number, up to prefetch at a time; True when the last page was reached"""
+    window: Deque[asyncio.Task] = deque()
+    next_value = first
+    scheduled = 1
+    try:
+        while not collector.budget_spent():
+            while len(window) < max(1, settings["prefetch"]) and scheduled < settings["max_pages"]:
+                window.append(asyncio.ensure_future(fetch(url, {**params, param: next_value})))
+                next_value += step
+                scheduled += 1
+            if not window:
+                collector.stopped = "max_pages"
+                return False
+            try:
+                response = await window.popleft()
+            except Exception as e:
+                collector.failed(e)
+                return False
+            items = await collector.add(response)
+            if items is None:
+                return False
+            if len(items) < page_size:
+                return True
+        return False
+    finally:
+        for task in window:
+            task.cancel()
+        if window:
+            await asyncio.gather(*window, return_exceptions=True)
+
+async def _follow_chain(fetch: Fetch, collector: PageCollector, settings: Dict[str, Any],
+                        next_page: Callable[[httpx.Response, Any], Optional[Tuple[str, Optional[Dict[str, Any]]]]],
+                        response: httpx.Response, body: Any) -> bool:
+    """Follow cursors or Link headers one page at a time; True when there was no next page"""
+    while True:
+        following = next_page(response, body)
+        if following is None:
+            return True
+        if collector.budget_spent():
+            return False
+        if collector.pages >= settings["max_pages"]:
+            collector.stopped = "max_pages"
+            return False
+        try:
+            response = await fetch(*following)
+        except Exception as e:
+            collector.failed(e)
+            return False
+        if await collector.add(response) is None:
+            return False
+        body = collector.last_body
+
+def _combined(first: httpx.Response, body: Any, field: Optional[str], collector: PageCollector,
+              complete: bool) -> httpx.Response:
+    summary = {"pages": collector.pages, "items": len(collector.items), "complete": complete}
+    if not complete and collector.stopped:
+        summary["stopped"] = collector.stopped
+    annotate(pages=collector.pages, items=len(collector.items), complete=complete)
+    if isinstance(body, dict):
+        body = {**body, field: collector.items, "_pagination": summary}
+    else:
+        body = collector.items
+    return httpx.Response(
+        first.status_code,
+        headers={"content-type": "application/json"},
+        content=json.dumps(body, separators=(",", ":"), ensure_ascii=False).encode(),
+        request=first.request,
+    )
+
+async def collect_pages(tool: str, fetch: Fetch, url: str, params: Optional[Dict[str, Any]],
+                        settings: Dict[str, Any]) -> httpx.Response:
+    """Fetch the first page and the pages after it within the budget, combined into one response"""
+    params = dict(params or {})
+    mode = settings["mode"]
+    limit_param, offset_param, page_param = settings["limit_param"], settings["offset_param"], settings["page_param"]
+    if mode == "offset":
+        params.setdefault(offset_param, 0)
+    if mode in ("offset", "page") and params.get(limit_param) is None:
+        params[limit_param] = settings["page_size"]
+    if mode == "page":
+        params.setdefault(page_param, 1)
+
+    first = await fetch(url, params)
+    if first.status_code >= 400:
+        return first
+    body = _decode(first)
+    field, items = find_items(body, settings["items_field"])
+    if items is None:
+        return first
+
+    collector = PageCollector(tool, field, settings)
+    await collector.add(first, body)
+    if collector.budget_spent():
+        return _combined(first, body, field, collector, complete=False)
+
+    cursor_field, cursor_param = settings["cursor_field"], settings["cursor_param"]
+    page_size = _integer(params.get(limit_param))
+    offset = _integer(params.get(offset_param))
+    page = _integer(params.get(page_param))
+
+    def linked_page(response: httpx.Response, page: Any):
+        next_url = _next_link(response)
+        return (next_url, None) if next_url else None
+
+    def cursor_page(response: httpx.Response, page: Any):
+        cursor = _field(page, cursor_field)
+        return (url, {**params, cursor_param: cursor}) if cursor else None
+
+    if mode == "link" or (mode == "auto" and _next_link(first)):
+        complete = await _follow_chain(fetch, collector, settings, linked_page, first, body)
+    elif mode == "cursor" or (mode == "auto" and cursor_field and _field(body, cursor_field)):
+        complete = await _follow_chain(fetch, collector, settings, cursor_page, first, body)
+    elif mode in ("auto", "offset") and offset is not None and page_size:
+        complete = len(items) < page_size or await _follow_numbers(
+            fetch, url, params, collector, settings, offset_param, offset + page_size, page_size, page_size,
+        )
+    elif mode in ("auto", "page") and page is not None:
+        # Without a page size, only an empty page ends the list
+        page_size = page_size or len(items)
+        complete = len(items) < page_size or not items or await _follow_numbers(
+            fetch, url, params, collector, settings, page_param, page + 1, 1, page_size,
+        )
+    else:
+        # Nothing to follow: a single page
+        return first
+    return _combined(first, body, field, collector, complete)
@@ -0,0 +1,187 @@
+"""
+Field projection for generated MCP servers
+
+Tools accept an optional `fields` argument listing the parts of the response
+to keep, so wide objects are cut down before they are serialized and sent to
+the client. The syntax is a small subset of JSONPath: comma-separated paths
+of dotted keys, with `*` for every key of an object, `[*]` for every item of
+a list and `[n]` for one item (negative n counts from the end). A leading `$`
+or `$.` is allowed. A path that meets a list without a list selector applies
+to each item, so `users.name` and `users[*].name` are the same:
+
+    fields="users[*].id,users[*].name,total"
+    fields="items.sku,items.price.amount"
+
+The structure of the response is kept and selected values are returned
+whole; keys that do not exist are left out. Every distinct expression is
+compiled once into a tree of projection functions and cached.
+"""
+
+import functools
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .validate import InvalidArguments
+
+FIELDS_ARGUMENT = "fields"
+
+FIELDS_SCHEMA = {
+    "type": "string",
+    "description": (
+        "Optional comma-separated paths of the response fields to return, e.g. "
+        "\"items[*].id,items[*].name,total\" (`*` matches every key, [*] every list item); "
+        "omit for the full response"
+    ),
+}
+
+# Hint appended to tool descriptions where the inputSchema is not shown to clients
+FIELDS_HINT = " Optional args.fields keeps only the listed response fields, e.g. \"items[*].id,total\"."
+
+# Most distinct expressions kept compiled
+CACHE_SIZE = 256
+
+Projection = Callable[[Any], Any]
+
+_MISSING = object()
+
+_SEGMENT = re.compile(r"\.?([^.\[\]\s]+)|\[\s*(\*|-?\d+)\s*\]")
+
+Segment = Union[str, int]
+
+class _Node:
+    """One level of the selection tree"""
+    __slots__ = ("leaf", "fields", "star", "items", "indexes")
+
+    def __init__(self):
+        self.leaf = False
+        self.fields: Dict[str, "_Node"] = {}
+        self.star: Optional["_Node"] = None
+        self.items: Optional["_Node"] = None
+        self.indexes: Dict[int, "_Node"] = {}
+
+    def child(self, segment: Segment) -> "_Node":
+        if segment == "*":
+            self.star = self.star or _Node()
+            return self.star
+        if segment == "[*]":
+            self.items = self.items or _Node()
+            return self.items
+        if isinstance(segment, int):
+            return self.indexes.setdefault(segment, _Node())
+        return self.fields.setdefault(segment, _Node())
+
+def with_fields_argument(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """inputSchema with the optional fields argument, unless the endpoint has a parameter of that name"""
+    if not projectable(schema):
+        return schema
+    return {**schema, "properties": {**schema.get("properties", {}), FIELDS_ARGUMENT: FIELDS_SCHEMA}}
+
+def projectable(schema: Dict[str, Any]) -> bool:
+    """Whether the fields argument is free for projection in this inputSchema"""
+    return FIELDS_ARGUMENT not in (schema.get("properties") or {})
+
+def _parse_path(path: str) -> List[Segment]:
+    text = path.strip()
+    if text.startswith("$"):
+        text = text[1:]
+    segments: List[Segment] = []
+    position = 0
+    while position < len(text):
+        match = _SEGMENT.match(text, position)
+        if match is None:
+            raise InvalidArguments(f"fields: cannot parse {path.strip()!r} at {text[position:]!r}")
+        key, selector = match.groups()
+        if key is not None:
+            segments.append(key)
+        else:
+            segments.append("[*]" if selector == "*" else int(selector))
+        position = match.end()
+    return segments
+
+def _merge(target: _Node, source: _Node):
+    """Add source's selections to target (used to apply * to keys that are also named)"""
+    if source.leaf:
+        target.leaf = True
+    for key, node in source.fields.items():
+        _merge(target.child(key), node)
+    if source.star is not None:
+        _merge(target.child("*"), source.star)
+    if source.items is not None:
+        _merge(target.child("[*]"), source.items)
+    for index, node in source.indexes.items():
+        _merge(target.child(index), node)
+
+def _build(node: _Node) -> Projection:
+    if node.leaf:
+        return lambda value: value
+
+    if node.star is not None:
+        # A named key also gets everything * selects
+        for child in node.fields.values():
+            _merge(child, node.star)
+    if node.fields or node.star is not None:
+        # Keys apply to every item of a list, so "a[*].x,a.y" selects x and y of each item
+        implicit = _Node()
+        implicit.fields, implicit.star = node.fields, node.star
+        for child in ([node.items] if node.items is not None else []) + list(node.indexes.values()):
+            _merge(child, implicit)
+    fields: Tuple[Tuple[str, Projection], ...] = tuple((key, _build(child)) for key, child in node.fields.items())
+    field_map = dict(fields)
+    star = _build(node.star) if node.star is not None else None
+    items = _build(node.items) if node.items is not None else None
+    indexes = tuple((index, _build(child)) for index, child in node.indexes.items())
+
+    def project(value: Any) -> Any:
+        if isinstance(value, dict):
+            if star is not None:
+                selected = {}
+                for key, item in value.items():
+                    result = field_map.get(key, star)(item)
+                    if result is not _MISSING:
+                        selected[key] = result
+                return selected
+            if not fields:
+                return _MISSING
+            selected = {}
+            for key, select in fields:
+                item = value.get(key, _MISSING)
+                if item is not _MISSING:
+                    result = select(item)
+                    if result is not _MISSING:
+                        selected[key] = result
+            return selected
+        if isinstance(value, list):
+            if items is not None:
+                return [result for result in map(items, value) if result is not _MISSING]
+            if indexes:
+                length = len(value)
+                return [result for result in (select(value[index]) for index, select in indexes
+                                              if -length <= index < length) if result is not _MISSING]
+            # No list selector: the path applies to every item
+            return [result for result in map(project, value) if result is not _MISSING]
+        return _MISSING
+    return project
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def compile_projection(expression: str) -> Projection:
+    """Projection function for a fields expression; raises InvalidArguments for a malformed one"""
+    root = _Node()
+    paths = [path for path in expression.split(",") if path.strip()]
+    if not paths:
+        raise InvalidArguments("fields: expected at least one path")
+    for path in paths:
+        node = root
+        segments = _parse_path(path)
+        if not segments:
+            # "$" alone selects everything
+            root.leaf = True
+            continue
+        for segment in segments:
+            node = node.child(segment)
+        node.leaf = True
+    select = _build(root)
+
+    def project(data: Any) -> Any:
+        result = select(data)
+        return None if result is _MISSING else result
+    return project
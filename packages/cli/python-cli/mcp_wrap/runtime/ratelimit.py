@@ -0,0 +1,122 @@
+"""
+Token-bucket rate limits for generated MCP servers
+
+Some upstream endpoints have a fixed request budget. A TokenBucket refills
+at rate tokens per second up to burst, and every upstream request takes one
+token from each bucket that applies to it: the global bucket, its tool's
+bucket and the buckets of the route patterns it matches. When a bucket is
+empty the token is taken on credit and the request waits until it is due,
+so waiting requests go out in arrival order at exactly the configured rate
+without a queue. A request that would wait longer than max_wait (or at all,
+in "reject" mode) gives its tokens back and fails with RateLimited.
+"""
+
+import asyncio
+import time
+from fnmatch import fnmatchcase
+from typing import Any, Dict, List, Optional, Tuple
+
+class RateLimited(RuntimeError):
+    """Raised when a call would have to wait too long for a rate-limit token"""
+
+class TokenBucket:
+    __slots__ = ("name", "rate", "burst", "tokens", "updated")
+
+    def __init__(self, name: str, rate: float, burst: Optional[float] = None):
+        self.name = name
+        self.rate = float(rate)
+        self.burst = float(burst or max(self.rate, 1.0))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    @classmethod
+    def from_config(cls, name: str, limit: Optional[Dict[str, Any]]) -> Optional["TokenBucket"]:
+        """A bucket for a {"rate", "burst"} setting, None when it sets no rate"""
+        if not limit or not limit.get("rate"):
+            return None
+        return cls(name, limit["rate"], limit.get("burst"))
+
+    def reserve(self, now: float) -> float:
+        """Take a token, on credit if none is left; seconds until it is due"""
+        tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate) - 1.0
+        self.tokens = tokens
+        self.updated = now
+        return 0.0 if tokens >= 0.0 else -tokens / self.rate
+
+    def refund(self):
+        self.tokens = min(self.burst, self.tokens + 1.0)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"rate": self.rate, "burst": self.burst, "tokens": round(self.tokens, 2)}
+
+def _parse_pattern(pattern: str) -> Tuple[Optional[str], str]:
+    """("GET", "/search*") for "GET /search*", (None, "/reports/*") for "/reports/*" """
+    method, _, path = pattern.strip().partition(" ")
+    if not path:
+        return None, method
+    return method.upper(), path.strip()
+
+class RateLimiter:
+    """The global, per-tool and per-route-pattern buckets of one runtime"""
+
+    def __init__(self, rate_limit: Dict[str, Any]):
+        self.global_bucket = TokenBucket.from_config("global", rate_limit.get("global"))
+        self.path_buckets: List[Tuple[Optional[str], str, TokenBucket]] = []
+        for pattern, limit in (rate_limit.get("paths") or {}).items():
+            bucket = TokenBucket.from_config(pattern, limit)
+            if bucket is not None:
+                self.path_buckets.append((*_parse_pattern(pattern), bucket))
+        self.tool_buckets: Dict[str, TokenBucket] = {}
+        self.counters = {"delayed": 0, "rejected": 0}
+        self.waited = 0.0
+
+    def buckets_for(self, tool: str, method: str, route: str, rate_limit: Dict[str, Any]) -> Tuple[TokenBucket, ...]:
+        """Every bucket a request of tool (method, route template) takes a token from"""
+        buckets = []
+        if self.global_bucket is not None:
+            buckets.append(self.global_bucket)
+        bucket = self.tool_buckets.get(tool) or TokenBucket.from_config(tool, rate_limit)
+        if bucket is not None:
+            buckets.append(self.tool_buckets.setdefault(tool, bucket))
+        for pattern_method, pattern, bucket in self.path_buckets:
+            if (pattern_method is None or pattern_method == method) and fnmatchcase(route, pattern):
+                buckets.append(bucket)
+        return tuple(buckets)
+
+    async def acquire(self, buckets: Tuple[TokenBucket, ...], reject: bool, max_wait: float):
+        """Wait until a token of every bucket is due; raises RateLimited instead of waiting too long"""
+        now = time.monotonic()
+        wait = 0.0
+        for bucket in buckets:
+            due = bucket.reserve(now)
+            if due > wait:
+                wait = due
+                limiting = bucket
+        if wait <= 0.0:
+            return
+
+        if reject or wait > max_wait:
+            for bucket in buckets:
+                bucket.refund()
+            self.counters["rejected"] += 1
+            raise RateLimited(f"Rate limit of {limiting.name} ({limiting.rate:g}/s) exceeded; "
+                              f"next request possible in {wait:.2f}s")
+
+        self.counters["delayed"] += 1
+        self.waited += wait
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            for bucket in buckets:
+                bucket.refund()
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        buckets = {}
+        if self.global_bucket is not None:
+            buckets["global"] = self.global_bucket.stats()
+        for _, _, bucket in self.path_buckets:
+            buckets[bucket.name] = bucket.stats()
+        for tool, bucket in self.tool_buckets.items():
+            buckets[f"tool:{tool}"] = bucket.stats()
+        return {**self.counters, "waited_s": round(self.waited, 3), "buckets": buckets}
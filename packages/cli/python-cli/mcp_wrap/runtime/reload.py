@@ -0,0 +1,202 @@
+"""
+Hot reload of tool definitions for generated MCP servers
+
+The running MCP server answers tools/list and tools/call through the
+runtime's current ToolRegistry: the list and call handlers of one loaded
+version of server.py. The Reloader polls server.py, mcp.json and mcp.yaml.
+When they change and have stopped changing, it imports server.py again
+under a new module name, in a thread, and swaps the new registry in with
+one assignment. New calls go to the new tools while calls already running
+finish on the old ones, and every known session is sent
+notifications/tools/list_changed.
+
+server.py gets the process's ToolRuntime from ToolRuntime.from_file, so the
+reloaded module shares the upstream pool, cache, limiter and metrics of the
+running one. A file that fails to import is logged and the old tools stay.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import mcp.types as types
+
+logger = logging.getLogger("mcp_runtime")
+
+# Tool definitions generated next to server.py
+TOOL_FILES = ("mcp.json", "mcp.yaml")
+
+class ToolRegistry:
+    """The tools/list and tools/call handlers of one loaded version of the server module"""
+
+    def __init__(self, server: Any, source: str, version: int = 1):
+        # FastMCP registers its handlers on the low-level Server it wraps
+        mcp_server = getattr(server, "_mcp_server", server)
+        self.list_tools = mcp_server.request_handlers[types.ListToolsRequest]
+        self.call_tool = mcp_server.request_handlers[types.CallToolRequest]
+        self.source = Path(source).resolve()
+        self.version = version
+        self.module_name: Optional[str] = None
+        self.in_flight = 0
+        self.retired = False
+        self._idle: Optional[asyncio.Event] = None
+
+    def release(self):
+        self.in_flight -= 1
+        if self.in_flight == 0 and self._idle is not None:
+            self._idle.set()
+
+    async def drain(self, timeout: Optional[float]) -> bool:
+        """Retire the registry and wait for its running calls; False if some are still running"""
+        self.retired = True
+        if self.in_flight == 0:
+            return True
+        self._idle = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+def route_tools(server: Any, runtime: Any):
+    """Answer server's tools/list and tools/call from runtime.registry, and advertise tools.listChanged"""
+    mcp_server = getattr(server, "_mcp_server", server)
+
+    def dispatcher(handler: str):
+        async def dispatch(request: Any) -> types.ServerResult:
+            try:
+                runtime.sessions.add(mcp_server.request_context.session)
+            except LookupError:
+                pass
+            registry = runtime.registry
+            registry.in_flight += 1
+            try:
+                return await getattr(registry, handler)(request)
+            finally:
+                registry.release()
+        return dispatch
+
+    mcp_server.request_handlers[types.ListToolsRequest] = dispatcher("list_tools")
+    mcp_server.request_handlers[types.CallToolRequest] = dispatcher("call_tool")
+
+    get_capabilities = mcp_server.get_capabilities
+
+    def capabilities(notification_options: Any, experimental_capabilities: Dict[str, Any]):
+        notification_options.tools_changed = True
+        return get_capabilities(notification_options, experimental_capabilities)
+
+    mcp_server.get_capabilities = capabilities
+
+def load_module(source: Path, module_name: str) -> Any:
+    """Import source as a new module named module_name"""
+    spec = importlib.util.spec_from_file_location(module_name, source)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load {source}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
+
+class Reloader:
+    """Swaps in a new ToolRegistry whenever the watched files change"""
+
+    def __init__(self, runtime: Any, files: List[Path], interval: float = 1.0, drain_timeout: Optional[float] = 30.0):
+        self.runtime = runtime
+        self.files = files
+        self.interval = interval
+        self.drain_timeout = drain_timeout
+        self.counters = {"reloads": 0, "failures": 0, "notified": 0}
+        self._tasks = set()
+
+    @classmethod
+    def from_config(cls, runtime: Any, reload: Dict[str, Any]) -> "Reloader":
+        source = runtime.registry.source
+        files = [source] + [source.with_name(name) for name in TOOL_FILES]
+        files += [runtime.base_dir / name for name in reload["watch"]]
+        return cls(runtime, files, reload["interval"], reload["drain_timeout"])
+
+    def fingerprint(self) -> Tuple[Optional[Tuple[int, int]], ...]:
+        """(mtime_ns, size) of every watched file, None for missing ones"""
+        prints = []
+        for path in self.files:
+            try:
+                stat = path.stat()
+                prints.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                prints.append(None)
+        return tuple(prints)
+
+    async def watch(self):
+        """Poll the watched files; reload once a change has been stable for one interval"""
+        loaded = self.fingerprint()
+        seen = loaded
+        while True:
+            await asyncio.sleep(self.interval)
+            current = self.fingerprint()
+            # A generator may still be writing: wait until two polls agree
+            if current != loaded and current == seen:
+                loaded = current
+                await self.reload()
+            seen = current
+
+    async def reload(self) -> bool:
+        """Load the server module again and swap its tools in; False if it failed to load"""
+        old = self.runtime.registry
+        version = old.version + 1
+        module_name = f"{old.source.stem}__v{version}"
+        try:
+            loop = asyncio.get_running_loop()
+            module = await loop.run_in_executor(None, load_module, old.source, module_name)
+            registry = module.REGISTRY
+        except Exception as e:
+            self.counters["failures"] += 1
+            logger.warning("Keeping the loaded tools: reloading %s failed: %s", old.source.name, e)
+            return False
+
+        registry.version = version
+        registry.module_name = module_name
+        self.runtime.registry = registry
+        self.counters["reloads"] += 1
+        logger.warning("Reloaded tools from %s (version %d)", old.source.name, version)
+
+        await self._notify()
+        task = asyncio.create_task(self._retire(old))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def _notify(self):
+        for session in list(self.runtime.sessions):
+            try:
+                await session.send_tool_list_changed()
+                self.counters["notified"] += 1
+            except Exception as e:
+                # The session has gone away
+                logger.debug("Could not send tools/list_changed: %s", e)
+                self.runtime.sessions.discard(session)
+
+    async def _retire(self, registry: ToolRegistry):
+        """Drop the old module once the calls still using it have finished"""
+        if not await registry.drain(self.drain_timeout):
+            logger.warning("%d call(s) still running on tools version %d after %ss",
+                           registry.in_flight, registry.version, self.drain_timeout)
+        if registry.module_name is not None:
+            sys.modules.pop(registry.module_name, None)
+
+    async def aclose(self):
+        for task in list(self._tasks):
+            task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "version": self.runtime.registry.version,
+            "draining": len(self._tasks),
+        }
@@ -0,0 +1,33 @@
+"""
+Retry policy for generated MCP servers
+
+Idempotent calls that fail with a transport error or a retryable status are
+tried again after an exponential backoff with full jitter, so a burst of
+failing callers does not retry in lockstep. Retry-After is honored when the
+upstream sends it.
+"""
+
+import random
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional
+
+import httpx
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff for the given (0-based) retry attempt"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def retry_after(response: httpx.Response, cap: float) -> Optional[float]:
+    """Seconds requested by a Retry-After header (capped), or None"""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(cap, max(0.0, delay))
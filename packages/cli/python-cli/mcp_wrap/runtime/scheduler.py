@@ -0,0 +1,125 @@
+"""
+Fair scheduling of upstream slots for generated MCP servers
+
+Over the HTTP transport many sessions share one server, and the limiter's
+upstream slots are the contended resource. FairQueue decides which waiting
+call gets the next free slot: calls wait in priority lanes (e.g. health
+checks and reads ahead of bulk exports), and within a lane sessions take
+turns by deficit round-robin, so a session flooding the server with bulk
+calls only delays another session by its share. A session can also be
+capped at a number of in-flight upstream requests.
+"""
+
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional
+
+from mcp.server.lowlevel.server import request_ctx
+
+def current_session() -> Optional[Hashable]:
+    """The MCP session of the request being handled, None outside one"""
+    try:
+        return request_ctx.get().session
+    except LookupError:
+        return None
+
+class Ticket:
+    """A call waiting for an upstream slot"""
+    __slots__ = ("future", "session", "lane", "cost")
+
+    def __init__(self, future: Any, session: Optional[Hashable], lane: str, cost: float):
+        self.future = future
+        self.session = session
+        self.lane = lane
+        self.cost = cost
+
+class _Flow:
+    __slots__ = ("tickets", "deficit", "turn")
+
+    def __init__(self):
+        self.tickets: Deque[Ticket] = deque()
+        self.deficit = 0.0
+        # Whether the flow already got its quantum in the current round
+        self.turn = False
+
+class FairQueue:
+    """Priority lanes of per-session FIFO queues, served by deficit round-robin"""
+
+    def __init__(self, lanes: List[str], quantum: float = 1.0):
+        self.quantum = quantum
+        # Lane -> session -> flow; dicts keep lane priority and round-robin order
+        self._lanes: Dict[str, "OrderedDict[Optional[Hashable], _Flow]"] = {lane: OrderedDict() for lane in lanes}
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def push(self, ticket: Ticket):
+        flows = self._lanes.get(ticket.lane)
+        if flows is None:
+            flows = self._lanes[ticket.lane] = OrderedDict()
+        flow = flows.get(ticket.session)
+        if flow is None:
+            flow = flows[ticket.session] = _Flow()
+        flow.tickets.append(ticket)
+        self._length += 1
+
+    def remove(self, ticket: Ticket) -> bool:
+        flows = self._lanes.get(ticket.lane)
+        flow = flows.get(ticket.session) if flows is not None else None
+        if flow is None:
+            return False
+        try:
+            flow.tickets.remove(ticket)
+        except ValueError:
+            return False
+        if not flow.tickets:
+            del flows[ticket.session]
+        self._length -= 1
+        return True
+
+    def pop(self, eligible: Callable[[Optional[Hashable]], bool]) -> Optional[Ticket]:
+        """Next ticket of a session for which eligible(session) holds, None if there is none"""
+        if not self._length:
+            return None
+        for flows in self._lanes.values():
+            skipped = 0
+            while flows and skipped < len(flows):
+                session, flow = next(iter(flows.items()))
+                if not eligible(session):
+                    # Capped sessions keep their place and deficit until a slot of theirs frees up
+                    flows.move_to_end(session)
+                    skipped += 1
+                    continue
+                skipped = 0
+                if not flow.turn:
+                    flow.deficit += self.quantum
+                    flow.turn = True
+                ticket = flow.tickets[0]
+                if flow.deficit >= ticket.cost:
+                    flow.deficit -= ticket.cost
+                    flow.tickets.popleft()
+                    if not flow.tickets:
+                        # An idle flow does not bank credit
+                        del flows[session]
+                    self._length -= 1
+                    return ticket
+                flow.turn = False
+                flows.move_to_end(session)
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            lane: {"queued": sum(len(flow.tickets) for flow in flows.values()), "sessions": len(flows)}
+            for lane, flows in self._lanes.items()
+        }
+
+def lane_for(scheduler: Dict[str, Any], tags: List[str]) -> str:
+    """A tool's lane: its own scheduler.lane, else the lane of its first mapped tag, else the default"""
+    lane = scheduler.get("lane")
+    if lane:
+        return lane
+    by_tag = scheduler["lane_by_tag"]
+    for tag in tags:
+        if tag in by_tag:
+            return by_tag[tag]
+    return scheduler["default_lane"]
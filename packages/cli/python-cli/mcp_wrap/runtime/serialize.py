@@ -0,0 +1,59 @@
+"""
+Tool result serialization for generated MCP servers
+
+In passthrough mode a JSON upstream body is decoded to text once and returned
+as-is (or spliced into the request/status envelope) instead of being parsed
+and re-serialized. Pretty-printing is opt-in because it costs a full parse
+and inflates large payloads. A fields projection is applied to the decoded
+body, so projected results are always parsed and re-serialized.
+"""
+
+import json
+from typing import Any, Callable, Optional
+
+import httpx
+
+def is_json(response: httpx.Response) -> bool:
+    """Whether the response declares a JSON body"""
+    media_type = response.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    return media_type == "application/json" or media_type.endswith("+json")
+
+def response_data(response: httpx.Response) -> Any:
+    """Parsed body: JSON when declared, text otherwise"""
+    if is_json(response):
+        return response.json() if response.content.strip() else None
+    return response.text
+
+def body_text(response: httpx.Response) -> str:
+    """The body as a JSON document without parsing it: JSON bodies verbatim, text as a JSON string"""
+    if is_json(response):
+        text = response.text
+        return text if text.strip() else "null"
+    return json.dumps(response.text, ensure_ascii=False)
+
+def render_result(response: httpx.Response, request: Optional[str] = None,
+                  indent: Optional[int] = None, passthrough: bool = True,
+                  project: Optional[Callable[[Any], Any]] = None) -> str:
+    """Tool result text: the body, or {request, response, status_code} when request is given"""
+    if project is not None and not is_json(response):
+        # Nothing to select from in a text body
+        project = None
+    if passthrough and not indent and project is None:
+        body = body_text(response)
+        if request is None:
+            return body
+        return '{"request":%s,"response":%s,"status_code":%d}' % (
+            json.dumps(request, ensure_ascii=False), body, response.status_code
+        )
+
+    separators = None if indent else (",", ":")
+    data = response_data(response)
+    if project is not None:
+        data = project(data)
+    if request is None:
+        return json.dumps(data, indent=indent, separators=separators)
+    return json.dumps({
+        "request": request,
+        "response": data,
+        "status_code": response.status_code
+    }, indent=indent, separators=separators)
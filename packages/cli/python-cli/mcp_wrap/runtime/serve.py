@@ -0,0 +1,119 @@
+"""
+Streamable HTTP transport for generated MCP servers
+
+With serve.transport = "http" one server process serves many MCP sessions
+over streamable HTTP (POST plus SSE streams) instead of a single stdio
+client. Every session shares the process-wide ToolRuntime, so the upstream
+connection pool, cache, coalescing, limiter and breaker are shared too: the
+runtime is opened with the HTTP app and closed when it shuts down.
+"""
+
+import inspect
+import logging
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple, Union
+
+logger = logging.getLogger("mcp_runtime")
+
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+def parse_bind(bind: Union[str, int]) -> Tuple[str, int]:
+    """(host, port) for "HOST:PORT", "[IPv6]:PORT" or a bare port"""
+    bind = str(bind).strip()
+    host, sep, port = bind.rpartition(":")
+    if not sep:
+        host, port = "127.0.0.1", bind
+    host = host.strip("[]") or "0.0.0.0"
+    try:
+        return host, int(port)
+    except ValueError:
+        raise ValueError(f"Invalid bind address {bind!r}; expected HOST:PORT") from None
+
+def is_stateless(serve: Dict[str, Any]) -> bool:
+    """Several workers cannot share session state, so they always run stateless"""
+    return bool(serve["stateless"]) or serve["workers"] > 1
+
+def _security_settings(host: str):
+    """DNS rebinding protection for loopback binds, as FastMCP applies it; none for public binds"""
+    if host not in LOOPBACK_HOSTS:
+        return None
+    from mcp.server.transport_security import TransportSecuritySettings
+    return TransportSecuritySettings(
+        enable_dns_rebinding_protection=True,
+        allowed_hosts=["127.0.0.1:*", "localhost:*", "[::1]:*"],
+        allowed_origins=["http://127.0.0.1:*", "http://localhost:*", "http://[::1]:*"],
+    )
+
+def _session_manager(mcp_server: Any, serve: Dict[str, Any]):
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+
+    host, _ = parse_bind(serve["bind"])
+    options = {
+        "json_response": serve["json_response"],
+        "stateless": is_stateless(serve),
+        "security_settings": _security_settings(host),
+        "session_idle_timeout": serve["session_idle_timeout"],
+        "max_sessions": serve["max_sessions"],
+    }
+    supported = inspect.signature(StreamableHTTPSessionManager).parameters
+    unsupported = [name for name in options if name not in supported]
+    if unsupported:
+        logger.warning("Installed mcp package ignores serve option(s): %s", ", ".join(unsupported))
+    return StreamableHTTPSessionManager(
+        app=mcp_server, **{name: value for name, value in options.items() if name in supported}
+    )
+
+def build_http_app(server: Any, runtime: Any):
+    """Starlette app serving a low-level Server or FastMCP server at serve.path"""
+    from starlette.applications import Starlette
+    from starlette.routing import Route
+
+    serve = runtime.config["serve"]
+    # FastMCP wraps a low-level Server; both are served by the same session manager
+    manager = _session_manager(getattr(server, "_mcp_server", server), serve)
+
+    class StreamableHTTPEndpoint:
+        async def __call__(self, scope, receive, send):
+            await manager.handle_request(scope, receive, send)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        # Hold the runtime open for the life of the app, not of each session
+        async with runtime, manager.run():
+            yield
+
+    routes = [Route(serve["path"], endpoint=StreamableHTTPEndpoint())]
+    if runtime.config["warmup"]["enabled"]:
+        from starlette.responses import JSONResponse
+
+        async def ready(request):
+            readiness = runtime.readiness()
+            return JSONResponse(readiness, status_code=200 if readiness["ready"] else 503)
+
+        routes.append(Route(runtime.config["warmup"]["path"], endpoint=ready))
+    if runtime.metrics is not None:
+        from starlette.responses import PlainTextResponse
+
+        async def metrics(request):
+            return PlainTextResponse(runtime.metrics_text(), media_type="text/plain; version=0.0.4")
+
+        routes.append(Route(runtime.config["metrics"]["path"], endpoint=metrics))
+
+    return Starlette(routes=routes, lifespan=lifespan)
+
+def serve_http(app_factory: Callable[[], Any], factory_path: str, app_dir: Union[str, Path], serve: Dict[str, Any]):
+    """Run the streamable HTTP app under uvicorn; several workers import app_factory by factory_path"""
+    import uvicorn
+
+    host, port = parse_bind(serve["bind"])
+    workers = max(1, serve["workers"])
+    if serve["workers"] > 1 and not serve["stateless"]:
+        logger.warning("Running %d workers stateless: sessions cannot be shared across worker processes", workers)
+    logger.warning("Serving MCP over streamable HTTP at http://%s:%d%s", host, port, serve["path"])
+
+    if workers == 1:
+        uvicorn.run(app_factory(), host=host, port=port, log_level="warning")
+    else:
+        uvicorn.run(factory_path, factory=True, app_dir=str(app_dir), host=host, port=port,
+                    workers=workers, log_level="warning")
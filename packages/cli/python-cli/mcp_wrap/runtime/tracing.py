@@ -0,0 +1,231 @@
+"""
+Tracing for generated MCP servers
+
+With tracing enabled, every tool call is recorded as a tree of spans:
+
+    tool <name>                  the whole call (one trace)
+      arguments                  argument handling before the upstream request
+      request                    ToolRuntime.request(), cache and coalescing included
+        queue                    waiting for an upstream slot from the limiter
+        attempt                  one upstream try (several when retried)
+          acquire connection     until the request is on the wire; includes connect
+            connect / tls        opening a new connection
+          send                   request headers and body
+          wait                   time to the first response byte
+          receive                response body
+        backoff                  sleep before a retry
+      render                     JSON decoding and result formatting
+
+The span of each attempt is sent upstream as a W3C traceparent header, so
+spans the FastAPI app records join the same trace. Finished traces are
+appended to a local file, either as JSON lines (one span per line) or in
+the Chrome trace event format (open it in Perfetto or chrome://tracing).
+No collector is involved.
+"""
+
+import functools
+import itertools
+import json
+import os
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# One reusable encoder: json.dumps with non-default arguments builds a new one per call
+_encode = json.JSONEncoder(separators=(",", ":"), default=str).encode
+
+current_span: ContextVar[Optional["Span"]] = ContextVar("mcp_runtime_span", default=None)
+
+# httpcore trace events (without .started/.complete/.failed) -> span name
+HTTP_PHASES = {
+    "connection.connect_tcp": "connect",
+    "connection.connect_unix_socket": "connect",
+    "connection.start_tls": "tls",
+    "http11.send_request_headers": "send",
+    "http11.send_request_body": "send",
+    "http2.send_request_headers": "send",
+    "http2.send_request_body": "send",
+    "http11.receive_response_headers": "wait",
+    "http2.receive_response_headers": "wait",
+    "http11.receive_response_body": "receive",
+    "http2.receive_response_body": "receive",
+}
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start", "end", "attributes", "lane", "_trace")
+
+    def __init__(self, name: str, parent: Optional["Span"], lane: int = 0, start: Optional[int] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.start = start if start is not None else time.perf_counter_ns()
+        self.end: Optional[int] = None
+        self.attributes = attributes or {}
+        if parent is None:
+            self.trace_id = f"{random.getrandbits(128):032x}"
+            self.parent_id = None
+            self.lane = lane
+            self._trace: List["Span"] = []
+        else:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+            self.lane = lane or parent.lane
+            self._trace = parent._trace
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set(self, **attributes: Any):
+        self.attributes.update(attributes)
+
+class Tracer:
+    def __init__(self, path: Path, format: str = "jsonl", sample_rate: float = 1.0, propagate: bool = True):
+        if format not in ("jsonl", "chrome"):
+            raise ValueError(f"Unknown tracing format {format!r} (choose jsonl or chrome)")
+        self.path = Path(path)
+        self.format = format
+        self.sample_rate = sample_rate
+        self.propagate = propagate
+        # Spans are timed with perf_counter_ns and exported on the wall clock
+        self._epoch_offset = time.time_ns() - time.perf_counter_ns()
+        self._lanes = itertools.count(1)
+        self._file = None
+        self.counters = {"traces": 0, "spans": 0, "dropped": 0}
+
+    @classmethod
+    def from_config(cls, tracing: Dict[str, Any], base_dir: Path) -> "Tracer":
+        return cls(
+            path=base_dir / tracing["file"],
+            format=tracing["format"],
+            sample_rate=tracing["sample_rate"],
+            propagate=tracing["propagate"],
+        )
+
+    def traced(self, name: str) -> Callable:
+        """Decorator recording an async tool function as a span (a new trace unless one is active)"""
+        def decorate(function: Callable) -> Callable:
+            @functools.wraps(function)
+            async def wrapper(*args, **kwargs):
+                with self.span(f"tool {name}", root=True, tool=name):
+                    return await function(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    @contextmanager
+    def span(self, name: str, root: bool = False, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Child span of the active span; root=True starts a sampled trace when none is active"""
+        parent = current_span.get()
+        if parent is None and (not root or random.random() >= self.sample_rate):
+            yield None
+            return
+        # Every tool call gets its own lane (Chrome thread), so concurrent batch items do not overlap
+        span = Span(name, parent, next(self._lanes) if root else 0, attributes=attributes)
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set(error=f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            current_span.reset(token)
+            self.finish(span)
+
+    def record(self, name: str, start: int, end: int, parent: Optional[Span] = None, **attributes: Any):
+        """Add an already finished span (perf_counter_ns timestamps) under parent or the active span"""
+        parent = parent or current_span.get()
+        if parent is None:
+            return
+        self.finish(Span(name, parent, start=start, attributes=attributes), end)
+
+    def finish(self, span: Span, end: Optional[int] = None):
+        span.end = end if end is not None else time.perf_counter_ns()
+        span._trace.append(span)
+        if span.parent_id is None:
+            self.export(span._trace)
+
+    def export(self, spans: List[Span]):
+        """Append one finished trace to the trace file"""
+        try:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+                if self.format == "chrome" and self._file.tell() == 0:
+                    # JSON array format; viewers accept the array without its closing bracket
+                    self._file.write("[\n")
+            separator = ",\n" if self.format == "chrome" else "\n"
+            self._file.write("".join(_encode(self._event(span)) + separator for span in spans))
+            self._file.flush()
+        except (OSError, ValueError):
+            self.counters["dropped"] += 1
+            return
+        self.counters["traces"] += 1
+        self.counters["spans"] += len(spans)
+
+    def _event(self, span: Span) -> Dict[str, Any]:
+        start_us = (span.start + self._epoch_offset) // 1000
+        duration_us = (span.end - span.start) / 1000
+        if self.format == "chrome":
+            return {
+                "name": span.name, "cat": "mcp", "ph": "X", "ts": start_us, "dur": duration_us,
+                "pid": os.getpid(), "tid": span.lane,
+                "args": {"trace_id": span.trace_id, "span_id": span.span_id, **span.attributes},
+            }
+        return {
+            "trace_id": span.trace_id, "span_id": span.span_id, "parent_id": span.parent_id,
+            "name": span.name, "start_us": start_us, "duration_us": duration_us, "attributes": span.attributes,
+        }
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "file": str(self.path), "format": self.format}
+
+class HttpPhases:
+    """httpx "trace" request extension turning httpcore events into spans under an attempt span"""
+
+    def __init__(self, tracer: Tracer, attempt: Span):
+        self.tracer = tracer
+        self.attempt = attempt
+        self._started: Dict[str, int] = {}
+        self._phases: Dict[str, List[int]] = {}
+
+    async def __call__(self, event: str, info: Dict[str, Any]):
+        phase, _, stage = event.rpartition(".")
+        name = HTTP_PHASES.get(phase)
+        if name is None:
+            return
+        now = time.perf_counter_ns()
+        if stage == "started":
+            self._started.setdefault(name, now)
+            if name == "send" and "acquire connection" not in self._phases:
+                # Everything before the first byte is written is connection acquisition
+                self._phases["acquire connection"] = [self.attempt.start, now]
+        elif stage in ("complete", "failed"):
+            self._phases[name] = [self._started.get(name, now), now]
+
+    def flush(self):
+        """Record the collected phases; connect and tls nest under connection acquisition"""
+        phases = self._phases
+        acquire = phases.pop("acquire connection", None)
+        if acquire is not None:
+            acquire_span = Span("acquire connection", self.attempt, start=acquire[0])
+            for name in ("connect", "tls"):
+                if name in phases:
+                    start, end = phases.pop(name)
+                    self.tracer.finish(Span(name, acquire_span, start=start), end)
+            self.tracer.finish(acquire_span, acquire[1])
+        for name, (start, end) in phases.items():
+            self.tracer.finish(Span(name, self.attempt, start=start), end)
+
+def annotate(**attributes: Any):
+    """Set attributes on the active span, if any"""
+    span = current_span.get()
+    if span is not None:
+        span.set(**attributes)
@@ -0,0 +1,242 @@
+"""
+Argument validation for generated MCP servers
+
+Every tool's inputSchema is compiled once at startup into a tree of small
+checker functions, so a call is validated without walking the schema again.
+Bad arguments are rejected locally with the path of the offending value
+instead of costing an upstream round-trip and a 422. Lossless coercions are
+applied on the way: "5" to 5 for integers, "2.5" to 2.5 for numbers,
+"true"/"false" to booleans, 5.0 to 5 and numbers to strings.
+
+The JSON Schema keywords the generators emit are supported (type, properties,
+required, items, enum, bounds, lengths, pattern, additionalProperties: false);
+other keywords are ignored.
+"""
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+# (value, path) -> the value, coerced where allowed; raises InvalidArguments
+Check = Callable[[Any, str], Any]
+
+class InvalidArguments(ValueError):
+    """Raised when tool arguments do not match the tool's inputSchema"""
+
+_MISSING = object()
+
+_INTEGER = re.compile(r"[+-]?\d+")
+_NUMBER = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+
+def _string(value: Any, coerce: bool) -> Any:
+    if isinstance(value, str):
+        return value
+    if coerce and isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return _MISSING
+
+def _integer(value: Any, coerce: bool) -> Any:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        # JSON Schema counts 5.0 as an integer
+        return int(value)
+    if coerce and isinstance(value, str) and _INTEGER.fullmatch(value.strip()):
+        return int(value)
+    return _MISSING
+
+def _number(value: Any, coerce: bool) -> Any:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    if coerce and isinstance(value, str):
+        text = value.strip()
+        if _INTEGER.fullmatch(text):
+            return int(text)
+        if _NUMBER.fullmatch(text):
+            return float(text)
+    return _MISSING
+
+def _boolean(value: Any, coerce: bool) -> Any:
+    if isinstance(value, bool):
+        return value
+    if coerce and isinstance(value, str):
+        return {"true": True, "false": False}.get(value.strip().lower(), _MISSING)
+    return _MISSING
+
+def _null(value: Any, coerce: bool) -> Any:
+    return value if value is None else _MISSING
+
+def _object(value: Any, coerce: bool) -> Any:
+    return value if isinstance(value, dict) else _MISSING
+
+def _array(value: Any, coerce: bool) -> Any:
+    return value if isinstance(value, list) else _MISSING
+
+TYPES: Dict[str, Callable[[Any, bool], Any]] = {
+    "string": _string,
+    "integer": _integer,
+    "number": _number,
+    "boolean": _boolean,
+    "null": _null,
+    "object": _object,
+    "array": _array,
+}
+
+def _describe(value: Any) -> str:
+    text = json.dumps(value, ensure_ascii=False, default=repr)
+    return text if len(text) <= 40 else text[:37] + "..."
+
+def _fail(path: str, message: str) -> InvalidArguments:
+    return InvalidArguments(f"{path}: {message}" if path else message)
+
+def _compile_type(types: List[str], coerce: bool) -> Optional[Check]:
+    converters = [TYPES[name] for name in types if name in TYPES]
+    if not converters:
+        return None
+    expected = " or ".join(types)
+
+    if len(converters) == 1:
+        convert = converters[0]
+
+        def check_type(value: Any, path: str) -> Any:
+            result = convert(value, coerce)
+            if result is _MISSING:
+                raise _fail(path, f"expected {expected}, got {_describe(value)}")
+            return result
+        return check_type
+
+    def check_union(value: Any, path: str) -> Any:
+        # An exact match wins over a coercion: "5" stays a string for ["string", "integer"]
+        for allow_coercion in (False, True) if coerce else (False,):
+            for convert in converters:
+                result = convert(value, allow_coercion)
+                if result is not _MISSING:
+                    return result
+        raise _fail(path, f"expected {expected}, got {_describe(value)}")
+    return check_union
+
+def _compile_object(schema: Dict[str, Any], coerce: bool) -> Optional[Check]:
+    properties = {name: compile_schema(sub, coerce) for name, sub in (schema.get("properties") or {}).items()}
+    required = tuple(schema.get("required") or ())
+    closed = schema.get("additionalProperties") is False
+    if not properties and not required and not closed:
+        return None
+    checks = tuple(properties.items())
+
+    def check_object(value: Any, path: str) -> Any:
+        if not isinstance(value, dict):
+            return value
+        missing = [name for name in required if value.get(name) is None]
+        if missing:
+            raise _fail(path, f"missing required argument(s) {', '.join(missing)}")
+        if closed:
+            unknown = [name for name in value if name not in properties]
+            if unknown:
+                raise _fail(path, f"unknown argument(s) {', '.join(sorted(unknown))}")
+        copied = None
+        for name, check in checks:
+            item = value.get(name, _MISSING)
+            # An explicit null for an optional argument means it was left out
+            if item is _MISSING or item is None:
+                continue
+            result = check(item, f"{path}.{name}" if path else name)
+            if result is not item:
+                if copied is None:
+                    copied = dict(value)
+                copied[name] = result
+        return value if copied is None else copied
+    return check_object
+
+def _compile_array(schema: Dict[str, Any], coerce: bool) -> Optional[Check]:
+    item_schema = schema.get("items")
+    check_item = compile_schema(item_schema, coerce) if isinstance(item_schema, dict) else None
+    min_items = schema.get("minItems")
+    max_items = schema.get("maxItems")
+    if check_item is None and min_items is None and max_items is None:
+        return None
+
+    def check_array(value: Any, path: str) -> Any:
+        if not isinstance(value, list):
+            return value
+        if min_items is not None and len(value) < min_items:
+            raise _fail(path, f"expected at least {min_items} item(s), got {len(value)}")
+        if max_items is not None and len(value) > max_items:
+            raise _fail(path, f"expected at most {max_items} item(s), got {len(value)}")
+        if check_item is None:
+            return value
+        copied = None
+        for index, item in enumerate(value):
+            result = check_item(item, f"{path}[{index}]")
+            if result is not item:
+                if copied is None:
+                    copied = list(value)
+                copied[index] = result
+        return value if copied is None else copied
+    return check_array
+
+def _compile_constraints(schema: Dict[str, Any]) -> Optional[Check]:
+    enum = schema.get("enum")
+    minimum = schema.get("minimum")
+    maximum = schema.get("maximum")
+    exclusive_minimum = schema.get("exclusiveMinimum")
+    exclusive_maximum = schema.get("exclusiveMaximum")
+    min_length = schema.get("minLength")
+    max_length = schema.get("maxLength")
+    pattern = re.compile(schema["pattern"]) if isinstance(schema.get("pattern"), str) else None
+    if all(keyword is None for keyword in (enum, minimum, maximum, exclusive_minimum, exclusive_maximum,
+                                           min_length, max_length, pattern)):
+        return None
+
+    def check_constraints(value: Any, path: str) -> Any:
+        if enum is not None and value not in enum:
+            raise _fail(path, f"expected one of {', '.join(map(_describe, enum))}, got {_describe(value)}")
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            if minimum is not None and value < minimum:
+                raise _fail(path, f"must be >= {minimum}, got {value}")
+            if maximum is not None and value > maximum:
+                raise _fail(path, f"must be <= {maximum}, got {value}")
+            if exclusive_minimum is not None and value <= exclusive_minimum:
+                raise _fail(path, f"must be > {exclusive_minimum}, got {value}")
+            if exclusive_maximum is not None and value >= exclusive_maximum:
+                raise _fail(path, f"must be < {exclusive_maximum}, got {value}")
+        elif isinstance(value, str):
+            if min_length is not None and len(value) < min_length:
+                raise _fail(path, f"must be at least {min_length} character(s) long")
+            if max_length is not None and len(value) > max_length:
+                raise _fail(path, f"must be at most {max_length} character(s) long")
+            if pattern is not None and not pattern.search(value):
+                raise _fail(path, f"{_describe(value)} does not match {pattern.pattern!r}")
+        return value
+    return check_constraints
+
+def compile_schema(schema: Dict[str, Any], coerce: bool = True) -> Check:
+    """One checker function for a JSON Schema; keywords it does not know are ignored"""
+    schema = schema or {}
+    types = schema.get("type")
+    if isinstance(types, str):
+        types = [types]
+    checks = [check for check in (
+        _compile_type(types, coerce) if types else None,
+        _compile_object(schema, coerce),
+        _compile_array(schema, coerce),
+        _compile_constraints(schema),
+    ) if check is not None]
+
+    if not checks:
+        return lambda value, path: value
+    if len(checks) == 1:
+        return checks[0]
+
+    def check_all(value: Any, path: str) -> Any:
+        for check in checks:
+            value = check(value, path)
+        return value
+    return check_all
+
+def compile_validator(schema: Dict[str, Any], coerce: bool = True) -> Callable[[Optional[Dict[str, Any]]], Dict[str, Any]]:
+    """Validator for a tool's arguments: returns them, coerced, or raises InvalidArguments"""
+    check = compile_schema(schema or {"type": "object"}, coerce)
+
+    def validate(arguments: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        return check({} if arguments is None else arguments, "")
+    return validate
@@ -0,0 +1,125 @@
+"""
+Startup warm-up for generated MCP servers
+
+Without it, the first tool calls after a start pay for DNS, TCP connect and
+TLS, and fail outright while the FastAPI app is still starting. The warm-up
+runs in the background once the runtime is opened, so the MCP server answers
+initialize and tools/list meanwhile. It probes the app's health path with
+exponential backoff until it answers, then opens a number of pooled
+connections at once so the first concurrent calls find them ready. Tool
+calls made during the warm-up wait for it instead of failing.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger("mcp_runtime")
+
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+class Warmup:
+    def __init__(self, url: str, health_path: Optional[str], connections: int = 4, timeout: float = 30.0,
+                 backoff: float = 0.1, max_backoff: float = 1.0, probe_timeout: float = 2.0):
+        # Without a health path the app root is probed, and any answer below 500 counts
+        self.url = url + (health_path or "/")
+        self.strict = health_path is not None
+        self.connections = connections
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.probe_timeout = probe_timeout
+
+        self.state = WARMING
+        self.probes = 0
+        self.opened = 0
+        self.error: Optional[str] = None
+        self.started = time.monotonic()
+        self.elapsed: Optional[float] = None
+        self.done = asyncio.Event()
+
+    @classmethod
+    def from_config(cls, base_url: str, upstream: Dict[str, Any], warmup: Dict[str, Any]) -> "Warmup":
+        return cls(
+            base_url,
+            upstream.get("health_path"),
+            connections=warmup["connections"],
+            timeout=warmup["timeout"],
+            backoff=warmup["backoff"],
+            max_backoff=warmup["max_backoff"],
+            probe_timeout=warmup["probe_timeout"],
+        )
+
+    @property
+    def ready(self) -> bool:
+        return self.state == READY
+
+    async def run(self, client: httpx.AsyncClient, preopen: bool = True) -> bool:
+        """Probe until the upstream is ready or the timeout passes, then pre-open connections"""
+        try:
+            if not await self._probe(client):
+                self.state = FAILED
+                logger.warning("Upstream %s not ready after %.1fs (%d probes): %s",
+                               self.url, self.timeout, self.probes, self.error)
+                return False
+            if preopen and self.connections > 1:
+                await self._preopen(client)
+            self.state = READY
+            logger.warning("Upstream ready after %.0f ms (%d probes, %d connections)",
+                           (time.monotonic() - self.started) * 1000, self.probes, self.opened)
+            return True
+        finally:
+            self.elapsed = time.monotonic() - self.started
+            self.done.set()
+
+    async def _probe(self, client: httpx.AsyncClient) -> bool:
+        deadline = self.started + self.timeout
+        delay = self.backoff
+        while True:
+            self.probes += 1
+            try:
+                response = await client.get(self.url, timeout=self.probe_timeout)
+                await response.aclose()
+                if response.is_success or (not self.strict and response.status_code < 500):
+                    self.opened = 1
+                    return True
+                self.error = f"HTTP {response.status_code}"
+            except httpx.HTTPError as e:
+                self.error = str(e) or type(e).__name__
+            if time.monotonic() + delay > deadline:
+                return False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_backoff)
+
+    async def _preopen(self, client: httpx.AsyncClient):
+        """Concurrent requests need a connection each, and the pool keeps them alive afterwards"""
+        async def request() -> bool:
+            try:
+                response = await client.get(self.url, timeout=self.probe_timeout)
+                await response.aclose()
+                return True
+            except httpx.HTTPError:
+                return False
+
+        # The probe's connection is idle in the pool and serves one of them
+        results = await asyncio.gather(*[request() for _ in range(self.connections)])
+        self.opened = max(self.opened, sum(results))
+
+    async def wait(self):
+        """Hold a tool call until the warm-up has finished, successfully or not"""
+        await self.done.wait()
+
+    def report(self) -> Dict[str, Any]:
+        elapsed = self.elapsed if self.elapsed is not None else time.monotonic() - self.started
+        return {
+            "state": self.state,
+            "probes": self.probes,
+            "connections": self.opened,
+            "elapsed_ms": round(elapsed * 1000, 1),
+            **({"error": self.error} if self.state != READY and self.error else {}),
+        }
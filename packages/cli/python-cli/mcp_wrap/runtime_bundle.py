@@ -0,0 +1,156 @@
+"""
+Runtime Bundle - Ship the mcp_runtime support package with generated servers
+
+Copies mcp_wrap/runtime next to the generated server.py as mcp_runtime and
+writes runtime.json, the user-editable configuration the runtime reads at
+startup. Settings already present in an existing runtime.json are kept when
+a server is regenerated, except for the upstream section, which follows the
+generation options and the scanned app (e.g. its health check route). Once the server compiles, its manifest.json (the
+initialize result and tool list it starts from) is written as well.
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+from .runtime.coldstart import MANIFEST_FILE
+from .runtime.config import DEFAULT_CONFIG, merge_config
+from .runtime.serve import parse_bind
+from .tool_spec import ToolSpec
+
+RUNTIME_PACKAGE = "mcp_runtime"
+RUNTIME_CONFIG_FILE = "runtime.json"
+
+# Last path segments of health check routes, most specific first
+HEALTH_ROUTES = ("health", "healthz", "healthcheck", "health_check", "readyz", "ready", "livez", "ping")
+
+def port_or_socket(value: Union[int, str]) -> Union[int, str]:
+    """A TCP port number or a unix:///path/to.sock upstream (argparse type for --port)"""
+    if isinstance(value, str) and value.startswith("unix://"):
+        if not value[len("unix://"):]:
+            raise ValueError(f"Missing socket path in {value}")
+        return value
+    return int(value)
+
+def bind_address(value: str) -> str:
+    """HOST:PORT the generated server listens on (argparse type for --bind)"""
+    parse_bind(value)
+    return value
+
+def add_serve_arguments(parser: argparse.ArgumentParser):
+    """Options of the generated server's own transport (written to runtime.json "serve")"""
+    parser.add_argument("--transport", choices=["stdio", "http"],
+                        help="Serve MCP over stdio (one client per process) or streamable HTTP (many sessions per process)")
+    parser.add_argument("--bind", type=bind_address, metavar="HOST:PORT",
+                        help="Address the HTTP transport listens on (default: 127.0.0.1:3000)")
+    parser.add_argument("--workers", type=int, metavar="N",
+                        help="uvicorn worker processes for the HTTP transport; several workers run stateless (default: 1)")
+    parser.add_argument("--max-sessions", type=int, metavar="N",
+                        help="Concurrent MCP sessions per process over HTTP (default: 1000)")
+    parser.add_argument("--session-idle-timeout", type=float, metavar="SECONDS",
+                        help="Close HTTP sessions idle this long (default: 1800)")
+
+def serve_options(args: argparse.Namespace) -> Optional[Dict[str, Any]]:
+    """runtime.json "serve" overrides for the transport options given on the command line"""
+    serve = {
+        "transport": args.transport,
+        "bind": args.bind,
+        "workers": args.workers,
+        "max_sessions": args.max_sessions,
+        "session_idle_timeout": args.session_idle_timeout,
+    }
+    serve = {key: value for key, value in serve.items() if value is not None}
+    return serve or None
+
+def upstream_url(port: Union[int, str]) -> str:
+    """Upstream base URL for a --port value"""
+    if isinstance(port, str) and port.startswith("unix://"):
+        return port
+    return f"http://localhost:{port}"
+
+def find_health_path(specs: Iterable[ToolSpec]) -> Optional[str]:
+    """Route of the app's health check: a GET without parameters named like one, for the warm-up to probe"""
+    candidates = {}
+    for spec in specs:
+        if spec.method != "GET" or spec.path_parameters or spec.query_parameters:
+            continue
+        segment = spec.path.rstrip("/").rsplit("/", 1)[-1].lower()
+        if segment in HEALTH_ROUTES:
+            candidates.setdefault(HEALTH_ROUTES.index(segment), spec.path)
+    return candidates[min(candidates)] if candidates else None
+
+def install_runtime(out_path: Path, port: Union[int, str] = 8000, overrides: Optional[Dict[str, Any]] = None,
+                    health_path: Optional[str] = None) -> Dict[str, Any]:
+    """Copy the runtime package into out_path and write runtime.json; returns the written config"""
+    source_dir = Path(__file__).parent / "runtime"
+    target_dir = Path(out_path) / RUNTIME_PACKAGE
+    if target_dir.exists():
+        shutil.rmtree(target_dir)
+    target_dir.mkdir(parents=True)
+    for module in sorted(source_dir.glob("*.py")):
+        shutil.copy2(module, target_dir / module.name)
+
+    config_path = Path(out_path) / RUNTIME_CONFIG_FILE
+    existing = {}
+    if config_path.exists():
+        try:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                existing = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable {config_path}: {e}")
+
+    overrides = dict(overrides or {})
+    upstream = merge_config(DEFAULT_CONFIG["upstream"], {"url": upstream_url(port), "health_path": health_path})
+    upstream = merge_config(upstream, overrides.pop("upstream", {}))
+    config = merge_config(merge_config(DEFAULT_CONFIG, existing), overrides)
+    # The generation options always decide where the upstream lives
+    config["upstream"] = upstream
+
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2)
+        f.write('\n')
+
+    return config
+
+def in_process_upstream(app_path: str, app: str) -> Dict[str, Any]:
+    """install_runtime overrides that route tool calls to the FastAPI app imported in-process"""
+    app_dir = Path(app_path).resolve()
+    if app_dir.is_file():
+        app_dir = app_dir.parent
+    return {"upstream": {"transport": "asgi", "app": app, "app_dir": str(app_dir)}}
+
+def runtime_overrides(scanner: Any, app_path: Optional[str], in_process: Optional[str] = None,
+                      serve: Optional[Dict[str, Any]] = None, reload: bool = False) -> Optional[Dict[str, Any]]:
+    """runtime.json overrides for the generation options given on the command line
+
+    scanner is the FastAPIScanner that finds the app object for --in-process auto.
+    """
+    options = {"serve": serve} if serve else {}
+    if reload:
+        options["reload"] = {"enabled": True}
+    if not in_process:
+        return options or None
+    if not app_path:
+        raise ValueError("--in-process needs the FastAPI app path, which this manifest does not record")
+    app = in_process if in_process != "auto" else scanner.find_app_object(app_path)
+    if not app:
+        raise ValueError(f"No FastAPI() instance found in {app_path}; pass --in-process MODULE:ATTRIBUTE")
+    return {**options, **in_process_upstream(app_path, app)}
+
+def write_startup_manifest(out_path: Path, module_name: str = "server") -> bool:
+    """Write the manifest a generated stdio server starts from; needs the server's requirements installed"""
+    command = [sys.executable, "-c", f"from mcp_runtime.coldstart import write_manifest; write_manifest({module_name!r})"]
+    try:
+        result = subprocess.run(command, cwd=out_path, capture_output=True, text=True, timeout=120)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"Warning: Could not write {MANIFEST_FILE}: {e}")
+        return False
+    if result.returncode != 0:
+        reason = (result.stderr.strip().splitlines() or ["unknown error"])[-1]
+        print(f"Warning: Could not write {MANIFEST_FILE} (written on first start instead): {reason}")
+        return False
+    return True
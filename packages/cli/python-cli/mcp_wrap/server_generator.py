@@ -1,18 +1,47 @@
 import yaml
 import json
+import hashlib
 from typing import Dict, Any, List
 import os
 
+from .zod_emitter import ZodSchemaEmitter
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 class MCPServerGenerator:
-    def __init__(self, yaml_path: str):
-        """Initialize with path to YAML config file"""
+    def __init__(self, yaml_path: str = None, tools: List[Dict[str, Any]] = None):
+        """Initialize with path to YAML config file, or with already loaded tools"""
         self.yaml_path = yaml_path
-        self.tools = self._load_yaml()
+        self.source_hash = None
+        self.tools = tools if tools is not None else self._load_yaml()
+    
+    @classmethod
+    def from_tool_specs(cls, specs) -> "MCPServerGenerator":
+        """Create a generator for tools normalized by the FastAPI scanner"""
+        return cls(tools=[
+            {
+                'name': spec.name,
+                'description': spec.description,
+                'parameters': spec.input_schema()
+            }
+            for spec in specs
+        ])
     
     def _load_yaml(self) -> List[Dict[str, Any]]:
         """Load tools from YAML file"""
-        with open(self.yaml_path, 'r') as f:
-            return yaml.safe_load(f)
+        with open(self.yaml_path, 'rb') as f:
+            data = f.read()
+        self.source_hash = hashlib.sha256(data).hexdigest()
+        return yaml.load(data, Loader=YamlLoader)
+    
+    def _catalog_header(self, comment: str) -> str:
+        """Comment lines recording where the generated tool registrations came from"""
+        if not self.yaml_path:
+            return f"{comment} Tools registered at generation time"
+        return (f"{comment} Tools registered at generation time from {os.path.basename(self.yaml_path)}\n"
+                f"{comment} sha256: {self.source_hash}\n"
+                f"{comment} Regenerate the server after editing the YAML")
     
     def _generate_python_handler(self, tool: Dict[str, Any]) -> str:
         """Generate Python handler function for a tool"""
@@ -48,19 +77,11 @@ class MCPServerGenerator:
     
     def _generate_python_server(self) -> str:
         """Generate complete Python MCP server using FastMCP"""
-        import os
-        yaml_filename = os.path.basename(self.yaml_path)
-        
         server_code = f'''import asyncio
-import os
 from fastmcp import FastMCP
-import yaml
 from typing import Dict, Any
 
-# Load config from YAML (using relative path)
-yaml_path = os.path.join(os.path.dirname(__file__), "{yaml_filename}")
-with open(yaml_path, "r") as f:
-    config = yaml.safe_load(f)
+{self._catalog_header("#")}
 
 # Create FastMCP server
 server = FastMCP("Generated MCP Server")
@@ -102,40 +123,48 @@ if __name__ == "__main__":
     
     def _generate_typescript_server(self) -> str:
         """Generate TypeScript MCP server"""
+        # Convert every tool schema up front so repeated sub-schemas are shared
+        emitter = ZodSchemaEmitter()
+        for tool in self.tools:
+            emitter.register(tool.get('parameters', {}))
+        zod_shapes = [emitter.shape(tool.get('parameters', {})) for tool in self.tools]
+        shared_schemas = emitter.render_declarations()
+        
         server_code = f'''import {{ McpServer }} from "@modelcontextprotocol/sdk/server/mcp.js";
 import {{ z }} from "zod";
-import yaml from "yaml";
-import fs from "fs";
-
-// Load config from YAML
-const config = yaml.parse(fs.readFileSync("{self.yaml_path}", "utf8"));
 
-export default function createStatelessServer() {{
-  const server = new McpServer({{
+{self._catalog_header("//")}
+'''
+        
+        if shared_schemas:
+            server_code += f'''
+// Schemas shared by several tools or referenced through $ref
+{shared_schemas}
+'''
+        
+        server_code += '''
+export default function createStatelessServer() {
+  const server = new McpServer({
     name: "Generated MCP Server",
     version: "1.0.0",
-  }});
+  });
 
 '''
         
         # Add each tool
-        for tool in self.tools:
+        for tool, zod_schema in zip(self.tools, zod_shapes):
             name = tool['name']
             description = tool.get('description', '')
-            parameters = tool.get('parameters', {})
-            
-            # Convert JSON Schema to Zod schema
-            zod_schema = self._json_schema_to_zod(parameters)
             
             server_code += f'''
-  // {description}
+  // {' '.join(description.split())}
   server.tool(
-    "{name}",
-    "{description}",
+    {json.dumps(name)},
+    {json.dumps(description)},
     {zod_schema},
-    async ({{ {', '.join(parameters.get('properties', {}).keys())} }}) => {{
+    async (args) => {{
       return {{
-        content: [{{ type: "text", text: `Executed {name} with parameters: {', '.join([f'${{{p}}}' for p in parameters.get('properties', {}).keys()])}` }}],
+        content: [{{ type: "text", text: `Executed {name} with parameters: ${{JSON.stringify(args)}}` }}],
       }};
     }}
   );
@@ -148,36 +177,6 @@ export default function createStatelessServer() {{
         
         return server_code
     
-    def _json_schema_to_zod(self, schema: Dict[str, Any]) -> str:
-        """Convert JSON Schema to Zod schema string"""
-        if not schema or 'properties' not in schema:
-            return "z.object({})"
-        
-        zod_props = []
-        for prop_name, prop_schema in schema['properties'].items():
-            prop_type = prop_schema.get('type', 'string')
-            
-            if prop_type == 'string':
-                zod_type = "z.string()"
-            elif prop_type == 'integer':
-                zod_type = "z.number().int()"
-            elif prop_type == 'boolean':
-                zod_type = "z.boolean()"
-            elif prop_type == 'array':
-                zod_type = "z.array(z.any())"  # Simplified for now
-            elif prop_type == 'object':
-                zod_type = "z.object({})"  # Simplified for now
-            else:
-                zod_type = "z.any()"
-            
-            # Add description if available
-            if 'description' in prop_schema:
-                zod_type += f'.describe("{prop_schema["description"]}")'
-            
-            zod_props.append(f'{prop_name}: {zod_type}')
-        
-        return f"z.object({{{', '.join(zod_props)}}})"
-    
     def generate_server(self, language: str = "python", output_path: str = None) -> str:
         """Generate MCP server code"""
         if language.lower() == "python":
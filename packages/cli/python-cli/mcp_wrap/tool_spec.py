@@ -0,0 +1,279 @@
+"""
+Tool Spec - Normalized intermediate representation of scanned endpoints
+
+The scanner output is converted into ToolSpec objects exactly once. Every
+backend (FastMCP Python, low-level Python, TypeScript) renders from the same
+specs, so tool naming, type mapping and input schemas live in one place.
+"""
+
+import re
+from fnmatch import fnmatchcase
+from typing import List, Dict, Any, Optional, Iterable
+
+# HTTP methods whose tools accept a "body" argument
+BODY_METHODS = ("POST", "PUT", "PATCH")
+
+# Python/FastAPI annotation names to JSON Schema types
+TYPE_MAPPING = {
+    "str": "string",
+    "string": "string",
+    "int": "integer",
+    "integer": "integer",
+    "float": "number",
+    "number": "number",
+    "decimal": "number",
+    "bool": "boolean",
+    "boolean": "boolean",
+    "list": "array",
+    "array": "array",
+    "set": "array",
+    "tuple": "array",
+    "dict": "object",
+    "object": "object",
+    "any": "object",
+    "unknown": "object",
+    # The scanner drops the inner type of Optional[...] and Union[...]
+    "optional": "string",
+    "union": "string",
+}
+
+_PATH_PLACEHOLDER = re.compile(r"{([^}:]+)(?::[^}]*)?}")
+
+def map_type_to_json_schema(type_name: Optional[str]) -> str:
+    """Map a Python/FastAPI type name to a JSON Schema type"""
+    if not type_name:
+        return "string"
+    # Unknown names are treated as models (Pydantic classes and friends)
+    return TYPE_MAPPING.get(str(type_name).lower(), "object")
+
+def generate_tool_name(method: str, path: str) -> str:
+    """Generate a tool name from an endpoint method and path (e.g. getUsersByUser_id)"""
+    name_parts = []
+    for part in path.split('/'):
+        if not part:
+            continue
+        if part.startswith('{') and part.endswith('}'):
+            # Path parameters become ById-style suffixes
+            param_name = part[1:-1].split(':', 1)[0]
+            name_parts.append('By' + param_name.capitalize())
+        else:
+            # Convert kebab-case or snake_case to CamelCase
+            words = part.replace('-', '_').split('_')
+            name_parts.append(''.join(word.capitalize() for word in words))
+
+    return method.lower() + ''.join(name_parts)
+
+def path_placeholders(path: str) -> List[str]:
+    """Names of the {placeholders} in a route path"""
+    return _PATH_PLACEHOLDER.findall(path)
+
+class ToolParameter:
+    """A path or query argument of a tool"""
+
+    def __init__(self, name: str, location: str, type: str = "string",
+                 required: bool = True, description: str = ""):
+        self.name = name
+        self.location = location
+        self.type = type
+        self.required = required
+        self.description = description
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "location": self.location,
+            "type": self.type,
+            "required": self.required,
+            "description": self.description,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ToolParameter":
+        return cls(
+            name=data["name"],
+            location=data["location"],
+            type=data.get("type", "string"),
+            required=data.get("required", True),
+            description=data.get("description", ""),
+        )
+
+class ToolSpec:
+    """Backend-neutral description of one MCP tool backed by one HTTP endpoint"""
+
+    def __init__(self, name: str, method: str, path: str, description: str = "",
+                 parameters: Optional[List[ToolParameter]] = None,
+                 body_schema: Optional[Dict[str, Any]] = None, body_required: bool = False,
+                 response_type: Optional[str] = None, tags: Optional[List[str]] = None,
+                 source: Optional[str] = None):
+        self.name = name
+        self.method = method.upper()
+        self.path = path
+        self.description = description or f"{self.method} {path}"
+        self.parameters = parameters or []
+        self.body_schema = body_schema
+        self.body_required = body_required
+        self.response_type = response_type
+        self.tags = tags or []
+        self.source = source
+
+    @property
+    def has_body(self) -> bool:
+        return self.method in BODY_METHODS
+
+    @property
+    def path_parameters(self) -> List[ToolParameter]:
+        return [p for p in self.parameters if p.location == "path"]
+
+    @property
+    def query_parameters(self) -> List[ToolParameter]:
+        return [p for p in self.parameters if p.location == "query"]
+
+    def input_schema(self) -> Dict[str, Any]:
+        """JSON Schema for the tool arguments"""
+        properties = {}
+        required = []
+
+        for param in self.parameters:
+            properties[param.name] = {
+                "type": param.type,
+                "description": param.description or f"{param.location} parameter",
+            }
+            if param.required:
+                required.append(param.name)
+
+        if self.has_body:
+            body = {"type": "object", "description": "Request body data"}
+            if self.body_schema and self.body_schema.get("properties"):
+                body["properties"] = self.body_schema["properties"]
+                body["required"] = self.body_schema.get("required", [])
+            properties["body"] = body
+            if self.body_required:
+                required.append("body")
+
+        return {"type": "object", "properties": properties, "required": required}
+
+    def output_schema(self) -> Optional[Dict[str, Any]]:
+        """JSON Schema for the tool result, when the response type is known"""
+        if not self.response_type:
+            return None
+        return {
+            "type": map_type_to_json_schema(self.response_type),
+            "description": f"Response from {self.method} {self.path}",
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "method": self.method,
+            "path": self.path,
+            "description": self.description,
+            "parameters": [p.to_dict() for p in self.parameters],
+            "body_schema": self.body_schema,
+            "body_required": self.body_required,
+            "response_type": self.response_type,
+            "tags": self.tags,
+            "source": self.source,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ToolSpec":
+        return cls(
+            name=data["name"],
+            method=data["method"],
+            path=data["path"],
+            description=data.get("description", ""),
+            parameters=[ToolParameter.from_dict(p) for p in data.get("parameters", [])],
+            body_schema=data.get("body_schema"),
+            body_required=data.get("body_required", False),
+            response_type=data.get("response_type"),
+            tags=data.get("tags", []),
+            source=data.get("source"),
+        )
+
+def build_tool_spec(endpoint: Any, models: Optional[Dict[str, Dict[str, Any]]] = None) -> ToolSpec:
+    """Normalize one scanned FastAPI endpoint into a ToolSpec"""
+    models = models or {}
+    method = endpoint.method.upper()
+    placeholders = path_placeholders(endpoint.path)
+
+    parameters = []
+    body_schema = endpoint.request_body
+    body_required = False
+
+    for param in endpoint.parameters:
+        name = param["name"]
+        raw_type = param.get("type", "string")
+        json_type = map_type_to_json_schema(raw_type)
+        location = param.get("location", "query")
+
+        # The scanner defaults every argument to "path"; only real placeholders are
+        if name in placeholders:
+            location = "path"
+        elif location not in ("query", "body"):
+            location = "body" if json_type in ("object", "array") and method in BODY_METHODS else "query"
+
+        if location == "body":
+            if raw_type in models and not body_schema:
+                body_schema = _normalize_model_schema(models[raw_type])
+            body_required = body_required or param.get("required", True)
+            continue
+
+        if json_type == "object" and str(raw_type).lower() not in TYPE_MAPPING:
+            # A class in a path or query string is an Enum or another str-like type, not a model
+            json_type = "string"
+
+        parameters.append(ToolParameter(
+            name=name,
+            location=location,
+            type=json_type,
+            # Path parameters are always required by the router
+            required=True if location == "path" else param.get("required", True),
+            description=param.get("description", ""),
+        ))
+
+    source = f"{method} {endpoint.path}"
+    file_path = getattr(endpoint, 'file_path', None)
+    if file_path:
+        line_number = getattr(endpoint, 'line_number', None)
+        source += f" ({file_path}:{line_number})" if line_number else f" ({file_path})"
+
+    return ToolSpec(
+        name=generate_tool_name(method, endpoint.path),
+        method=method,
+        path=endpoint.path,
+        description=(endpoint.description or "").strip(),
+        parameters=parameters,
+        body_schema=_normalize_model_schema(body_schema) if body_schema else None,
+        body_required=body_required,
+        response_type=endpoint.response_type,
+        tags=list(getattr(endpoint, 'tags', []) or []),
+        source=source,
+    )
+
+def build_tool_specs(endpoints: Iterable[Any], models: Optional[Dict[str, Dict[str, Any]]] = None) -> List[ToolSpec]:
+    """Normalize scanned FastAPI endpoints into ToolSpecs"""
+    return [build_tool_spec(endpoint, models) for endpoint in endpoints]
+
+def filter_specs(specs: Iterable[ToolSpec], include: Optional[List[str]] = None,
+                 tags: Optional[List[str]] = None) -> List[ToolSpec]:
+    """Keep specs whose name or path matches an include glob and that carry one of the tags"""
+    selected = []
+    for spec in specs:
+        if include and not any(fnmatchcase(spec.name, p) or fnmatchcase(spec.path, p) for p in include):
+            continue
+        if tags and not set(tags) & set(spec.tags):
+            continue
+        selected.append(spec)
+    return selected
+
+def _normalize_model_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Map the raw annotation names the scanner records for model fields to JSON Schema types"""
+    normalized = dict(schema)
+    if "properties" in schema:
+        normalized["properties"] = {
+            name: dict(prop, type=map_type_to_json_schema(prop.get("type")))
+            for name, prop in schema["properties"].items()
+        }
+    if "type" in normalized:
+        normalized["type"] = map_type_to_json_schema(normalized["type"])
+    return normalized
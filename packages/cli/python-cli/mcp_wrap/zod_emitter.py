@@ -0,0 +1,275 @@
+"""
+Zod Emitter - Convert JSON Schemas into deduplicated Zod schema source
+
+Schemas are converted recursively and memoized by content. Sub-schemas that
+occur more than once across the whole tool catalog, and every $ref/$defs
+target, are hoisted into shared `const` declarations so the generated
+TypeScript bundle defines each of them exactly once.
+"""
+
+import json
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Keywords that only annotate a schema and are applied at the use site
+_ANNOTATIONS = ("description", "title", "examples")
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_$][A-Za-z0-9_$]*$")
+
+class ZodSchemaEmitter:
+    """Emit Zod source for many JSON Schemas, sharing repeated sub-schemas"""
+
+    def __init__(self):
+        self.declarations: List[str] = []
+        self._counts: Counter = Counter()
+        self._memo: Dict[str, str] = {}
+        self._names: Dict[str, str] = {}
+        self._used_names: Set[str] = set()
+        self._in_progress: Set[str] = set()
+        self._recursive: Set[str] = set()
+
+    def register(self, schema: Dict[str, Any]):
+        """Count the sub-schemas of a tool schema; call for every tool before emitting"""
+        self._count(schema, schema)
+        for definition in _definitions(schema).values():
+            self._count(definition, schema)
+
+    def shape(self, schema: Dict[str, Any]) -> str:
+        """Zod raw shape ({ name: z.string(), ... }) for the properties of a tool's input schema"""
+        root = schema or {}
+        target = (self._resolve(root["$ref"], root) or {}) if "$ref" in root else root
+        return self._object_body(target.get("properties") or {}, target.get("required", []), root)
+
+    def expression(self, schema: Any, root: Dict[str, Any]) -> str:
+        """Zod expression for a (sub-)schema of root"""
+        if not isinstance(schema, dict) or not schema:
+            return "z.any()"
+
+        if "$ref" in schema:
+            expr = self._reference(schema["$ref"], root)
+        else:
+            key = _key(schema, root)
+            if key in self._names:
+                expr = self._names[key]
+            elif key in self._memo:
+                expr = self._memo[key]
+            else:
+                expr = self._convert(schema, root)
+                if key in self._names:
+                    # Declared meanwhile, by a recursive definition converted inside this schema
+                    expr = self._names[key]
+                elif self._counts[key] > 1 and _is_composite(schema):
+                    expr = self._declare(key, "sharedSchema", expr)
+                else:
+                    self._memo[key] = expr
+
+        if schema.get("description"):
+            expr += f".describe({json.dumps(schema['description'])})"
+        return expr
+
+    def render_declarations(self) -> str:
+        """Shared `const` declarations, in dependency order"""
+        return '\n'.join(self.declarations)
+
+    def _count(self, schema: Any, root: Dict[str, Any]):
+        if not isinstance(schema, dict) or "$ref" in schema:
+            return
+        self._counts[_key(schema, root)] += 1
+        for child in _children(schema):
+            self._count(child, root)
+
+    def _reference(self, ref: str, root: Dict[str, Any]) -> str:
+        target = self._resolve(ref, root)
+        if target is None:
+            return "z.any()"
+
+        key = _key(target, root)
+        if key in self._in_progress:
+            # Self-referential definition: defer evaluation until the const exists
+            name = self._names[key]
+            self._recursive.add(name)
+            return f"z.lazy(() => {name})"
+        if key in self._names:
+            return self._names[key]
+
+        name = self._reserve(_identifier(ref.rsplit('/', 1)[-1]) + "Schema")
+        self._names[key] = name
+        self._in_progress.add(key)
+        expr = self._convert(target, root)
+        self._in_progress.discard(key)
+        if target.get("description"):
+            expr += f".describe({json.dumps(target['description'])})"
+        self._append(name, expr)
+        return name
+
+    def _resolve(self, ref: str, root: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Resolve a local #/$defs/Name or #/definitions/Name reference"""
+        return _resolve(ref, root)
+
+    def _declare(self, key: str, hint: str, expr: str) -> str:
+        name = self._reserve(hint)
+        self._names[key] = name
+        self._append(name, expr)
+        return name
+
+    def _reserve(self, hint: str) -> str:
+        name, counter = hint, 1
+        while name in self._used_names:
+            counter += 1
+            name = f"{hint}{counter}"
+        self._used_names.add(name)
+        return name
+
+    def _append(self, name: str, expr: str):
+        annotation = ": z.ZodTypeAny" if name in self._recursive else ""
+        self.declarations.append(f"const {name}{annotation} = {expr};")
+
+    def _convert(self, schema: Dict[str, Any], root: Dict[str, Any]) -> str:
+        """Zod expression for schema, ignoring its annotations"""
+        for combinator in ("anyOf", "oneOf"):
+            if schema.get(combinator):
+                return _union([self.expression(s, root) for s in schema[combinator]])
+        if schema.get("allOf"):
+            parts = [self.expression(s, root) for s in schema["allOf"]]
+            expr = parts[0]
+            for part in parts[1:]:
+                expr = f"z.intersection({expr}, {part})"
+            return expr
+
+        if "const" in schema:
+            return f"z.literal({json.dumps(schema['const'])})"
+        if "enum" in schema:
+            values = schema["enum"]
+            if values and all(isinstance(v, str) for v in values):
+                return f"z.enum([{', '.join(json.dumps(v) for v in values)}])"
+            return _union([f"z.literal({json.dumps(v)})" for v in values])
+
+        schema_type = schema.get("type")
+        if schema_type is None:
+            schema_type = "object" if "properties" in schema else "array" if "items" in schema else None
+        if isinstance(schema_type, list):
+            types = [t for t in schema_type if t != "null"]
+            expr = _union([self._typed(schema, t, root) for t in types]) if types else "z.null()"
+            return expr + ".nullable()" if types and "null" in schema_type else expr
+        return self._typed(schema, schema_type, root)
+
+    def _typed(self, schema: Dict[str, Any], schema_type: Optional[str], root: Dict[str, Any]) -> str:
+        if schema_type == "string":
+            expr = "z.string()"
+            if "minLength" in schema:
+                expr += f".min({schema['minLength']})"
+            if "maxLength" in schema:
+                expr += f".max({schema['maxLength']})"
+            if "pattern" in schema:
+                expr += f".regex(new RegExp({json.dumps(schema['pattern'])}))"
+            return expr
+        if schema_type in ("integer", "number"):
+            expr = "z.number().int()" if schema_type == "integer" else "z.number()"
+            if "minimum" in schema:
+                expr += f".min({schema['minimum']})"
+            if "maximum" in schema:
+                expr += f".max({schema['maximum']})"
+            return expr
+        if schema_type == "boolean":
+            return "z.boolean()"
+        if schema_type == "null":
+            return "z.null()"
+        if schema_type == "array":
+            items = schema.get("items")
+            expr = f"z.array({self.expression(items, root) if isinstance(items, dict) else 'z.any()'})"
+            if "minItems" in schema:
+                expr += f".min({schema['minItems']})"
+            if "maxItems" in schema:
+                expr += f".max({schema['maxItems']})"
+            return expr
+        if schema_type == "object":
+            properties = schema.get("properties") or {}
+            additional = schema.get("additionalProperties")
+            if properties:
+                expr = f"z.object({self._object_body(properties, schema.get('required', []), root)})"
+                return expr + ".passthrough()" if additional is not False and additional is not None else expr
+            # Free-form objects must keep their keys; z.object({}) would strip them
+            values = self.expression(additional, root) if isinstance(additional, dict) else "z.any()"
+            return f"z.record({values})"
+        return "z.any()"
+
+    def _object_body(self, properties: Dict[str, Any], required: List[str], root: Dict[str, Any]) -> str:
+        if not properties:
+            return "{}"
+        fields = []
+        for name, prop in properties.items():
+            expr = self.expression(prop, root)
+            if name not in required:
+                expr += ".optional()"
+            key = name if _IDENTIFIER.match(name) else json.dumps(name)
+            fields.append(f"{key}: {expr}")
+        return "{ " + ", ".join(fields) + " }"
+
+def _key(schema: Dict[str, Any], root: Dict[str, Any]) -> str:
+    """Canonical content key of a schema of root, without its annotations
+
+    Every $ref is keyed together with the definition it resolves to in root, so
+    the same text referring to different definitions in two tools never shares
+    a declaration.
+    """
+    stripped = {k: v for k, v in schema.items() if k not in _ANNOTATIONS and k not in ("$defs", "definitions")}
+    return json.dumps(_expand_refs(stripped, root, ()), sort_keys=True, default=str)
+
+def _expand_refs(node: Any, root: Dict[str, Any], seen: Tuple[str, ...]) -> Any:
+    """node with each {"$ref"} carrying its resolved target; a reference back into a target stays bare"""
+    if isinstance(node, list):
+        return [_expand_refs(item, root, seen) for item in node]
+    if not isinstance(node, dict):
+        return node
+    expanded = {k: _expand_refs(v, root, seen) for k, v in node.items()}
+    ref = node.get("$ref")
+    if isinstance(ref, str) and ref not in seen:
+        target = _resolve(ref, root)
+        if target is not None:
+            expanded["$target"] = _expand_refs(target, root, seen + (ref,))
+    return expanded
+
+def _resolve(ref: str, root: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if not ref.startswith("#/"):
+        return None
+    node: Any = root
+    for part in ref[2:].split('/'):
+        part = part.replace("~1", "/").replace("~0", "~")
+        if not isinstance(node, dict) or part not in node:
+            return None
+        node = node[part]
+    return node if isinstance(node, dict) else None
+
+def _children(schema: Dict[str, Any]) -> List[Any]:
+    children = list((schema.get("properties") or {}).values())
+    items = schema.get("items")
+    children.extend(items if isinstance(items, list) else [items])
+    children.append(schema.get("additionalProperties"))
+    for combinator in ("anyOf", "oneOf", "allOf"):
+        children.extend(schema.get(combinator) or [])
+    return [c for c in children if isinstance(c, dict)]
+
+def _definitions(schema: Dict[str, Any]) -> Dict[str, Any]:
+    if not isinstance(schema, dict):
+        return {}
+    return dict(schema.get("definitions") or {}, **(schema.get("$defs") or {}))
+
+def _is_composite(schema: Dict[str, Any]) -> bool:
+    """Whether a schema is worth hoisting (anything beyond a bare primitive)"""
+    return bool(
+        schema.get("properties") or schema.get("items") or schema.get("enum")
+        or any(schema.get(c) for c in ("anyOf", "oneOf", "allOf"))
+        or isinstance(schema.get("additionalProperties"), dict)
+    )
+
+def _union(options: List[str]) -> str:
+    if not options:
+        return "z.any()"
+    if len(options) == 1:
+        return options[0]
+    return f"z.union([{', '.join(options)}])"
+
+def _identifier(name: str) -> str:
+    identifier = re.sub(r"[^A-Za-z0-9_$]", "_", name) or "schema"
+    return "_" + identifier if identifier[0].isdigit() else identifier[0].lower() + identifier[1:]
@@ -0,0 +1,56 @@
+import inspect
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+DEMO_APP = ROOT / "demo_fastapi"
+
+# Import mcp_wrap from this checkout rather than an installed copy
+sys.path.insert(0, str(ROOT))
+
+@pytest.fixture(scope="session")
+def demo_specs():
+    """ToolSpecs of the demo FastAPI app"""
+    from mcp_wrap.fastapi_scanner import FastAPIScanner
+    scanner = FastAPIScanner()
+    endpoints = scanner.scan_fastapi_app(str(DEMO_APP))
+    return scanner.build_tool_specs(endpoints)
+
+class StubUpstream:
+    """httpx transport answering from handler(request) and counting the requests it got"""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, request):
+        self.requests.append(request)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            response = self.handler(request)
+            if inspect.isawaitable(response):
+                response = await response
+            return response
+        finally:
+            self.in_flight -= 1
+
+@pytest.fixture
+def stub_runtime():
+    """ToolRuntime factory whose shared client talks to a StubUpstream"""
+    import httpx
+    from mcp_wrap.runtime.config import DEFAULT_CONFIG, merge_config
+    from mcp_wrap.runtime.executor import ToolRuntime
+
+    def make(handler, **sections):
+        upstream = StubUpstream(handler)
+        runtime = ToolRuntime(merge_config(DEFAULT_CONFIG, sections))
+        runtime._app_loaded = True
+        runtime._client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+        return runtime, upstream
+
+    return make
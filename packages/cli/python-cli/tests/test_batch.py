@@ -0,0 +1,26 @@
+import json
+
+from mcp_wrap.runtime.batch import ToolError, run_batch
+
+async def call(tool, arguments):
+    if tool == "plain":
+        return "pong"
+    if tool == "json":
+        return json.dumps({"id": arguments.get("id")})
+    if tool == "reported":
+        return json.dumps({"error": "not found"})
+    raise ToolError(f"HTTP Error 404: no {tool}")
+
+async def batch(*items):
+    return json.loads(await run_batch(list(items), call, 4, 10))["results"]
+
+async def test_plain_text_results_are_ok():
+    [result] = await batch({"tool": "plain"})
+    assert result == {"index": 0, "tool": "plain", "ok": True, "result": "pong"}
+
+async def test_only_explicit_errors_fail():
+    results = await batch({"tool": "json", "arguments": {"id": 7}}, {"tool": "reported"}, {"tool": "missing"})
+    assert [r["ok"] for r in results] == [True, False, False]
+    assert results[0]["result"] == {"id": 7}
+    assert results[1]["error"] == "not found"
+    assert results[2]["error"] == "HTTP Error 404: no missing"
@@ -0,0 +1,144 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from mcp_wrap.runtime import cache as cache_module
+
+BASE = "http://upstream"
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=fake.monotonic))
+    return fake
+
+def make(stub_runtime, handler, **cache):
+    return stub_runtime(handler, retry={"enabled": False}, cache={"enabled": True, "ttl": 30.0, **cache})
+
+def versioned(headers=None):
+    """Upstream whose body counts the requests it answered"""
+    served = []
+
+    def handler(request):
+        served.append(request)
+        return httpx.Response(200, json={"version": len(served)}, headers=headers or {})
+    return handler
+
+async def get(runtime, path, **kwargs):
+    return await runtime.request("getUsers", "GET", BASE + path, **kwargs)
+
+async def test_repeated_read_is_served_from_cache(stub_runtime, clock):
+    runtime, upstream = make(stub_runtime, versioned())
+    first = await get(runtime, "/users", params={"limit": 2})
+    second = await get(runtime, "/users", params={"limit": 2})
+    other = await get(runtime, "/users", params={"limit": 3})
+    assert first.json() == second.json() == {"version": 1}
+    assert other.json() == {"version": 2}
+    assert len(upstream.requests) == 2
+    stats = runtime.cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+    assert stats["tools"]["getUsers"] == {"hits": 1, "misses": 2}
+
+async def test_entries_expire_after_ttl(stub_runtime, clock):
+    runtime, upstream = make(stub_runtime, versioned(), ttl=10.0)
+    await get(runtime, "/users")
+    clock.now += 9.0
+    assert (await get(runtime, "/users")).json() == {"version": 1}
+    clock.now += 2.0
+    assert (await get(runtime, "/users")).json() == {"version": 2}
+
+async def test_cache_control_max_age_overrides_ttl(stub_runtime, clock):
+    runtime, upstream = make(stub_runtime, versioned({"Cache-Control": "public, max-age=5"}))
+    await get(runtime, "/users")
+    clock.now += 6.0
+    assert (await get(runtime, "/users")).json() == {"version": 2}
+
+async def test_no_store_is_never_cached(stub_runtime, clock):
+    runtime, upstream = make(stub_runtime, versioned({"Cache-Control": "no-store"}))
+    await get(runtime, "/users")
+    assert (await get(runtime, "/users")).json() == {"version": 2}
+    assert len(runtime.cache) == 0
+
+async def test_errors_are_not_cached(stub_runtime, clock):
+    runtime, upstream = make(stub_runtime, lambda request: httpx.Response(404, json={"detail": "missing"}))
+    await get(runtime, "/users/9")
+    await get(runtime, "/users/9")
+    assert len(upstream.requests) == 2
+
+async def test_stale_entry_is_revalidated_by_etag(stub_runtime, clock):
+    etag = {"current": '"v1"'}
+
+    def handler(request):
+        if request.headers.get("if-none-match") == etag["current"]:
+            return httpx.Response(304, headers={"ETag": etag["current"]})
+        return httpx.Response(200, json={"etag": etag["current"]},
+                              headers={"ETag": etag["current"], "Cache-Control": "no-cache"})
+
+    runtime, upstream = make(stub_runtime, handler)
+    first = await get(runtime, "/users")
+    assert "if-none-match" not in upstream.requests[0].headers
+
+    # no-cache: every read asks the upstream, which answers 304 while the ETag matches
+    revalidated = await get(runtime, "/users")
+    assert upstream.requests[1].headers["if-none-match"] == '"v1"'
+    assert revalidated.status_code == 200
+    assert revalidated.content == first.content
+    assert runtime.cache.stats()["revalidated"] == 1
+
+    # The 304 repeated no Cache-Control, so the stored no-cache still applies
+    await get(runtime, "/users")
+    assert len(upstream.requests) == 3
+    assert runtime.cache.stats()["revalidated"] == 2
+
+    etag["current"] = '"v2"'
+    changed = await get(runtime, "/users")
+    assert changed.json() == {"etag": '"v2"'}
+    assert runtime.cache.stats()["revalidated"] == 2
+
+async def test_revalidation_takes_the_304s_max_age(stub_runtime, clock):
+    def handler(request):
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"', "Cache-Control": "max-age=60"})
+        return httpx.Response(200, json={}, headers={"ETag": '"v1"', "Cache-Control": "max-age=1"})
+
+    runtime, upstream = make(stub_runtime, handler)
+    await get(runtime, "/users")
+    clock.now += 2.0
+    await get(runtime, "/users")
+    clock.now += 30.0
+    await get(runtime, "/users")
+    assert len(upstream.requests) == 2
+
+async def test_mutation_invalidates_its_collection(stub_runtime, clock):
+    def handler(request):
+        if request.method == "PUT":
+            status = 500 if request.url.path.endswith("/7") else 200
+            return httpx.Response(status, json={})
+        return httpx.Response(200, json={"path": request.url.path, "n": len(upstream.requests)})
+
+    runtime, upstream = make(stub_runtime, handler)
+    await get(runtime, "/users", params={"limit": 2})
+    await get(runtime, "/users/5")
+    await get(runtime, "/orders")
+    assert len(runtime.cache) == 3
+
+    # A failed mutation changes nothing
+    await runtime.request("putUser", "PUT", BASE + "/users/7", json={}, route="/users/{user_id}")
+    assert len(runtime.cache) == 3
+
+    await runtime.request("putUser", "PUT", BASE + "/users/5", json={"name": "Ann"}, route="/users/{user_id}")
+    assert len(runtime.cache) == 1
+    assert runtime.cache.stats()["invalidations"] == 2
+
+    requests = len(upstream.requests)
+    await get(runtime, "/users", params={"limit": 2})
+    await get(runtime, "/orders")
+    assert len(upstream.requests) == requests + 1
@@ -0,0 +1,51 @@
+import asyncio
+
+import httpx
+import pytest
+
+URL = "http://upstream/users/1"
+
+async def slow_user(request):
+    await asyncio.sleep(0.05)
+    return httpx.Response(200, json={"id": 1, "path": request.url.path})
+
+async def test_identical_concurrent_calls_share_one_request(stub_runtime):
+    runtime, upstream = stub_runtime(slow_user)
+    responses = await asyncio.gather(*[runtime.request("getUser", "GET", URL) for _ in range(50)])
+    assert len(upstream.requests) == 1
+    assert all(response.json() == {"id": 1, "path": "/users/1"} for response in responses)
+    assert runtime.stats()["coalesce"]["coalesced"] == 49
+
+async def test_different_arguments_are_not_coalesced(stub_runtime):
+    runtime, upstream = stub_runtime(slow_user)
+    await asyncio.gather(*[runtime.request("getUser", "GET", URL, params={"page": n % 5}) for n in range(20)])
+    assert len(upstream.requests) == 5
+
+async def test_mutations_are_not_coalesced(stub_runtime):
+    runtime, upstream = stub_runtime(slow_user)
+    await asyncio.gather(*[runtime.request("postUser", "POST", URL, json={"name": "a"}) for _ in range(5)])
+    assert len(upstream.requests) == 5
+
+async def test_every_waiter_gets_the_error(stub_runtime):
+    async def broken(request):
+        await asyncio.sleep(0.05)
+        raise httpx.ConnectError("refused", request=request)
+
+    runtime, upstream = stub_runtime(broken, retry={"enabled": False}, breaker={"enabled": False})
+    results = await asyncio.gather(*[runtime.request("getUser", "GET", URL) for _ in range(5)],
+                                   return_exceptions=True)
+    assert len(upstream.requests) == 1
+    assert all(isinstance(result, httpx.ConnectError) for result in results)
+
+async def test_follower_survives_leader_cancellation(stub_runtime):
+    runtime, upstream = stub_runtime(slow_user)
+    leader = asyncio.create_task(runtime.request("getUser", "GET", URL))
+    await asyncio.sleep(0.01)
+    follower = asyncio.create_task(runtime.request("getUser", "GET", URL))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    response = await follower
+    assert response.status_code == 200
+    assert len(upstream.requests) == 1
+    with pytest.raises(asyncio.CancelledError):
+        await leader
@@ -0,0 +1,78 @@
+"""
+Startup budget of generated servers over stdio (serve.fast_start)
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from mcp_wrap.backends import render_targets
+
+pytest.importorskip("mcp")
+
+# Packages the cold path must not import; the preload thread imports them later
+HEAVY = ("mcp", "httpx", "anyio", "pydantic")
+# Cumulative import time of the cold-start module (about 10 ms)
+IMPORT_BUDGET_US = 100_000
+
+@pytest.fixture(scope="module", params=["lowlevel", "fastmcp"])
+def server_dir(request, demo_specs, tmp_path_factory):
+    out_dir = tmp_path_factory.mktemp(request.param)
+    render_targets(demo_specs, [request.param], str(out_dir))
+    assert (out_dir / "manifest.json").is_file()
+    return out_dir
+
+def test_coldstart_imports_stay_within_budget(server_dir):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import mcp_runtime.coldstart"],
+                            cwd=server_dir, capture_output=True, text=True, check=True)
+    imports = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            imports[name.strip()] = int(cumulative)
+    heavy = [name for name in imports if name.split(".")[0] in HEAVY]
+    assert not heavy
+    assert imports["mcp_runtime.coldstart"] < IMPORT_BUDGET_US
+
+# Runs server.py as __main__ with the SDK and HTTP stack made unimportable
+BLOCKED_SERVER = """
+import runpy, sys
+
+class Blocked:
+    def find_spec(self, name, path=None, target=None):
+        if name.split(".")[0] in HEAVY:
+            raise ImportError("blocked: " + name)
+
+sys.meta_path.insert(0, Blocked())
+runpy.run_path("server.py", run_name="__main__")
+"""
+
+def rpc(request_id, method, params=None):
+    message = {"jsonrpc": "2.0", "method": method, "params": params or {}}
+    if request_id is not None:
+        message["id"] = request_id
+    return (json.dumps(message) + "\n").encode()
+
+def test_tools_list_is_answered_without_the_sdk(server_dir, demo_specs):
+    """initialize and tools/list come from manifest.json, before mcp or httpx could be needed"""
+    messages = b"".join([
+        rpc(1, "initialize", {
+            "protocolVersion": "2025-06-18", "capabilities": {},
+            "clientInfo": {"name": "startup-check", "version": "1.0"},
+        }),
+        rpc(None, "notifications/initialized"),
+        rpc(2, "tools/list"),
+    ])
+    code = f"HEAVY = {HEAVY!r}\n" + BLOCKED_SERVER
+    # Closing stdin after tools/list ends the server before anything is handed to the SDK
+    result = subprocess.run([sys.executable, "-c", code], cwd=server_dir, input=messages,
+                            capture_output=True, timeout=60)
+    assert result.returncode == 0, result.stderr.decode()
+    responses = {message["id"]: message for message in map(json.loads, result.stdout.splitlines())}
+
+    assert responses[1]["result"]["serverInfo"]["name"]
+    names = {tool["name"] for tool in responses[2]["result"]["tools"]}
+    assert {spec.name for spec in demo_specs} <= names
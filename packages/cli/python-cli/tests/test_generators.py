@@ -0,0 +1,46 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from mcp_wrap.backends import render_targets
+
+pytest.importorskip("mcp")
+
+@pytest.mark.parametrize("target", ["lowlevel", "fastmcp"])
+def test_generator_writes_every_file(demo_specs, tmp_path, target):
+    render_targets(demo_specs, [target], str(tmp_path))
+    for name in ("server.py", "runtime.json", "requirements.txt", "README.md"):
+        assert (tmp_path / name).is_file(), name
+    assert "batch_call" in (tmp_path / "README.md").read_text()
+
+def test_lowlevel_tool_errors_are_reported_as_errors(demo_specs, tmp_path):
+    render_targets(demo_specs, ["lowlevel"], str(tmp_path))
+    runtime_json = tmp_path / "runtime.json"
+    config = json.loads(runtime_json.read_text())
+    # Nothing listens on port 9; no retries so the call fails at once
+    config["upstream"]["url"] = "http://127.0.0.1:9"
+    config["retry"] = {"enabled": False}
+    runtime_json.write_text(json.dumps(config))
+
+    script = """
+import asyncio, json
+import mcp.types as types
+import server
+
+async def main():
+    async with server.runtime:
+        handler = server.server.request_handlers[types.CallToolRequest]
+        params = types.CallToolRequestParams(name="getUsersByUser_id", arguments={"user_id": 1})
+        result = (await handler(types.CallToolRequest(method="tools/call", params=params))).root
+        batch = json.loads(await server.tool_batch_call({"items": [{"tool": "getUsersByUser_id", "arguments": {"user_id": 1}}]}))
+        print(json.dumps({"is_error": result.isError, "text": result.content[0].text, "batch": batch["results"][0]}))
+
+asyncio.run(main())
+"""
+    output = subprocess.run([sys.executable, "-c", script], cwd=tmp_path, capture_output=True, text=True, check=True)
+    report = json.loads(output.stdout.strip().splitlines()[-1])
+    assert report["is_error"] is True
+    assert report["text"].startswith("Error calling GET /users/{user_id}:")
+    assert report["batch"]["ok"] is False
@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from mcp_wrap.runtime.limiter import AdaptiveLimiter, UpstreamOverloaded
+
+URL = "http://upstream/items"
+
+def congested(upstream, capacity=8, latency=0.01):
+    """Upstream whose latency grows with the requests it serves beyond capacity"""
+    async def handler(request):
+        await asyncio.sleep(latency * max(1.0, upstream[0].in_flight / capacity))
+        return httpx.Response(200, json={})
+    return handler
+
+def make_congested(stub_runtime, **sections):
+    holder = []
+    runtime, upstream = stub_runtime(congested(holder), coalesce={"enabled": False}, retry={"enabled": False},
+                                     **sections)
+    holder.append(upstream)
+    return runtime, upstream
+
+async def burst(runtime, calls):
+    await asyncio.gather(*[runtime.request("getItems", "GET", URL, params={"n": n}) for n in range(calls)])
+
+async def test_burst_is_capped_and_limit_backs_off(stub_runtime):
+    unlimited, flooded = make_congested(stub_runtime, limiter={"enabled": False})
+    await burst(unlimited, 300)
+    assert flooded.peak == 300
+
+    runtime, upstream = make_congested(stub_runtime)
+    await burst(runtime, 300)
+    stats = runtime.stats()["limiter"]
+    assert len(upstream.requests) == 300
+    # The limit starts at 16 and may grow a little before congestion cuts it
+    assert upstream.peak <= 20
+    assert stats["decreases"] > 0
+    assert stats["in_flight"] == 0 and stats["queue_depth"] == 0
+
+async def test_calls_beyond_the_queue_are_rejected(stub_runtime):
+    runtime, upstream = make_congested(stub_runtime, limiter={"initial_limit": 2, "max_queue": 10})
+    results = await asyncio.gather(*[runtime.request("getItems", "GET", URL, params={"n": n}) for n in range(50)],
+                                   return_exceptions=True)
+    rejected = [r for r in results if isinstance(r, UpstreamOverloaded)]
+    assert len(rejected) == 38
+    assert len(upstream.requests) == 12
+
+async def test_queue_timeout():
+    limiter = AdaptiveLimiter(initial_limit=1)
+    started = await limiter.acquire()
+    with pytest.raises(UpstreamOverloaded):
+        await limiter.acquire(timeout=0.01)
+    assert limiter.stats()["timed_out"] == 1
+    limiter.release(started, True)
+    assert limiter.in_flight == 0
+
+async def test_limit_grows_while_in_use_and_healthy():
+    limiter = AdaptiveLimiter(initial_limit=4, max_limit=8)
+    for _ in range(50):
+        for _ in range(4):
+            await limiter.acquire()
+        for _ in range(4):
+            # A steady 10 ms upstream
+            limiter.release(time.monotonic() - 0.01, True)
+    assert limiter.limit > 4
+    assert limiter.counters["decreases"] == 0
+
+async def test_overload_responses_cut_the_limit():
+    limiter = AdaptiveLimiter(initial_limit=10, backoff=0.5)
+    started = await limiter.acquire()
+    limiter.release(started, False)
+    assert limiter.limit == 5
@@ -0,0 +1,145 @@
+import asyncio
+
+import httpx
+
+URL = "http://upstream/users"
+USERS = [{"id": n} for n in range(230)]
+
+def paginated(**settings):
+    return {"enabled": True, "page_size": 50, **settings}
+
+def make(stub_runtime, handler, **settings):
+    return stub_runtime(handler, retry={"enabled": False}, pagination=paginated(**settings))
+
+def number(request, name, default):
+    return int(request.url.params.get(name, default))
+
+def offset_pages(request):
+    offset, limit = number(request, "offset", 0), number(request, "limit", 50)
+    return httpx.Response(200, json={"items": USERS[offset:offset + limit], "total": len(USERS)})
+
+def numbered_pages(request):
+    page, limit = number(request, "page", 1), number(request, "limit", 50)
+    return httpx.Response(200, json={"items": USERS[(page - 1) * limit:page * limit]})
+
+def cursor_pages(request):
+    start = number(request, "cursor", 0)
+    end = start + 50
+    return httpx.Response(200, json={"items": USERS[start:end], "next_cursor": str(end) if end < len(USERS) else None})
+
+def linked_pages(request):
+    start = number(request, "from", 0)
+    end = start + 50
+    headers = {"Link": f'</users?from={end}>; rel="next"'} if end < len(USERS) else {}
+    return httpx.Response(200, json=USERS[start:end], headers=headers)
+
+async def get(runtime, params=None):
+    response = await runtime.request("getUsers", "GET", URL, params=params)
+    return response.json()
+
+async def test_offset_pages_are_followed(stub_runtime):
+    runtime, upstream = make(stub_runtime, offset_pages)
+    body = await get(runtime, {"offset": 0, "limit": 50})
+    assert body["items"] == USERS
+    assert body["total"] == 230
+    assert body["_pagination"] == {"pages": 5, "items": 230, "complete": True}
+    assert sorted(number(r, "offset", 0) for r in upstream.requests)[:5] == [0, 50, 100, 150, 200]
+
+async def test_page_numbers_are_followed(stub_runtime):
+    runtime, upstream = make(stub_runtime, numbered_pages, mode="page")
+    body = await get(runtime)
+    assert body["items"] == USERS
+    assert body["_pagination"]["complete"] is True
+    assert number(upstream.requests[0], "page", 0) == 1 and number(upstream.requests[0], "limit", 0) == 50
+
+async def test_cursors_are_followed(stub_runtime):
+    runtime, upstream = make(stub_runtime, cursor_pages)
+    body = await get(runtime)
+    assert body["items"] == USERS
+    assert body["_pagination"] == {"pages": 5, "items": 230, "complete": True}
+    assert [r.url.params.get("cursor") for r in upstream.requests] == [None, "50", "100", "150", "200"]
+
+async def test_link_headers_are_followed(stub_runtime):
+    runtime, upstream = make(stub_runtime, linked_pages)
+    body = await get(runtime)
+    # A bare list body stays a list
+    assert body == USERS
+    assert [str(r.url) for r in upstream.requests[:2]] == [URL, URL + "?from=50"]
+    assert len(upstream.requests) == 5
+
+async def test_max_items_stops_early(stub_runtime):
+    runtime, upstream = make(stub_runtime, cursor_pages, max_items=120)
+    body = await get(runtime)
+    assert body["items"] == USERS[:120]
+    assert body["_pagination"] == {"pages": 3, "items": 120, "complete": False, "stopped": "max_items"}
+    assert len(upstream.requests) == 3
+
+async def test_max_bytes_stops_early(stub_runtime):
+    page_bytes = len(cursor_pages(httpx.Request("GET", URL)).content)
+    runtime, upstream = make(stub_runtime, cursor_pages, max_bytes=int(page_bytes * 2.5))
+    body = await get(runtime)
+    assert body["_pagination"]["stopped"] == "max_bytes"
+    assert body["items"] == USERS[:100]
+
+async def test_failed_page_keeps_collected_items(stub_runtime):
+    def failing(request):
+        if number(request, "offset", 0) >= 100:
+            return httpx.Response(500, json={"detail": "boom"})
+        return offset_pages(request)
+
+    runtime, upstream = make(stub_runtime, failing, prefetch=1)
+    body = await get(runtime, {"offset": 0, "limit": 50})
+    assert body["items"] == USERS[:100]
+    assert body["_pagination"] == {"pages": 2, "items": 100, "complete": False,
+                                   "stopped": "page 3 failed with HTTP 500"}
+
+async def test_raising_page_keeps_collected_items(stub_runtime):
+    def failing(request):
+        if request.url.params.get("cursor") == "100":
+            raise httpx.ConnectError("connection refused", request=request)
+        return cursor_pages(request)
+
+    runtime, upstream = make(stub_runtime, failing)
+    body = await get(runtime)
+    assert body["items"] == USERS[:100]
+    assert body["_pagination"]["stopped"].startswith("page 3 failed: ")
+
+async def test_first_page_error_is_returned_as_is(stub_runtime):
+    runtime, upstream = make(stub_runtime, lambda request: httpx.Response(404, json={"detail": "missing"}))
+    response = await runtime.request("getUsers", "GET", URL)
+    assert response.status_code == 404
+    assert response.json() == {"detail": "missing"}
+
+async def test_leftover_prefetches_are_cancelled(stub_runtime):
+    cancelled = []
+
+    async def slow_later_pages(request):
+        offset = number(request, "offset", 0)
+        try:
+            # Later pages take longer, so some are still in flight when the budget is spent
+            await asyncio.sleep(offset / 5000)
+        except asyncio.CancelledError:
+            cancelled.append(offset)
+            raise
+        return offset_pages(request)
+
+    runtime, upstream = make(stub_runtime, slow_later_pages, prefetch=4, max_items=100)
+    body = await get(runtime, {"offset": 0, "limit": 50})
+    assert body["_pagination"] == {"pages": 2, "items": 100, "complete": False, "stopped": "max_items"}
+    assert sorted(cancelled) == [100, 150, 200]
+    assert upstream.in_flight == 0
+
+async def test_prefetch_overlaps_offset_pages(stub_runtime):
+    async def delayed(request):
+        await asyncio.sleep(0.03)
+        return offset_pages(request)
+
+    runtime, upstream = make(stub_runtime, delayed, prefetch=4)
+    await get(runtime, {"offset": 0, "limit": 50})
+    assert upstream.peak == 4
+
+async def test_only_get_is_paginated(stub_runtime):
+    runtime, upstream = make(stub_runtime, cursor_pages)
+    response = await runtime.request("getUsers", "POST", URL, json={})
+    assert "_pagination" not in response.json()
+    assert len(upstream.requests) == 1
@@ -0,0 +1,70 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from mcp_wrap.manifest import write_manifest
+from mcp_wrap.mcp_generator import MCPGenerator
+from mcp_wrap.precompile import GeneratedCodeError, SourceMap, precompile_outputs
+
+HEADER = "import json\n\n"
+CHUNKS = [
+    ("GET /users", "def get_users():\n    return []\n\n"),
+    ("GET /users/{user_id}", "def get_user(user_id):\n    return {'id': user_id\n\n"),
+    ("POST /users", "def create_user(user):\n    return user\n"),
+]
+
+def write_module(tmp_path, chunks):
+    content = HEADER + "".join(chunk for _, chunk in chunks)
+    (tmp_path / "server.py").write_text(content)
+    return SourceMap.from_chunks(content, chunks)
+
+def test_source_map_locates_each_chunk():
+    source_map = SourceMap.from_chunks(HEADER + "".join(c for _, c in CHUNKS), CHUNKS)
+    assert source_map.spans[0][:2] == (3, 6)
+    assert source_map.lookup(1) is None
+    assert source_map.lookup(4) == "GET /users"
+    assert source_map.lookup(7) == "GET /users/{user_id}"
+    assert source_map.lookup(None) is None
+
+def test_syntax_error_names_its_endpoint(tmp_path):
+    source_map = write_module(tmp_path, CHUNKS)
+    errors = precompile_outputs(tmp_path, {"server.py": source_map})
+    assert len(errors) == 1
+    assert errors[0].startswith("server.py:")
+    assert errors[0].endswith("(generated from GET /users/{user_id})")
+
+def test_bytecode_is_cached_for_both_optimization_levels(tmp_path):
+    good = [CHUNKS[0], CHUNKS[2]]
+    write_module(tmp_path, good)
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "helpers.py").write_text("VALUE = 1\n")
+    assert precompile_outputs(tmp_path) == []
+    for module in (tmp_path / "server.py", tmp_path / "pkg" / "helpers.py"):
+        for level in ("", 1):
+            assert Path(importlib.util.cache_from_source(str(module), optimization=level)).is_file()
+
+def test_generation_fails_on_code_that_does_not_compile(demo_specs, tmp_path, monkeypatch):
+    broken = demo_specs[0]
+    replace = MCPGenerator._generate_path_parameter_replacement
+
+    def replacement(self, spec):
+        return "        url = (" if spec is broken else replace(self, spec)
+
+    monkeypatch.setattr(MCPGenerator, "_generate_path_parameter_replacement", replacement)
+    with pytest.raises(GeneratedCodeError) as raised:
+        MCPGenerator().generate_from_specs(demo_specs, str(tmp_path))
+    label = broken.source or f"{broken.method} {broken.path}"
+    assert raised.value.errors[0].endswith(f"(generated from {label})")
+    assert str(raised.value).startswith("Generated code does not compile: server.py:")
+    assert not (tmp_path / "manifest.json").exists()
+
+def test_cli_generate_propagates_compile_errors(demo_specs, tmp_path, monkeypatch):
+    pytest.importorskip("questionary")
+    from mcp_wrap.main import MCPWrapCLI
+
+    manifest = tmp_path / "endpoints.json"
+    write_manifest(demo_specs, str(manifest))
+    monkeypatch.setattr(MCPGenerator, "_generate_path_parameter_replacement", lambda self, spec: "        url = (")
+    with pytest.raises(GeneratedCodeError):
+        MCPWrapCLI().generate(str(manifest), str(tmp_path / "out"), targets=["fastmcp"])
@@ -0,0 +1,89 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_wrap.runtime import ratelimit
+from mcp_wrap.runtime.ratelimit import RateLimited, RateLimiter, TokenBucket
+
+class FakeClock:
+    """monotonic() for the rate limiter; sleep() records the wait and, if advancing, moves time on"""
+
+    def __init__(self, advance=True):
+        self.now = 100.0
+        self.advance = advance
+        self.due = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.due.append(self.now + seconds)
+        if self.advance:
+            self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    def install(advance=True):
+        fake = FakeClock(advance)
+        monkeypatch.setattr(ratelimit, "time", SimpleNamespace(monotonic=fake.monotonic))
+        monkeypatch.setattr(ratelimit, "asyncio", SimpleNamespace(sleep=fake.sleep, CancelledError=asyncio.CancelledError))
+        return fake
+    return install
+
+def test_burst_allows_exactly_burst_immediate_tokens():
+    bucket = TokenBucket("global", rate=10, burst=5)
+    now = bucket.updated
+    assert [bucket.reserve(now) for _ in range(5)] == [0.0] * 5
+    assert bucket.reserve(now) == pytest.approx(0.1)
+
+def test_bucket_refills_at_rate_up_to_burst():
+    bucket = TokenBucket("global", rate=10, burst=5)
+    now = bucket.updated
+    for _ in range(5):
+        bucket.reserve(now)
+    # Half a second refills five tokens; an idle minute does not bank more than burst
+    assert [bucket.reserve(now + 0.5) for _ in range(5)] == [0.0] * 5
+    assert bucket.reserve(now + 0.5) > 0.0
+    later = now + 60.0
+    assert [bucket.reserve(later) for _ in range(5)] == [0.0] * 5
+    assert bucket.reserve(later) == pytest.approx(0.1)
+
+async def test_sustained_rate_matches_configured_rate(clock):
+    fake = clock()
+    limiter = RateLimiter({"global": {"rate": 20, "burst": 1}})
+    buckets = limiter.buckets_for("getItems", "GET", "/items", {})
+    start = fake.now
+    for _ in range(101):
+        await limiter.acquire(buckets, reject=False, max_wait=60.0)
+    # The first token is in the burst, the next hundred come at 20 per second
+    assert fake.now - start == pytest.approx(5.0)
+    assert limiter.counters["delayed"] == 100
+
+async def test_concurrent_calls_are_spaced_at_the_rate(clock):
+    fake = clock(advance=False)
+    limiter = RateLimiter({"global": {"rate": 10, "burst": 3}})
+    buckets = limiter.buckets_for("getItems", "GET", "/items", {})
+    await asyncio.gather(*[limiter.acquire(buckets, reject=False, max_wait=60.0) for _ in range(13)])
+    # Three go at once, the other ten are due 0.1 s apart in arrival order
+    assert len(fake.due) == 10
+    assert [round(due - fake.now, 6) for due in fake.due] == [round(0.1 * n, 6) for n in range(1, 11)]
+
+async def test_reject_mode_refunds_the_token(clock):
+    clock()
+    limiter = RateLimiter({"global": {"rate": 1, "burst": 2}})
+    buckets = limiter.buckets_for("getItems", "GET", "/items", {})
+    await limiter.acquire(buckets, reject=True, max_wait=60.0)
+    await limiter.acquire(buckets, reject=True, max_wait=60.0)
+    with pytest.raises(RateLimited):
+        await limiter.acquire(buckets, reject=True, max_wait=60.0)
+    assert limiter.global_bucket.tokens == pytest.approx(0.0)
+    assert limiter.counters["rejected"] == 1
+
+async def test_wait_beyond_max_wait_is_rejected(clock):
+    clock()
+    limiter = RateLimiter({"global": {"rate": 1, "burst": 1}})
+    buckets = limiter.buckets_for("getItems", "GET", "/items", {})
+    await limiter.acquire(buckets, reject=False, max_wait=0.5)
+    with pytest.raises(RateLimited):
+        await limiter.acquire(buckets, reject=False, max_wait=0.5)
@@ -0,0 +1,56 @@
+"""
+Hot reload: off by default, and swaps in a re-imported registry when asked
+"""
+
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from mcp_wrap.runtime.config import load_config
+from mcp_wrap.runtime.reload import Reloader, load_module
+
+SERVER = '''
+from mcp.server.lowlevel import Server
+from mcp_wrap.runtime.reload import ToolRegistry
+
+server = Server("reload-test")
+TOOL = {tool!r}
+
+@server.list_tools()
+async def list_tools():
+    return []
+
+@server.call_tool()
+async def call_tool(name, arguments):
+    return []
+
+REGISTRY = ToolRegistry(server, __file__)
+'''
+
+def test_reload_is_off_by_default():
+    assert load_config()["reload"]["enabled"] is False
+
+async def test_reload_swaps_in_the_new_registry(tmp_path):
+    source = tmp_path / "server.py"
+    source.write_text(SERVER.format(tool="old"))
+    first = load_module(source, "server__v1")
+    try:
+        runtime = SimpleNamespace(registry=first.REGISTRY, sessions=set())
+        reloader = Reloader(runtime, [source], drain_timeout=1.0)
+
+        source.write_text(SERVER.format(tool="new"))
+        assert await reloader.reload()
+        assert runtime.registry.version == 2
+        assert sys.modules[runtime.registry.module_name].TOOL == "new"
+
+        source.write_text("raise RuntimeError('broken')")
+        assert not await reloader.reload()
+        assert runtime.registry.version == 2
+        assert reloader.stats()["failures"] == 1
+        await reloader.aclose()
+    finally:
+        for name in ("server__v1", "server__v2"):
+            sys.modules.pop(name, None)
@@ -0,0 +1,107 @@
+import asyncio
+
+import httpx
+import pytest
+
+from mcp_wrap.runtime.breaker import CLOSED, HALF_OPEN, OPEN, UpstreamUnavailable
+
+URL = "http://upstream/users/1"
+
+# Fast backoff, and no coalescing so every call is its own upstream request
+FAST = {"retry": {"backoff": 0.001, "max_backoff": 0.01}, "coalesce": {"enabled": False}}
+
+def flaky(failures, status=503):
+    """Upstream answering status to the first failures requests, then 200"""
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        if len(seen) <= failures:
+            return httpx.Response(status)
+        return httpx.Response(200, json={"id": 1})
+    return handler
+
+async def test_get_is_retried_until_it_succeeds(stub_runtime):
+    runtime, upstream = stub_runtime(flaky(2), **FAST)
+    response = await runtime.request("getUser", "GET", URL)
+    assert response.status_code == 200
+    assert len(upstream.requests) == 3
+    assert runtime.stats()["retries"] == 2
+
+async def test_post_is_not_retried(stub_runtime):
+    runtime, upstream = stub_runtime(flaky(2), **FAST)
+    response = await runtime.request("postUser", "POST", URL, json={})
+    assert response.status_code == 503
+    assert len(upstream.requests) == 1
+
+async def test_method_allow_list_is_configurable(stub_runtime):
+    runtime, upstream = stub_runtime(flaky(1), **{**FAST, "retry": {**FAST["retry"], "methods": ["POST"]}})
+    assert (await runtime.request("postUser", "POST", URL, json={})).status_code == 200
+    assert len(upstream.requests) == 2
+
+    runtime, upstream = stub_runtime(flaky(1), **{**FAST, "retry": {**FAST["retry"], "methods": ["POST"]}})
+    assert (await runtime.request("getUser", "GET", URL)).status_code == 503
+    assert len(upstream.requests) == 1
+
+async def test_non_retryable_status_is_returned_at_once(stub_runtime):
+    runtime, upstream = stub_runtime(flaky(1, status=404), **FAST)
+    assert (await runtime.request("getUser", "GET", URL)).status_code == 404
+    assert len(upstream.requests) == 1
+
+async def test_transport_errors_are_retried_up_to_attempts(stub_runtime):
+    def refused(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    runtime, upstream = stub_runtime(refused, **FAST)
+    with pytest.raises(httpx.ConnectError):
+        await runtime.request("getUser", "GET", URL)
+    assert len(upstream.requests) == 3
+
+async def test_breaker_opens_half_opens_and_closes(stub_runtime):
+    healthy = False
+
+    def handler(request):
+        return httpx.Response(200 if healthy else 503)
+
+    runtime, upstream = stub_runtime(handler, retry={"enabled": False}, coalesce={"enabled": False},
+                                     breaker={"failure_threshold": 3, "recovery_timeout": 0.05})
+    for _ in range(3):
+        await runtime.request("getUser", "GET", URL)
+    assert runtime.breaker.state == OPEN
+
+    # Open: fail fast without touching the upstream
+    with pytest.raises(UpstreamUnavailable):
+        await runtime.request("getUser", "GET", URL)
+    assert len(upstream.requests) == 3
+
+    # Half-open: one probe; a failed probe opens the circuit again
+    await asyncio.sleep(0.06)
+    await runtime.request("getUser", "GET", URL)
+    assert len(upstream.requests) == 4
+    assert runtime.breaker.state == OPEN
+
+    await asyncio.sleep(0.06)
+    healthy = True
+    response = await runtime.request("getUser", "GET", URL)
+    assert response.status_code == 200
+    assert runtime.breaker.state == CLOSED
+    assert runtime.breaker.stats()["opened"] == 2
+
+async def test_half_open_admits_only_the_probe(stub_runtime):
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        return httpx.Response(200)
+
+    runtime, upstream = stub_runtime(handler, retry={"enabled": False}, coalesce={"enabled": False},
+                                     breaker={"failure_threshold": 1, "recovery_timeout": 0.0})
+    runtime.breaker.record(False)
+    probe = asyncio.create_task(runtime.request("getUser", "GET", URL))
+    await asyncio.sleep(0.01)
+    assert runtime.breaker.state == HALF_OPEN
+    with pytest.raises(UpstreamUnavailable):
+        await runtime.request("getUser", "GET", URL)
+    release.set()
+    assert (await probe).status_code == 200
+    assert runtime.breaker.state == CLOSED
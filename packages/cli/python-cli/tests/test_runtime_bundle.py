@@ -0,0 +1,26 @@
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_wrap.runtime_bundle import runtime_overrides
+
+SCANNER = SimpleNamespace(find_app_object=lambda app_path: "main:app")
+
+def test_no_options_means_no_overrides():
+    assert runtime_overrides(SCANNER, "app") is None
+
+def test_serve_and_reload_options():
+    assert runtime_overrides(SCANNER, "app", serve={"transport": "http"}, reload=True) == {
+        "serve": {"transport": "http"}, "reload": {"enabled": True},
+    }
+
+def test_in_process_finds_the_app(tmp_path):
+    overrides = runtime_overrides(SCANNER, str(tmp_path), in_process="auto")
+    assert overrides == {"upstream": {"transport": "asgi", "app": "main:app", "app_dir": str(tmp_path.resolve())}}
+    assert runtime_overrides(SCANNER, str(tmp_path), in_process="api:app")["upstream"]["app"] == "api:app"
+
+def test_in_process_needs_an_app():
+    with pytest.raises(ValueError, match="app path"):
+        runtime_overrides(SCANNER, None, in_process="auto")
+    with pytest.raises(ValueError, match="No FastAPI"):
+        runtime_overrides(SimpleNamespace(find_app_object=lambda app_path: None), "app", in_process="auto")
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+from mcp.server.lowlevel.server import request_ctx
+
+from mcp_wrap.runtime.limiter import AdaptiveLimiter
+from mcp_wrap.runtime.scheduler import FairQueue, Ticket
+
+URL = "http://upstream/items"
+# Upstream round-trip of the load tests
+LATENCY = 0.02
+
+def drain(queue):
+    order = []
+    while queue:
+        ticket = queue.pop(lambda session: True)
+        order.append((ticket.session, ticket.lane))
+    return order
+
+def test_sessions_with_unequal_demand_take_turns():
+    queue = FairQueue(["default"])
+    for _ in range(20):
+        queue.push(Ticket(None, "A", "default", 1.0))
+    for _ in range(4):
+        queue.push(Ticket(None, "B", "default", 1.0))
+
+    sessions = [session for session, _ in drain(queue)]
+    # B's four calls are not stuck behind A's twenty
+    assert sessions[:8] == ["A", "B"] * 4
+    assert sessions[8:] == ["A"] * 16
+
+def test_higher_priority_lanes_are_served_first():
+    queue = FairQueue(["health", "read", "bulk"])
+    for lane in ("bulk", "bulk", "read", "health", "read"):
+        queue.push(Ticket(None, "A", lane, 1.0))
+
+    assert [lane for _, lane in drain(queue)] == ["health", "read", "read", "bulk", "bulk"]
+
+def test_capped_session_keeps_its_place():
+    queue = FairQueue(["default"])
+    for session in ("A", "A", "B"):
+        queue.push(Ticket(None, session, "default", 1.0))
+
+    assert queue.pop(lambda session: session != "A").session == "B"
+    assert queue.pop(lambda session: session != "A") is None
+    assert len(queue) == 2
+
+async def serve(limiter, calls):
+    """Queue calls [(session, lane)] behind a held slot, then record the order in which they are admitted"""
+    held = await limiter.acquire()
+    order = []
+
+    async def call(session, lane):
+        started = await limiter.acquire(session=session, lane=lane)
+        order.append((session, lane))
+        await asyncio.sleep(0)
+        limiter.release(started, None, session)
+
+    tasks = [asyncio.create_task(call(session, lane)) for session, lane in calls]
+    await asyncio.sleep(0)
+    limiter.release(held, None)
+    await asyncio.gather(*tasks)
+    return order
+
+async def test_limiter_interleaves_sessions():
+    limiter = AdaptiveLimiter(initial_limit=1, min_limit=1, max_limit=1)
+    order = await serve(limiter, [("A", "default")] * 20 + [("B", "default")] * 4)
+
+    sessions = [session for session, _ in order]
+    assert sessions[:8] == ["A", "B"] * 4
+    assert limiter.stats()["in_flight"] == 0
+
+async def test_limiter_serves_priority_lanes_first():
+    limiter = AdaptiveLimiter(initial_limit=1, min_limit=1, max_limit=1, lanes=["health", "read", "bulk"])
+    order = await serve(limiter, [("A", "bulk")] * 5 + [("B", "read")] * 3 + [("C", "health")])
+
+    assert [lane for _, lane in order] == ["health"] + ["read"] * 3 + ["bulk"] * 5
+
+async def light_session_latencies(stub_runtime, scheduler):
+    """Latencies of a light session's sequential calls while a heavy session floods 2 upstream slots"""
+    async def handler(request):
+        await asyncio.sleep(LATENCY)
+        return httpx.Response(200, json={})
+
+    runtime, upstream = stub_runtime(handler, coalesce={"enabled": False}, retry={"enabled": False},
+                                     limiter={"initial_limit": 2, "min_limit": 2, "max_limit": 2},
+                                     scheduler={"enabled": scheduler})
+
+    async def call(session, n):
+        request_ctx.set(SimpleNamespace(session=session))
+        started = time.perf_counter()
+        await runtime.request("getItems", "GET", URL, params={"n": n})
+        return time.perf_counter() - started
+
+    heavy = [asyncio.create_task(call("heavy", n)) for n in range(100)]
+    await asyncio.sleep(LATENCY / 4)
+    light = [await call("light", n) for n in range(5)]
+    await asyncio.gather(*heavy)
+    assert len(upstream.requests) == 105
+    return light
+
+async def test_light_session_latency_stays_bounded_under_a_flood(stub_runtime):
+    fifo = await light_session_latencies(stub_runtime, scheduler=False)
+    fair = await light_session_latencies(stub_runtime, scheduler=True)
+    # FIFO: the first light call waits behind the whole flood, 100 calls over 2 slots
+    assert max(fifo) > 25 * LATENCY
+    # Fair: a light call waits for at most one heavy call per slot, then its own round-trip
+    assert max(fair) < 5 * LATENCY
+    assert max(fair) * 5 < max(fifo)
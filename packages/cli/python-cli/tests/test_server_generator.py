@@ -0,0 +1,21 @@
+import yaml
+
+from mcp_wrap.server_generator import MCPServerGenerator
+
+def test_generated_servers_carry_no_unused_catalog(demo_specs):
+    generator = MCPServerGenerator.from_tool_specs(demo_specs)
+    typescript = generator.generate_server("typescript")
+    python = generator.generate_server("python")
+    assert "const config" not in typescript
+    assert "config =" not in python
+    compile(python, "server.py", "exec")
+    for spec in demo_specs:
+        assert f'"{spec.name}"' in typescript
+
+def test_yaml_source_is_recorded_in_header(tmp_path):
+    source = tmp_path / "tools.yaml"
+    source.write_text(yaml.safe_dump([{"name": "ping", "description": "Ping", "parameters": {"type": "object"}}]))
+    generator = MCPServerGenerator(str(source))
+    code = generator.generate_server("python")
+    assert f"sha256: {generator.source_hash}" in code
+    assert "async def ping(" in code
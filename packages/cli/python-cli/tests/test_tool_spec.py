@@ -0,0 +1,73 @@
+from pathlib import Path
+
+from mcp_wrap.backends import next_steps
+from mcp_wrap.fastapi_scanner import FastAPIScanner
+from mcp_wrap.tool_spec import build_tool_specs
+
+def spec_by_name(specs, name):
+    return next(spec for spec in specs if spec.name == name)
+
+def scan_source(tmp_path, source):
+    (tmp_path / "main.py").write_text(source)
+    scanner = FastAPIScanner()
+    return build_tool_specs(scanner.scan_fastapi_app(str(tmp_path)), scanner.type_cache)
+
+def test_query_params_with_defaults_are_optional(demo_specs):
+    schema = spec_by_name(demo_specs, "getUsers").input_schema()
+    assert set(schema["properties"]) == {"limit", "offset", "status", "search"}
+    assert schema["required"] == []
+
+def test_path_params_are_required(demo_specs):
+    assert spec_by_name(demo_specs, "getUsersByUser_id").input_schema()["required"] == ["user_id"]
+
+def test_required_follows_defaults_and_optional(tmp_path):
+    specs = scan_source(tmp_path, '''
+from typing import Optional, Union
+from fastapi import FastAPI, Query
+
+app = FastAPI()
+
+@app.get("/items")
+def list_items(q: str, page: int = 1, size: int = Query(10), tag: str = Query(...),
+               sort: str = Query(default=...), owner: Optional[str] = None,
+               kind: Union[str, None] = Query(None), cursor: str | None = None):
+    return []
+''')
+    params = {p.name: p.required for p in specs[0].parameters}
+    assert params == {
+        "q": True, "page": False, "size": False, "tag": True,
+        "sort": True, "owner": False, "kind": False, "cursor": False,
+    }
+
+def test_next_steps_cover_every_target(tmp_path):
+    steps = next_steps({"fastmcp": tmp_path / "fastmcp", "typescript": tmp_path / "typescript"})
+    assert "# fastmcp" in steps and "# typescript" in steps
+    assert f"cd {tmp_path / 'fastmcp'}" in steps
+    assert f"cd {tmp_path / 'typescript'}" in steps
+    assert steps.index("python server.py") < steps.index("# typescript")
+
+def test_next_steps_single_target_has_no_header():
+    steps = next_steps({"lowlevel": Path("out")})
+    assert steps[0] == "cd out"
+    assert not any(step.startswith("# ") for step in steps)
+
+def test_parameter_types_come_from_annotations(demo_specs):
+    properties = spec_by_name(demo_specs, "getUsers").input_schema()["properties"]
+    assert {name: prop["type"] for name, prop in properties.items()} == {
+        "limit": "integer", "offset": "integer", "status": "string", "search": "string",
+    }
+    assert spec_by_name(demo_specs, "getUsersByUser_id").input_schema()["properties"]["user_id"]["type"] == "integer"
+
+def test_optional_annotation_without_default_is_optional(tmp_path):
+    specs = scan_source(tmp_path, '''
+from typing import Optional
+from fastapi import FastAPI
+
+app = FastAPI()
+
+@app.get("/items")
+def list_items(owner: Optional[str], page: int):
+    return []
+''')
+    assert {p.name: p.required for p in specs[0].parameters} == {"owner": False, "page": True}
+    assert {p.name: p.type for p in specs[0].parameters} == {"owner": "string", "page": "integer"}
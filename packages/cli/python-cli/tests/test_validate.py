@@ -0,0 +1,29 @@
+import pytest
+
+from mcp_wrap.runtime.config import DEFAULT_CONFIG, merge_config
+from mcp_wrap.runtime.executor import ToolRuntime
+from mcp_wrap.runtime.validate import InvalidArguments, compile_validator
+
+def test_validation_is_off_by_default():
+    assert DEFAULT_CONFIG["validation"]["enabled"] is False
+    runtime = ToolRuntime(merge_config(DEFAULT_CONFIG, {}))
+    assert runtime.validation_enabled is False
+
+def test_optional_query_params_may_be_left_out(demo_specs):
+    runtime = ToolRuntime(merge_config(DEFAULT_CONFIG, {"validation": {"enabled": True}}))
+    runtime.compile_validators({spec.name: spec.input_schema() for spec in demo_specs})
+    assert runtime.validate("getUsers", {"limit": 2}) == {"limit": 2}
+    assert runtime.validate("getUsers", {}) == {}
+    assert runtime.validate("getProducts", {"category": "books"}) == {"category": "books"}
+
+def test_path_params_are_still_required(demo_specs):
+    runtime = ToolRuntime(merge_config(DEFAULT_CONFIG, {"validation": {"enabled": True}}))
+    runtime.compile_validators({spec.name: spec.input_schema() for spec in demo_specs})
+    with pytest.raises(InvalidArguments, match="user_id"):
+        runtime.validate("getUsersByUser_id", {})
+
+def test_lossless_coercion():
+    validate = compile_validator({"type": "object", "properties": {"limit": {"type": "integer"}}, "required": []})
+    assert validate({"limit": "5"}) == {"limit": 5}
+    with pytest.raises(InvalidArguments):
+        compile_validator({"type": "object", "properties": {"limit": {"type": "integer"}}}, coerce=False)({"limit": "5"})
@@ -0,0 +1,76 @@
+from mcp_wrap.zod_emitter import ZodSchemaEmitter
+
+ADDRESS = {"type": "object", "properties": {"city": {"type": "string"}}, "required": ["city"]}
+
+def emit(*schemas):
+    emitter = ZodSchemaEmitter()
+    for schema in schemas:
+        emitter.register(schema)
+    shapes = [emitter.shape(schema) for schema in schemas]
+    return shapes, emitter.declarations
+
+def listing(item):
+    return {
+        "type": "object",
+        "properties": {"items": {"type": "array", "items": {"$ref": "#/$defs/Item"}}},
+        "$defs": {"Item": item},
+    }
+
+def test_repeated_sub_schema_is_declared_once():
+    shapes, declarations = emit(
+        {"type": "object", "properties": {"home": ADDRESS}},
+        {"type": "object", "properties": {"work": ADDRESS, "name": {"type": "string"}}, "required": ["name"]},
+    )
+    assert declarations == ["const sharedSchema = z.object({ city: z.string() });"]
+    assert shapes == [
+        "{ home: sharedSchema.optional() }",
+        "{ work: sharedSchema.optional(), name: z.string() }",
+    ]
+
+def test_refs_resolve_to_named_definitions():
+    shapes, declarations = emit(listing({"type": "object", "properties": {"a": {"type": "string"}}}))
+    assert declarations == ["const itemSchema = z.object({ a: z.string().optional() });"]
+    assert shapes == ["{ items: z.array(itemSchema).optional() }"]
+
+NODE = {
+    "type": "object",
+    "properties": {"name": {"type": "string"}, "children": {"type": "array", "items": {"$ref": "#/$defs/Node"}}},
+}
+
+def test_self_recursive_definition_is_lazy():
+    shapes, declarations = emit({"type": "object", "properties": {"tree": {"$ref": "#/$defs/Node"}}, "$defs": {"Node": NODE}})
+    assert declarations == [
+        "const nodeSchema: z.ZodTypeAny = z.object({ name: z.string().optional(), "
+        "children: z.array(z.lazy(() => nodeSchema)).optional() });"
+    ]
+    assert shapes == ["{ tree: nodeSchema.optional() }"]
+
+def test_recursive_definition_shared_by_tools_is_declared_once():
+    shapes, declarations = emit(
+        {"$ref": "#/$defs/Node", "$defs": {"Node": NODE}},
+        {"type": "object", "properties": {"tree": {"$ref": "#/$defs/Node"}}, "$defs": {"Node": NODE}},
+    )
+    assert declarations == [
+        "const sharedSchema = z.array(z.lazy(() => nodeSchema));",
+        "const nodeSchema: z.ZodTypeAny = z.object({ name: z.string().optional(), children: sharedSchema.optional() });",
+    ]
+    assert shapes == ["{ name: z.string().optional(), children: sharedSchema.optional() }", "{ tree: nodeSchema.optional() }"]
+
+def test_same_ref_text_with_different_definitions_is_not_shared():
+    first = listing({"type": "object", "properties": {"a": {"type": "string"}}})
+    second = listing({"type": "object", "properties": {"b": {"type": "integer"}}})
+    shapes, declarations = emit(first, second)
+    assert declarations == [
+        "const itemSchema = z.object({ a: z.string().optional() });",
+        "const itemSchema2 = z.object({ b: z.number().int().optional() });",
+    ]
+    assert shapes == ["{ items: z.array(itemSchema).optional() }", "{ items: z.array(itemSchema2).optional() }"]
+
+def test_same_ref_text_with_equal_definitions_is_shared():
+    item = {"type": "object", "properties": {"a": {"type": "string"}}}
+    shapes, declarations = emit(listing(item), listing(dict(item)))
+    assert declarations == [
+        "const itemSchema = z.object({ a: z.string().optional() });",
+        "const sharedSchema = z.array(itemSchema);",
+    ]
+    assert shapes == ["{ items: sharedSchema.optional() }"] * 2